@@ -3,6 +3,7 @@ import logging
 import os
 import shutil
 import base64
+import time
 import redis
 
 from datetime import datetime
@@ -21,6 +22,7 @@ from open_webui.env import (
     DATABASE_URL,
     ENV,
     REDIS_URL,
+    REDIS_CONFIG_VERSION_CHECK_INTERVAL,
     REDIS_KEY_PREFIX,
     REDIS_SENTINEL_HOSTS,
     REDIS_SENTINEL_PORT,
@@ -34,6 +36,7 @@ from open_webui.env import (
 )
 from open_webui.internal.db import Base, get_db
 from open_webui.utils.redis import get_redis_connection
+from open_webui.utils.cache import LocalCache
 
 
 class EndpointFilter(logging.Filter):
@@ -222,10 +225,25 @@ class PersistentConfig(Generic[T]):
 
 
 class AppConfig:
+    """
+    Attribute access to every PersistentConfig of the app.
+
+    With Redis, values are shared between workers through `{prefix}:config:*`
+    keys. Reads are served from the in-process values once a key has been
+    fetched; writers publish an invalidation for the key and bump the
+    `{prefix}:config:version` counter, which every worker compares at most once
+    per REDIS_CONFIG_VERSION_CHECK_INTERVAL to catch missed invalidations.
+    """
+
     _state: dict[str, PersistentConfig]
     _redis: Union[redis.Redis, redis.cluster.RedisCluster] = None
     _redis_key_prefix: str
 
+    # Keys whose in-process value is known to match Redis
+    _synced: Optional[LocalCache] = None
+    _version: Optional[str] = None
+    _version_checked_at: float = 0.0
+
     def __init__(
         self,
         redis_url: Optional[str] = None,
@@ -245,6 +263,24 @@ class AppConfig:
                     decode_responses=True,
                 ),
             )
+            super().__setattr__(
+                "_synced",
+                LocalCache("config", ttl=float("inf"), redis=self._redis),
+            )
+
+    def _get_version_key(self) -> str:
+        return f"{self._redis_key_prefix}:config:version"
+
+    def _check_version(self):
+        now = time.monotonic()
+        if now - self._version_checked_at < REDIS_CONFIG_VERSION_CHECK_INTERVAL:
+            return
+        super().__setattr__("_version_checked_at", now)
+
+        version = self._redis.get(self._get_version_key())
+        if version != self._version:
+            super().__setattr__("_version", version)
+            self._synced.clear(publish=False)
 
     def __setattr__(self, key, value):
         if isinstance(value, PersistentConfig):
@@ -256,6 +292,11 @@ class AppConfig:
             if self._redis:
                 redis_key = f"{self._redis_key_prefix}:config:{key}"
                 self._redis.set(redis_key, json.dumps(self._state[key].value))
+                self._redis.incr(self._get_version_key())
+
+                # Drop the key on every other worker, ours is already current
+                self._synced.delete(key)
+                self._synced.set(key, True)
 
     def __getattr__(self, key):
         if key not in self._state:
@@ -263,6 +304,14 @@ class AppConfig:
 
         # If Redis is available, check for an updated value
         if self._redis:
+            self._check_version()
+            if self._synced.get(key):
+                return self._state[key].value
+
+            # Marked before fetching, an invalidation arriving mid-fetch
+            # unmarks it again instead of being lost
+            self._synced.set(key, True)
+
             redis_key = f"{self._redis_key_prefix}:config:{key}"
             redis_value = self._redis.get(redis_key)
 
@@ -1897,6 +1946,28 @@ Ensure that the tools are effectively utilized to achieve the highest-quality an
 
 VECTOR_DB = os.environ.get("VECTOR_DB", "chroma")
 
+# Size of the thread pool shared by all vector DB calls made from async code
+# and by the per-query fan-out of query_collection
+VECTOR_DB_MAX_WORKERS = os.environ.get("VECTOR_DB_MAX_WORKERS", "")
+
+try:
+    VECTOR_DB_MAX_WORKERS = int(VECTOR_DB_MAX_WORKERS)
+except ValueError:
+    VECTOR_DB_MAX_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+
+# Stored embeddings are quantized to "int8" or "binary" by the backends that
+# support it (local, pgvector), "none" keeps them at full precision
+VECTOR_DB_QUANTIZATION = os.environ.get("VECTOR_DB_QUANTIZATION", "none").lower()
+if VECTOR_DB_QUANTIZATION not in ["none", "int8", "binary"]:
+    VECTOR_DB_QUANTIZATION = "none"
+
+# Searches over quantized vectors fetch this many times the requested results
+# and re-score them at full precision; 0 disables re-scoring
+try:
+    VECTOR_DB_RESCORE_FACTOR = int(os.environ.get("VECTOR_DB_RESCORE_FACTOR", "4"))
+except Exception:
+    VECTOR_DB_RESCORE_FACTOR = 4
+
 # Chroma
 CHROMA_DATA_PATH = f"{DATA_DIR}/vector_db"
 
@@ -2023,6 +2094,98 @@ else:
     except Exception:
         PGVECTOR_POOL_RECYCLE = 3600
 
+# Rows written per multi-row INSERT ... ON CONFLICT statement on ingestion
+try:
+    PGVECTOR_INSERT_BATCH_SIZE = int(
+        os.environ.get("PGVECTOR_INSERT_BATCH_SIZE", "500")
+    )
+except Exception:
+    PGVECTOR_INSERT_BATCH_SIZE = 500
+
+# ANN index of document_chunk: "hnsw", "ivfflat" or "none" (exact search only)
+PGVECTOR_INDEX_METHOD = os.environ.get("PGVECTOR_INDEX_METHOD", "ivfflat").lower()
+if PGVECTOR_INDEX_METHOD not in ["hnsw", "ivfflat", "none"]:
+    PGVECTOR_INDEX_METHOD = "ivfflat"
+
+# "global" builds one index over all collections, "collection" a partial index
+# per collection once it holds PGVECTOR_INDEX_MIN_ROWS rows (smaller ones are
+# searched exactly), so filtering by collection never costs recall
+PGVECTOR_INDEX_SCOPE = os.environ.get("PGVECTOR_INDEX_SCOPE", "global").lower()
+if PGVECTOR_INDEX_SCOPE not in ["global", "collection"]:
+    PGVECTOR_INDEX_SCOPE = "global"
+
+try:
+    PGVECTOR_INDEX_MIN_ROWS = int(os.environ.get("PGVECTOR_INDEX_MIN_ROWS", "10000"))
+except Exception:
+    PGVECTOR_INDEX_MIN_ROWS = 10000
+
+try:
+    PGVECTOR_HNSW_M = int(os.environ.get("PGVECTOR_HNSW_M", "16"))
+except Exception:
+    PGVECTOR_HNSW_M = 16
+
+try:
+    PGVECTOR_HNSW_EF_CONSTRUCTION = int(
+        os.environ.get("PGVECTOR_HNSW_EF_CONSTRUCTION", "64")
+    )
+except Exception:
+    PGVECTOR_HNSW_EF_CONSTRUCTION = 64
+
+# Per-query search parameters, 0 keeps the server defaults
+try:
+    PGVECTOR_HNSW_EF_SEARCH = int(os.environ.get("PGVECTOR_HNSW_EF_SEARCH", "0"))
+except Exception:
+    PGVECTOR_HNSW_EF_SEARCH = 0
+
+# "relaxed_order" or "strict_order" to keep scanning the HNSW graph until
+# enough rows pass the collection filter (pgvector >= 0.8), empty to disable
+PGVECTOR_HNSW_ITERATIVE_SCAN = os.environ.get("PGVECTOR_HNSW_ITERATIVE_SCAN", "")
+
+# Lists of IVFFlat indexes, 0 sizes them from the row count (rows / 1000)
+try:
+    PGVECTOR_IVFFLAT_LISTS = int(os.environ.get("PGVECTOR_IVFFLAT_LISTS", "100"))
+except Exception:
+    PGVECTOR_IVFFLAT_LISTS = 100
+
+try:
+    PGVECTOR_IVFFLAT_PROBES = int(os.environ.get("PGVECTOR_IVFFLAT_PROBES", "0"))
+except Exception:
+    PGVECTOR_IVFFLAT_PROBES = 0
+
+# Local (embedded NumPy engine, no external service)
+LOCAL_VECTOR_DB_PATH = os.environ.get(
+    "LOCAL_VECTOR_DB_PATH", f"{DATA_DIR}/vector_db/local"
+)
+# Collections with at least this many rows are searched through an IVF index,
+# probing the LOCAL_VECTOR_DB_IVF_PROBES closest lists; 0 always searches exactly
+try:
+    LOCAL_VECTOR_DB_IVF_MIN_ROWS = int(
+        os.environ.get("LOCAL_VECTOR_DB_IVF_MIN_ROWS", "20000")
+    )
+except Exception:
+    LOCAL_VECTOR_DB_IVF_MIN_ROWS = 20000
+
+try:
+    LOCAL_VECTOR_DB_IVF_PROBES = int(os.environ.get("LOCAL_VECTOR_DB_IVF_PROBES", "8"))
+except Exception:
+    LOCAL_VECTOR_DB_IVF_PROBES = 8
+
+# Segments are merged once more than this many exist or once this share of
+# their rows is deleted
+try:
+    LOCAL_VECTOR_DB_MAX_SEGMENTS = int(
+        os.environ.get("LOCAL_VECTOR_DB_MAX_SEGMENTS", "16")
+    )
+except Exception:
+    LOCAL_VECTOR_DB_MAX_SEGMENTS = 16
+
+try:
+    LOCAL_VECTOR_DB_COMPACT_RATIO = float(
+        os.environ.get("LOCAL_VECTOR_DB_COMPACT_RATIO", "0.3")
+    )
+except Exception:
+    LOCAL_VECTOR_DB_COMPACT_RATIO = 0.3
+
 # Pinecone
 PINECONE_API_KEY = os.environ.get("PINECONE_API_KEY", None)
 PINECONE_ENVIRONMENT = os.environ.get("PINECONE_ENVIRONMENT", None)
@@ -2310,6 +2473,14 @@ ENABLE_RAG_HYBRID_SEARCH = PersistentConfig(
     os.environ.get("ENABLE_RAG_HYBRID_SEARCH", "").lower() == "true",
 )
 
+# Persistent per-collection BM25 index used by hybrid search
+ENABLE_RAG_BM25_INDEX = (
+    os.environ.get("ENABLE_RAG_BM25_INDEX", "True").lower() == "true"
+)
+RAG_BM25_INDEX_DIR = os.environ.get("RAG_BM25_INDEX_DIR", f"{DATA_DIR}/vector_db/bm25")
+RAG_BM25_K1 = float(os.environ.get("RAG_BM25_K1", "1.5"))
+RAG_BM25_B = float(os.environ.get("RAG_BM25_B", "0.75"))
+
 RAG_FULL_CONTEXT = PersistentConfig(
     "RAG_FULL_CONTEXT",
     "rag.full_context",
@@ -2404,6 +2575,35 @@ RAG_EMBEDDING_BATCH_SIZE = PersistentConfig(
     ),
 )
 
+# Content-addressed embedding cache shared by all get_embedding_function callers
+ENABLE_RAG_EMBEDDING_CACHE = (
+    os.environ.get("ENABLE_RAG_EMBEDDING_CACHE", "True").lower() == "true"
+)
+RAG_EMBEDDING_CACHE_DIR = os.environ.get(
+    "RAG_EMBEDDING_CACHE_DIR", f"{CACHE_DIR}/embeddings"
+)
+RAG_EMBEDDING_CACHE_MAX_ENTRIES = int(
+    os.environ.get("RAG_EMBEDDING_CACHE_MAX_ENTRIES", "100000")
+)
+RAG_EMBEDDING_CACHE_MEMORY_ENTRIES = int(
+    os.environ.get("RAG_EMBEDDING_CACHE_MEMORY_ENTRIES", "2048")
+)
+
+# Documents are split, embedded and inserted in batches of this many chunks, with
+# at most RAG_INGESTION_MAX_PENDING_BATCHES inserts in flight behind the embedder
+RAG_INGESTION_BATCH_SIZE = int(os.environ.get("RAG_INGESTION_BATCH_SIZE", "256"))
+RAG_INGESTION_MAX_PENDING_BATCHES = int(
+    os.environ.get("RAG_INGESTION_MAX_PENDING_BATCHES", "2")
+)
+
+# Embeddings are truncated to their first dimensions and re-normalized, for
+# Matryoshka models (e.g. nomic-embed-text, text-embedding-3); 0 keeps them whole.
+# Changing it requires reindexing the stored documents.
+try:
+    RAG_EMBEDDING_DIMENSIONS = int(os.environ.get("RAG_EMBEDDING_DIMENSIONS", "0"))
+except Exception:
+    RAG_EMBEDDING_DIMENSIONS = 0
+
 RAG_EMBEDDING_QUERY_PREFIX = os.environ.get("RAG_EMBEDDING_QUERY_PREFIX", None)
 
 RAG_EMBEDDING_CONTENT_PREFIX = os.environ.get("RAG_EMBEDDING_CONTENT_PREFIX", None)
@@ -343,6 +343,12 @@ DATABASE_ENABLE_SQLITE_WAL = (
     os.environ.get("DATABASE_ENABLE_SQLITE_WAL", "False").lower() == "true"
 )
 
+# Use an async engine (aiosqlite/asyncpg) for the async model methods instead
+# of running their synchronous counterparts in a worker thread
+DATABASE_ENABLE_ASYNC = (
+    os.environ.get("DATABASE_ENABLE_ASYNC", "True").lower() == "true"
+)
+
 DATABASE_USER_ACTIVE_STATUS_UPDATE_INTERVAL = os.environ.get(
     "DATABASE_USER_ACTIVE_STATUS_UPDATE_INTERVAL", None
 )
@@ -354,6 +360,44 @@ if DATABASE_USER_ACTIVE_STATUS_UPDATE_INTERVAL is not None:
     except Exception:
         DATABASE_USER_ACTIVE_STATUS_UPDATE_INTERVAL = 0.0
 
+# Seconds pending last-active timestamps are collected before being written
+# in a single bulk UPDATE; 0 writes every update through immediately
+DATABASE_USER_ACTIVE_STATUS_FLUSH_INTERVAL = os.environ.get(
+    "DATABASE_USER_ACTIVE_STATUS_FLUSH_INTERVAL", "5"
+)
+
+try:
+    DATABASE_USER_ACTIVE_STATUS_FLUSH_INTERVAL = float(
+        DATABASE_USER_ACTIVE_STATUS_FLUSH_INTERVAL
+    )
+except Exception:
+    DATABASE_USER_ACTIVE_STATUS_FLUSH_INTERVAL = 5.0
+
+# Seconds an authenticated user is kept in the in-process user cache; 0 disables it
+USER_CACHE_TTL = os.environ.get("USER_CACHE_TTL", "10")
+
+try:
+    USER_CACHE_TTL = float(USER_CACHE_TTL)
+except Exception:
+    USER_CACHE_TTL = 10.0
+
+# Seconds group memberships and effective permissions of a user are cached; 0 disables it
+GROUP_CACHE_TTL = os.environ.get("GROUP_CACHE_TTL", "60")
+
+try:
+    GROUP_CACHE_TTL = float(GROUP_CACHE_TTL)
+except Exception:
+    GROUP_CACHE_TTL = 60.0
+
+# Seconds custom models, active functions and per-user model access are cached
+# for the model list; 0 disables it
+MODEL_VIEW_CACHE_TTL = os.environ.get("MODEL_VIEW_CACHE_TTL", "60")
+
+try:
+    MODEL_VIEW_CACHE_TTL = float(MODEL_VIEW_CACHE_TTL)
+except Exception:
+    MODEL_VIEW_CACHE_TTL = 60.0
+
 RESET_CONFIG_ON_START = (
     os.environ.get("RESET_CONFIG_ON_START", "False").lower() == "true"
 )
@@ -362,6 +406,15 @@ ENABLE_REALTIME_CHAT_SAVE = (
     os.environ.get("ENABLE_REALTIME_CHAT_SAVE", "False").lower() == "true"
 )
 
+# Seconds chat events (status, message, replace) are buffered before being
+# written to the database; 0 writes every event through immediately
+CHAT_EVENT_FLUSH_INTERVAL = os.environ.get("CHAT_EVENT_FLUSH_INTERVAL", "1")
+
+try:
+    CHAT_EVENT_FLUSH_INTERVAL = float(CHAT_EVENT_FLUSH_INTERVAL)
+except Exception:
+    CHAT_EVENT_FLUSH_INTERVAL = 1.0
+
 ####################################
 # REDIS
 ####################################
@@ -383,6 +436,16 @@ try:
 except ValueError:
     REDIS_SENTINEL_MAX_RETRY_COUNT = 2
 
+# Seconds between checks of the Redis config version counter, bounds how long a
+# worker that missed an invalidation message can serve a stale config value
+REDIS_CONFIG_VERSION_CHECK_INTERVAL = os.environ.get(
+    "REDIS_CONFIG_VERSION_CHECK_INTERVAL", "5"
+)
+try:
+    REDIS_CONFIG_VERSION_CHECK_INTERVAL = float(REDIS_CONFIG_VERSION_CHECK_INTERVAL)
+except ValueError:
+    REDIS_CONFIG_VERSION_CHECK_INTERVAL = 5.0
+
 ####################################
 # UVICORN WORKERS
 ####################################
@@ -507,6 +570,14 @@ else:
     except Exception:
         MODELS_CACHE_TTL = 1
 
+# How long a backend's last known model list keeps being served (and
+# revalidated in the background) after it went stale, e.g. while it is down
+MODELS_CACHE_STALE_TTL = os.environ.get("MODELS_CACHE_STALE_TTL", "3600")
+try:
+    MODELS_CACHE_STALE_TTL = int(MODELS_CACHE_STALE_TTL)
+except Exception:
+    MODELS_CACHE_STALE_TTL = 3600
+
 
 ####################################
 # CHAT
@@ -550,6 +621,15 @@ try:
 except ValueError:
     WEBSOCKET_REDIS_LOCK_TIMEOUT = 60
 
+# Seconds Redis-backed session pools are cached in each worker, writes are
+# propagated over pub/sub; 0 disables it
+WEBSOCKET_REDIS_POOL_CACHE_TTL = os.environ.get("WEBSOCKET_REDIS_POOL_CACHE_TTL", "30")
+
+try:
+    WEBSOCKET_REDIS_POOL_CACHE_TTL = float(WEBSOCKET_REDIS_POOL_CACHE_TTL)
+except ValueError:
+    WEBSOCKET_REDIS_POOL_CACHE_TTL = 30.0
+
 WEBSOCKET_SENTINEL_HOSTS = os.environ.get("WEBSOCKET_SENTINEL_HOSTS", "")
 WEBSOCKET_SENTINEL_PORT = os.environ.get("WEBSOCKET_SENTINEL_PORT", "26379")
 
@@ -569,6 +649,52 @@ AIOHTTP_CLIENT_SESSION_SSL = (
     os.environ.get("AIOHTTP_CLIENT_SESSION_SSL", "True").lower() == "true"
 )
 
+# Connection pools of the shared sessions used for upstream LLM providers, one
+# pool per backend origin; a limit of 0 means unlimited. Waiting for a free
+# connection is only bounded by AIOHTTP_CLIENT_TIMEOUT, which is unset by
+# default, so the pools are unlimited unless configured otherwise
+try:
+    AIOHTTP_CLIENT_POOL_LIMIT = int(os.environ.get("AIOHTTP_CLIENT_POOL_LIMIT", "0"))
+except Exception:
+    AIOHTTP_CLIENT_POOL_LIMIT = 0
+
+try:
+    AIOHTTP_CLIENT_POOL_LIMIT_PER_HOST = int(
+        os.environ.get("AIOHTTP_CLIENT_POOL_LIMIT_PER_HOST", "0")
+    )
+except Exception:
+    AIOHTTP_CLIENT_POOL_LIMIT_PER_HOST = 0
+
+try:
+    AIOHTTP_CLIENT_KEEPALIVE_TIMEOUT = float(
+        os.environ.get("AIOHTTP_CLIENT_KEEPALIVE_TIMEOUT", "30")
+    )
+except Exception:
+    AIOHTTP_CLIENT_KEEPALIVE_TIMEOUT = 30.0
+
+try:
+    AIOHTTP_CLIENT_DNS_CACHE_TTL = int(
+        os.environ.get("AIOHTTP_CLIENT_DNS_CACHE_TTL", "300")
+    )
+except Exception:
+    AIOHTTP_CLIENT_DNS_CACHE_TTL = 300
+
+# Admission control for chat completion requests: concurrent requests per
+# backend connection (0 means unlimited, overridable per connection with the
+# "max_concurrent_requests" API config) and how long a request may wait for a
+# free slot before being rejected
+try:
+    BACKEND_MAX_CONCURRENT_REQUESTS = int(
+        os.environ.get("BACKEND_MAX_CONCURRENT_REQUESTS", "0")
+    )
+except Exception:
+    BACKEND_MAX_CONCURRENT_REQUESTS = 0
+
+try:
+    BACKEND_QUEUE_TIMEOUT = float(os.environ.get("BACKEND_QUEUE_TIMEOUT", "300"))
+except Exception:
+    BACKEND_QUEUE_TIMEOUT = 300.0
+
 AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST = os.environ.get(
     "AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST",
     os.environ.get("AIOHTTP_CLIENT_TIMEOUT_OPENAI_MODEL_LIST", "10"),
@@ -1,7 +1,9 @@
 import os
 import json
 import logging
-from contextlib import contextmanager
+import functools
+import shlex
+from contextlib import asynccontextmanager, contextmanager
 from typing import Any, Optional
 
 from open_webui.internal.wrappers import register_connection
@@ -15,12 +17,15 @@ from open_webui.env import (
     DATABASE_POOL_SIZE,
     DATABASE_POOL_TIMEOUT,
     DATABASE_ENABLE_SQLITE_WAL,
+    DATABASE_ENABLE_ASYNC,
 )
 from peewee_migrate import Router
-from sqlalchemy import Dialect, create_engine, MetaData, event, types
+from sqlalchemy import Dialect, create_engine, MetaData, event, text, types
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import scoped_session, sessionmaker
 from sqlalchemy.pool import QueuePool, NullPool
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.sql.type_api import _T
 from typing_extensions import Self
 
@@ -162,3 +167,194 @@ def get_session():
 
 
 get_db = contextmanager(get_session)
+
+
+####################
+# Async engine
+####################
+
+
+# Query parameters of a postgres URL that asyncpg (or SQLAlchemy's asyncpg
+# dialect) takes as they are
+ASYNCPG_QUERY_PARAMS = {"ssl", "target_session_attrs", "prepared_statement_cache_size"}
+
+
+def parse_libpq_options(options: str) -> Optional[dict]:
+    """Server settings of a libpq `options` value ("-c key=value ..."), if any."""
+    settings = {}
+    tokens = shlex.split(options)
+    while tokens:
+        token = tokens.pop(0)
+        if token == "-c" and tokens:
+            token = tokens.pop(0)
+        elif token.startswith("-c"):
+            token = token[2:]
+        elif token.startswith("--"):
+            # --search-path=x is -c search_path=x
+            key, sep, value = token[2:].partition("=")
+            token = f"{key.replace('-', '_')}{sep}{value}"
+        else:
+            return None
+
+        key, sep, value = token.partition("=")
+        if not sep or not key:
+            return None
+        settings[key] = value
+    return settings
+
+
+def get_async_database_args(database_url: str) -> Optional[tuple[str, dict]]:
+    """
+    Map a sync DATABASE_URL onto its async driver, returning the async URL and
+    its connect_args, or None without an async driver or when the URL uses
+    libpq parameters that asyncpg has no equivalent for.
+    """
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+
+    if backend == "sqlite" and url.get_driver_name() != "sqlcipher":
+        return (
+            url.set(drivername="sqlite+aiosqlite").render_as_string(
+                hide_password=False
+            ),
+            {},
+        )
+
+    if backend == "postgresql":
+        query = dict(url.query)
+        connect_args = {}
+        server_settings = {}
+
+        # asyncpg takes `ssl` instead of libpq's `sslmode`
+        if "sslmode" in query:
+            query["ssl"] = query.pop("sslmode")
+        if "connect_timeout" in query:
+            connect_args["timeout"] = float(query.pop("connect_timeout"))
+        if "application_name" in query:
+            server_settings["application_name"] = query.pop("application_name")
+        if "options" in query:
+            options = query.pop("options")
+            settings = (
+                parse_libpq_options(options) if isinstance(options, str) else None
+            )
+            if settings is None:
+                log.info(f"asyncpg cannot apply options={options!r}")
+                return None
+            server_settings.update(settings)
+
+        # Anything else (sslrootcert, sslcert, ...) would only fail on connect
+        unsupported = sorted(
+            key
+            for key, value in query.items()
+            if key not in ASYNCPG_QUERY_PARAMS or not isinstance(value, str)
+        )
+        if unsupported:
+            log.info(f"asyncpg does not support {', '.join(unsupported)}")
+            return None
+
+        if server_settings:
+            connect_args["server_settings"] = server_settings
+        return (
+            url.set(drivername="postgresql+asyncpg", query=query).render_as_string(
+                hide_password=False
+            ),
+            connect_args,
+        )
+
+    return None
+
+
+async_engine = None
+
+if DATABASE_ENABLE_ASYNC and not SQLALCHEMY_DATABASE_URL.startswith(
+    "sqlite+sqlcipher://"
+):
+    try:
+        from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+        ASYNC_DATABASE_URL, connect_args = get_async_database_args(
+            SQLALCHEMY_DATABASE_URL
+        ) or (None, {})
+        if ASYNC_DATABASE_URL is None:
+            log.info("No async driver for the database, using threads instead")
+        elif "sqlite" in ASYNC_DATABASE_URL:
+            async_engine = create_async_engine(ASYNC_DATABASE_URL)
+            event.listen(async_engine.sync_engine, "connect", on_connect)
+        elif isinstance(DATABASE_POOL_SIZE, int) and DATABASE_POOL_SIZE <= 0:
+            async_engine = create_async_engine(
+                ASYNC_DATABASE_URL,
+                connect_args=connect_args,
+                pool_pre_ping=True,
+                poolclass=NullPool,
+            )
+        elif isinstance(DATABASE_POOL_SIZE, int):
+            async_engine = create_async_engine(
+                ASYNC_DATABASE_URL,
+                connect_args=connect_args,
+                pool_size=DATABASE_POOL_SIZE,
+                max_overflow=DATABASE_POOL_MAX_OVERFLOW,
+                pool_timeout=DATABASE_POOL_TIMEOUT,
+                pool_recycle=DATABASE_POOL_RECYCLE,
+                pool_pre_ping=True,
+            )
+        else:
+            async_engine = create_async_engine(
+                ASYNC_DATABASE_URL, connect_args=connect_args, pool_pre_ping=True
+            )
+
+        if async_engine is not None:
+            AsyncSessionLocal = async_sessionmaker(
+                bind=async_engine, autoflush=False, expire_on_commit=False
+            )
+    except Exception as e:
+        log.warning(f"Async database engine unavailable, using threads instead: {e}")
+        async_engine = None
+
+
+async def check_async_engine() -> None:
+    """
+    Connect once through the async engine at startup and fall back to threads
+    if that fails, so a driver that cannot connect never fails requests.
+    """
+    global async_engine
+    if async_engine is None:
+        return
+
+    try:
+        async with async_engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+    except Exception as e:
+        log.warning(f"Async database engine unavailable, using threads instead: {e}")
+        engine, async_engine = async_engine, None
+        await engine.dispose()
+
+
+async def dispose_async_engine() -> None:
+    if async_engine is not None:
+        await async_engine.dispose()
+
+
+@asynccontextmanager
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def async_db_fallback(sync_method):
+    """
+    Decorate the async variant of a `*Table` method.
+
+    With an async engine the coroutine runs as written; otherwise the sync
+    `sync_method` runs in the threadpool so callers never block the loop.
+    """
+
+    def decorator(async_method):
+        @functools.wraps(async_method)
+        async def wrapper(self, *args, **kwargs):
+            if async_engine is None:
+                return await run_in_threadpool(sync_method, self, *args, **kwargs)
+            return await async_method(self, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
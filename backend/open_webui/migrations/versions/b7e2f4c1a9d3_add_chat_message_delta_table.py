@@ -0,0 +1,43 @@
+"""Add chat message delta table
+
+Revision ID: b7e2f4c1a9d3
+Revises: 3af16a1c9fb6
+Create Date: 2025-08-28 10:12:41.512634
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "b7e2f4c1a9d3"
+down_revision: Union[str, None] = "3af16a1c9fb6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "chat_message_delta",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("chat_id", sa.String(), nullable=False),
+        sa.Column("message_id", sa.String(), nullable=False),
+        sa.Column("data", sa.JSON(), nullable=True),
+        sa.Column("created_at", sa.BigInteger(), nullable=True),
+        sa.Column("updated_at", sa.BigInteger(), nullable=True),
+    )
+    op.create_index(
+        "chat_message_delta_chat_id_message_id_idx",
+        "chat_message_delta",
+        ["chat_id", "message_id"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "chat_message_delta_chat_id_message_id_idx", table_name="chat_message_delta"
+    )
+    op.drop_table("chat_message_delta")
@@ -0,0 +1,153 @@
+"""Add chat search table
+
+Revision ID: c4a8d2e6f1b3
+Revises: b7e2f4c1a9d3
+Create Date: 2025-08-29 14:03:18.274511
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.sql import table, column
+
+# revision identifiers, used by Alembic.
+revision: str = "c4a8d2e6f1b3"
+down_revision: Union[str, None] = "b7e2f4c1a9d3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def get_chat_search_content(chat: dict) -> str:
+    # Mirrors open_webui.models.chats.get_chat_search_content at the time of
+    # this migration
+    messages = (chat.get("history") or {}).get("messages") or {}
+    messages = list(messages.values()) if messages else chat.get("messages") or []
+
+    contents = []
+    for message in messages:
+        if not isinstance(message, dict):
+            continue
+
+        content = message.get("content")
+        if isinstance(content, list):
+            content = " ".join(
+                item.get("text") or "" for item in content if isinstance(item, dict)
+            )
+        if isinstance(content, str) and content:
+            contents.append(content)
+
+    return "\n".join(contents).replace("\x00", "")
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    dialect_name = conn.dialect.name
+
+    op.create_table(
+        "chat_search",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("chat_id", sa.String(), nullable=False),
+        sa.Column("title", sa.Text(), nullable=True),
+        sa.Column("content", sa.Text(), nullable=True),
+    )
+    op.create_index("chat_search_chat_id_idx", "chat_search", ["chat_id"], unique=True)
+
+    if dialect_name == "sqlite":
+        # External content FTS5 table kept in sync with chat_search by triggers
+        op.execute(
+            """
+            CREATE VIRTUAL TABLE chat_search_fts USING fts5(
+                title, content,
+                content='chat_search', content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2'
+            )
+            """
+        )
+        op.execute(
+            """
+            CREATE TRIGGER chat_search_ai AFTER INSERT ON chat_search BEGIN
+                INSERT INTO chat_search_fts (rowid, title, content)
+                VALUES (new.id, new.title, new.content);
+            END
+            """
+        )
+        op.execute(
+            """
+            CREATE TRIGGER chat_search_ad AFTER DELETE ON chat_search BEGIN
+                INSERT INTO chat_search_fts (chat_search_fts, rowid, title, content)
+                VALUES ('delete', old.id, old.title, old.content);
+            END
+            """
+        )
+        op.execute(
+            """
+            CREATE TRIGGER chat_search_au AFTER UPDATE ON chat_search BEGIN
+                INSERT INTO chat_search_fts (chat_search_fts, rowid, title, content)
+                VALUES ('delete', old.id, old.title, old.content);
+                INSERT INTO chat_search_fts (rowid, title, content)
+                VALUES (new.id, new.title, new.content);
+            END
+            """
+        )
+    elif dialect_name == "postgresql":
+        op.execute(
+            """
+            ALTER TABLE chat_search ADD COLUMN document tsvector
+            GENERATED ALWAYS AS (
+                setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+                setweight(to_tsvector('simple', coalesce(content, '')), 'B')
+            ) STORED
+            """
+        )
+        op.execute(
+            "CREATE INDEX chat_search_document_idx ON chat_search USING GIN (document)"
+        )
+
+    # Backfill the index from existing chats (shared snapshots are never searched)
+    chat = table(
+        "chat",
+        column("id", sa.String()),
+        column("user_id", sa.String()),
+        column("title", sa.Text()),
+        column("chat", sa.JSON()),
+    )
+    chat_search = table(
+        "chat_search",
+        column("chat_id", sa.String()),
+        column("title", sa.Text()),
+        column("content", sa.Text()),
+    )
+
+    result = conn.execution_options(yield_per=500).execute(
+        sa.select(chat.c.id, chat.c.title, chat.c.chat).where(
+            sa.not_(chat.c.user_id.like("shared-%"))
+        )
+    )
+
+    for rows in result.partitions():
+        conn.execute(
+            sa.insert(chat_search),
+            [
+                {
+                    "chat_id": row.id,
+                    "title": row.title or "",
+                    "content": get_chat_search_content(row.chat or {}),
+                }
+                for row in rows
+            ],
+        )
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+
+    if conn.dialect.name == "sqlite":
+        op.execute("DROP TRIGGER IF EXISTS chat_search_au")
+        op.execute("DROP TRIGGER IF EXISTS chat_search_ad")
+        op.execute("DROP TRIGGER IF EXISTS chat_search_ai")
+        op.execute("DROP TABLE IF EXISTS chat_search_fts")
+
+    op.drop_index("chat_search_chat_id_idx", table_name="chat_search")
+    op.drop_table("chat_search")
@@ -0,0 +1,29 @@
+"""Add chat list keyset index
+
+Revision ID: d5e1a7b3c9f2
+Revises: c4a8d2e6f1b3
+Create Date: 2025-09-01 09:41:27.603158
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "d5e1a7b3c9f2"
+down_revision: Union[str, None] = "c4a8d2e6f1b3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Serves chat lists paginated by (updated_at, id) for a single user
+    op.create_index(
+        "user_id_updated_at_id_idx", "chat", ["user_id", "updated_at", "id"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("user_id_updated_at_id_idx", table_name="chat")
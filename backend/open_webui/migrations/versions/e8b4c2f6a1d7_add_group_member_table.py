@@ -0,0 +1,65 @@
+"""Add group member table
+
+Revision ID: e8b4c2f6a1d7
+Revises: d5e1a7b3c9f2
+Create Date: 2025-09-02 16:22:05.918340
+
+"""
+
+import json
+import time
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.sql import table, column
+
+# revision identifiers, used by Alembic.
+revision: str = "e8b4c2f6a1d7"
+down_revision: Union[str, None] = "d5e1a7b3c9f2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "group_member",
+        sa.Column("group_id", sa.Text(), primary_key=True),
+        sa.Column("user_id", sa.Text(), primary_key=True),
+        sa.Column("created_at", sa.BigInteger(), nullable=True),
+    )
+    op.create_index("group_member_user_id_idx", "group_member", ["user_id"])
+
+    # Backfill from the user_ids JSON column of every group
+    conn = op.get_bind()
+    group = table(
+        "group",
+        column("id", sa.Text()),
+        column("user_ids", sa.JSON()),
+    )
+    group_member = table(
+        "group_member",
+        column("group_id", sa.Text()),
+        column("user_id", sa.Text()),
+        column("created_at", sa.BigInteger()),
+    )
+
+    now = int(time.time())
+    members = []
+    for row in conn.execute(sa.select(group.c.id, group.c.user_ids)):
+        user_ids = row.user_ids
+        if isinstance(user_ids, str):
+            user_ids = json.loads(user_ids)
+
+        members.extend(
+            {"group_id": row.id, "user_id": user_id, "created_at": now}
+            for user_id in dict.fromkeys(user_ids or [])
+        )
+
+    if members:
+        op.bulk_insert(group_member, members)
+
+
+def downgrade() -> None:
+    op.drop_index("group_member_user_id_idx", table_name="group_member")
+    op.drop_table("group_member")
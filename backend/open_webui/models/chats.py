@@ -1,19 +1,29 @@
 import logging
 import json
+import re
 import time
 import uuid
 from typing import Optional
 
-from open_webui.internal.db import Base, get_db
+from open_webui.internal.db import Base, async_db_fallback, get_async_db, get_db
 from open_webui.models.tags import TagModel, Tag, Tags
 from open_webui.models.folders import Folders
 from open_webui.env import SRC_LOG_LEVELS
 
 from pydantic import BaseModel, ConfigDict
-from sqlalchemy import BigInteger, Boolean, Column, String, Text, JSON, Index
-from sqlalchemy import or_, func, select, and_, text
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    Column,
+    Float,
+    Integer,
+    String,
+    Text,
+    JSON,
+    Index,
+)
+from sqlalchemy import or_, func, select, and_, text, delete
 from sqlalchemy.sql import exists
-from sqlalchemy.sql.expression import bindparam
 
 ####################
 # Chat DB Schema
@@ -53,9 +63,88 @@ class Chat(Base):
         Index("updated_at_user_id_idx", "updated_at", "user_id"),
         # WHERE folder_id = ... AND user_id = ...
         Index("folder_id_user_id_idx", "folder_id", "user_id"),
+        # WHERE user_id = ... AND (updated_at, id) < (...) ORDER BY updated_at DESC, id DESC
+        Index("user_id_updated_at_id_idx", "user_id", "updated_at", "id"),
     )
 
 
+class ChatMessageDelta(Base):
+    __tablename__ = "chat_message_delta"
+
+    # Pending streamed updates of a single message. Writes during streaming
+    # only touch this row instead of rewriting the whole chat JSON, and the
+    # accumulated data is folded into `chat.chat` once the response completes.
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    chat_id = Column(String, nullable=False)
+    message_id = Column(String, nullable=False)
+    data = Column(JSON)
+
+    created_at = Column(BigInteger)
+    updated_at = Column(BigInteger)
+
+    __table_args__ = (
+        Index(
+            "chat_message_delta_chat_id_message_id_idx",
+            "chat_id",
+            "message_id",
+            unique=True,
+        ),
+    )
+
+
+class ChatSearch(Base):
+    __tablename__ = "chat_search"
+
+    # Searchable text of a chat. On SQLite the `chat_search_fts` FTS5 table
+    # indexes it through triggers, on PostgreSQL a generated, weighted
+    # `document` tsvector column with a GIN index does (see migration
+    # c4a8d2e6f1b3).
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    chat_id = Column(String, nullable=False)
+    title = Column(Text)
+    content = Column(Text)
+
+    __table_args__ = (Index("chat_search_chat_id_idx", "chat_id", unique=True),)
+
+
+SEARCH_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def get_chat_search_content(chat: dict) -> str:
+    messages = (chat.get("history") or {}).get("messages") or {}
+    messages = list(messages.values()) if messages else chat.get("messages") or []
+
+    contents = []
+    for message in messages:
+        if not isinstance(message, dict):
+            continue
+
+        content = message.get("content")
+        if isinstance(content, list):
+            content = " ".join(
+                item.get("text") or "" for item in content if isinstance(item, dict)
+            )
+        if isinstance(content, str) and content:
+            contents.append(content)
+
+    return "\n".join(contents).replace("\x00", "")
+
+
+def get_chat_search_query(dialect_name: str, search_text: str) -> Optional[str]:
+    """
+    Full-text query matching every word of `search_text` as a prefix, so
+    partially typed words work. Words are reduced to runs of word characters,
+    which keeps the FTS5 and tsquery operators out of the query.
+    """
+    tokens = SEARCH_TOKEN_PATTERN.findall(search_text)
+    if not tokens:
+        return None
+
+    if dialect_name == "sqlite":
+        return " ".join(f'"{token}"*' for token in tokens)
+    return " & ".join(f"{token}:*" for token in tokens)
+
+
 class ChatModel(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
@@ -122,7 +211,93 @@ class ChatTitleIdResponse(BaseModel):
     created_at: int
 
 
+class ChatListItemResponse(ChatTitleIdResponse):
+    pinned: Optional[bool] = False
+    archived: bool = False
+    folder_id: Optional[str] = None
+    tags: list[str] = []
+
+
 class ChatTable:
+    def _get_chat_list_query(self, db):
+        # Only the columns needed to render chat lists, never the `chat` JSON
+        # holding the whole conversation history
+        return db.query(
+            Chat.id,
+            Chat.title,
+            Chat.updated_at,
+            Chat.created_at,
+            Chat.pinned,
+            Chat.archived,
+            Chat.folder_id,
+            Chat.meta,
+        )
+
+    def _to_chat_list_item(self, row) -> ChatListItemResponse:
+        return ChatListItemResponse(
+            id=row.id,
+            title=row.title,
+            updated_at=row.updated_at,
+            created_at=row.created_at,
+            pinned=row.pinned,
+            archived=bool(row.archived),
+            folder_id=row.folder_id,
+            tags=(row.meta or {}).get("tags", []),
+        )
+
+    def _apply_chat_list_keyset(
+        self,
+        query,
+        before_updated_at: Optional[int] = None,
+        before_id: Optional[str] = None,
+    ):
+        """
+        Keyset pagination for lists ordered by (updated_at, id) descending:
+        returns the chats that come after the (`before_updated_at`,
+        `before_id`) item, i.e. the last one of the previous page.
+        """
+        query = query.order_by(Chat.updated_at.desc(), Chat.id.desc())
+
+        if before_updated_at is None:
+            return query
+
+        if before_id is None:
+            return query.filter(Chat.updated_at < before_updated_at)
+
+        return query.filter(
+            or_(
+                Chat.updated_at < before_updated_at,
+                and_(Chat.updated_at == before_updated_at, Chat.id < before_id),
+            )
+        )
+
+    def _update_chat_search(self, db, id: str, title: str, chat: dict) -> None:
+        title = (title or "").replace("\x00", "")
+        content = get_chat_search_content(chat or {})
+
+        search = db.query(ChatSearch).filter_by(chat_id=id).first()
+        if search and search.title == title and search.content == content:
+            # Most updates (statuses, ratings, tags, ...) leave the text as is
+            return
+
+        # Replaced rather than updated so the FTS5 triggers see a clean delete
+        db.query(ChatSearch).filter_by(chat_id=id).delete()
+        db.add(ChatSearch(chat_id=id, title=title, content=content))
+
+    async def _update_chat_search_async(
+        self, db, id: str, title: str, chat: dict
+    ) -> None:
+        title = (title or "").replace("\x00", "")
+        content = get_chat_search_content(chat or {})
+
+        result = await db.execute(select(ChatSearch).filter_by(chat_id=id))
+        search = result.scalars().first()
+        if search and search.title == title and search.content == content:
+            return
+
+        await db.execute(delete(ChatSearch).where(ChatSearch.chat_id == id))
+        db.add(ChatSearch(chat_id=id, title=title, content=content))
+
     def insert_new_chat(self, user_id: str, form_data: ChatForm) -> Optional[ChatModel]:
         with get_db() as db:
             id = str(uuid.uuid4())
@@ -144,6 +319,7 @@ class ChatTable:
 
             result = Chat(**chat.model_dump())
             db.add(result)
+            self._update_chat_search(db, id, chat.title, chat.chat)
             db.commit()
             db.refresh(result)
             return ChatModel.model_validate(result) if result else None
@@ -181,17 +357,22 @@ class ChatTable:
 
             result = Chat(**chat.model_dump())
             db.add(result)
+            self._update_chat_search(db, id, chat.title, chat.chat)
             db.commit()
             db.refresh(result)
             return ChatModel.model_validate(result) if result else None
 
-    def update_chat_by_id(self, id: str, chat: dict) -> Optional[ChatModel]:
+    def update_chat_by_id(
+        self, id: str, chat: dict, update_search: bool = True
+    ) -> Optional[ChatModel]:
         try:
             with get_db() as db:
                 chat_item = db.get(Chat, id)
                 chat_item.chat = chat
                 chat_item.title = chat["title"] if "title" in chat else "New Chat"
                 chat_item.updated_at = int(time.time())
+                if update_search:
+                    self._update_chat_search(db, id, chat_item.title, chat)
                 db.commit()
                 db.refresh(chat_item)
 
@@ -199,6 +380,24 @@ class ChatTable:
         except Exception:
             return None
 
+    @async_db_fallback(update_chat_by_id)
+    async def update_chat_by_id_async(
+        self, id: str, chat: dict, update_search: bool = True
+    ) -> Optional[ChatModel]:
+        try:
+            async with get_async_db() as db:
+                chat_item = await db.get(Chat, id)
+                chat_item.chat = chat
+                chat_item.title = chat["title"] if "title" in chat else "New Chat"
+                chat_item.updated_at = int(time.time())
+                if update_search:
+                    await self._update_chat_search_async(db, id, chat_item.title, chat)
+                await db.commit()
+
+                return ChatModel.model_validate(chat_item)
+        except Exception:
+            return None
+
     def update_chat_title_by_id(self, id: str, title: str) -> Optional[ChatModel]:
         chat = self.get_chat_by_id(id)
         if chat is None:
@@ -252,10 +451,65 @@ class ChatTable:
 
         return chat.chat.get("history", {}).get("messages", {}).get(message_id, {})
 
+    @staticmethod
+    def _merge_message(chat: dict, message_id: str, message: dict) -> dict:
+        # Copies only the containers on the path to the message, so the
+        # (potentially large) rest of the history is shared, not duplicated
+        history = {**chat.get("history", {})}
+        messages = {**history.get("messages", {})}
+
+        messages[message_id] = {**messages.get(message_id, {}), **message}
+
+        history["messages"] = messages
+        history["currentId"] = message_id
+        return {**chat, "history": history}
+
+    def _apply_message_deltas(self, db, chat_item: Chat) -> ChatModel:
+        return self._apply_message_deltas_to_chats(db, [chat_item])[0]
+
+    def _apply_message_deltas_to_chats(
+        self, db, chat_items: list[Chat]
+    ) -> list[ChatModel]:
+        # Every read that returns the chat JSON has to include the pending
+        # deltas; they are fetched with one query per batch of chats
+        chats = [ChatModel.model_validate(chat_item) for chat_item in chat_items]
+        chats_by_id = {chat.id: chat for chat in chats}
+
+        ids = list(chats_by_id)
+        for i in range(0, len(ids), 500):
+            deltas = (
+                db.query(ChatMessageDelta)
+                .filter(ChatMessageDelta.chat_id.in_(ids[i : i + 500]))
+                .order_by(ChatMessageDelta.id)
+                .all()
+            )
+            for delta in deltas:
+                chat = chats_by_id[delta.chat_id]
+                chat.chat = self._merge_message(
+                    chat.chat, delta.message_id, delta.data or {}
+                )
+
+        return chats
+
+    async def _apply_message_deltas_async(self, db, chat_item: Chat) -> ChatModel:
+        chat = ChatModel.model_validate(chat_item)
+
+        result = await db.execute(
+            select(ChatMessageDelta)
+            .filter_by(chat_id=chat_item.id)
+            .order_by(ChatMessageDelta.id)
+        )
+        for delta in result.scalars().all():
+            chat.chat = self._merge_message(
+                chat.chat, delta.message_id, delta.data or {}
+            )
+
+        return chat
+
     def upsert_message_to_chat_by_id_and_message_id(
         self, id: str, message_id: str, message: dict
     ) -> Optional[ChatModel]:
-        chat = self.get_chat_by_id(id)
+        chat = self.compact_message_deltas_by_id(id)
         if chat is None:
             return None
 
@@ -263,26 +517,186 @@ class ChatTable:
         if isinstance(message.get("content"), str):
             message["content"] = message["content"].replace("\x00", "")
 
-        chat = chat.chat
-        history = chat.get("history", {})
+        chat = self._merge_message(chat.chat, message_id, message)
+        # Only the message contents are indexed for search
+        return self.update_chat_by_id(id, chat, update_search="content" in message)
 
-        if message_id in history.get("messages", {}):
-            history["messages"][message_id] = {
-                **history["messages"][message_id],
-                **message,
-            }
-        else:
-            history["messages"][message_id] = message
+    @async_db_fallback(upsert_message_to_chat_by_id_and_message_id)
+    async def upsert_message_to_chat_by_id_and_message_id_async(
+        self, id: str, message_id: str, message: dict
+    ) -> Optional[ChatModel]:
+        chat = await self.compact_message_deltas_by_id_async(id)
+        if chat is None:
+            return None
 
-        history["currentId"] = message_id
+        # Sanitize message content for null characters before upserting
+        if isinstance(message.get("content"), str):
+            message["content"] = message["content"].replace("\x00", "")
 
-        chat["history"] = history
-        return self.update_chat_by_id(id, chat)
+        chat = self._merge_message(chat.chat, message_id, message)
+        return await self.update_chat_by_id_async(
+            id, chat, update_search="content" in message
+        )
+
+    def append_message_delta_to_chat_by_id_and_message_id(
+        self, id: str, message_id: str, message: dict
+    ) -> bool:
+        """
+        Record a streamed message update without rewriting the chat JSON.
+
+        The update is merged into the pending delta row of the message, so
+        the cost of a write depends on the size of the message, not the
+        chat. Pending deltas are visible through get_chat_by_id and are
+        folded into the chat by compact_message_deltas_by_id.
+        """
+        # Sanitize message content for null characters before upserting
+        if isinstance(message.get("content"), str):
+            message["content"] = message["content"].replace("\x00", "")
+
+        try:
+            with get_db() as db:
+                now = int(time.time())
+                delta = (
+                    db.query(ChatMessageDelta)
+                    .filter_by(chat_id=id, message_id=message_id)
+                    .first()
+                )
+
+                if delta:
+                    delta.data = {**(delta.data or {}), **message}
+                    delta.updated_at = now
+                else:
+                    db.add(
+                        ChatMessageDelta(
+                            chat_id=id,
+                            message_id=message_id,
+                            data=message,
+                            created_at=now,
+                            updated_at=now,
+                        )
+                    )
+
+                db.commit()
+                return True
+        except Exception as e:
+            log.exception(f"Error appending message delta to chat {id}: {e}")
+            return False
+
+    @async_db_fallback(append_message_delta_to_chat_by_id_and_message_id)
+    async def append_message_delta_to_chat_by_id_and_message_id_async(
+        self, id: str, message_id: str, message: dict
+    ) -> bool:
+        # Sanitize message content for null characters before upserting
+        if isinstance(message.get("content"), str):
+            message["content"] = message["content"].replace("\x00", "")
+
+        try:
+            async with get_async_db() as db:
+                now = int(time.time())
+                result = await db.execute(
+                    select(ChatMessageDelta).filter_by(
+                        chat_id=id, message_id=message_id
+                    )
+                )
+                delta = result.scalars().first()
+
+                if delta:
+                    delta.data = {**(delta.data or {}), **message}
+                    delta.updated_at = now
+                else:
+                    db.add(
+                        ChatMessageDelta(
+                            chat_id=id,
+                            message_id=message_id,
+                            data=message,
+                            created_at=now,
+                            updated_at=now,
+                        )
+                    )
+
+                await db.commit()
+                return True
+        except Exception as e:
+            log.exception(f"Error appending message delta to chat {id}: {e}")
+            return False
+
+    def compact_message_deltas_by_id(self, id: str) -> Optional[ChatModel]:
+        """Fold all pending message deltas into the chat JSON and drop them."""
+        try:
+            with get_db() as db:
+                chat_item = db.get(Chat, id)
+                if chat_item is None:
+                    return None
+
+                deltas = (
+                    db.query(ChatMessageDelta)
+                    .filter_by(chat_id=id)
+                    .order_by(ChatMessageDelta.id)
+                    .all()
+                )
+                if not deltas:
+                    return ChatModel.model_validate(chat_item)
+
+                chat = chat_item.chat
+                for delta in deltas:
+                    chat = self._merge_message(chat, delta.message_id, delta.data or {})
+
+                chat_item.chat = chat
+                chat_item.updated_at = int(time.time())
+                self._update_chat_search(db, id, chat_item.title, chat)
+
+                db.query(ChatMessageDelta).filter(
+                    ChatMessageDelta.id.in_([delta.id for delta in deltas])
+                ).delete(synchronize_session=False)
+
+                db.commit()
+                db.refresh(chat_item)
+                return ChatModel.model_validate(chat_item)
+        except Exception as e:
+            log.exception(f"Error compacting message deltas of chat {id}: {e}")
+            return None
+
+    @async_db_fallback(compact_message_deltas_by_id)
+    async def compact_message_deltas_by_id_async(self, id: str) -> Optional[ChatModel]:
+        try:
+            async with get_async_db() as db:
+                chat_item = await db.get(Chat, id)
+                if chat_item is None:
+                    return None
+
+                result = await db.execute(
+                    select(ChatMessageDelta)
+                    .filter_by(chat_id=id)
+                    .order_by(ChatMessageDelta.id)
+                )
+                deltas = result.scalars().all()
+                if not deltas:
+                    return ChatModel.model_validate(chat_item)
+
+                chat = chat_item.chat
+                for delta in deltas:
+                    chat = self._merge_message(chat, delta.message_id, delta.data or {})
+
+                chat_item.chat = chat
+                chat_item.updated_at = int(time.time())
+                await self._update_chat_search_async(db, id, chat_item.title, chat)
+
+                await db.execute(
+                    delete(ChatMessageDelta).where(
+                        ChatMessageDelta.id.in_([delta.id for delta in deltas])
+                    )
+                )
+
+                await db.commit()
+                return ChatModel.model_validate(chat_item)
+        except Exception as e:
+            log.exception(f"Error compacting message deltas of chat {id}: {e}")
+            return None
 
     def add_message_status_to_chat_by_id_and_message_id(
         self, id: str, message_id: str, status: dict
     ) -> Optional[ChatModel]:
-        chat = self.get_chat_by_id(id)
+        chat = self.compact_message_deltas_by_id(id)
         if chat is None:
             return None
 
@@ -295,7 +709,7 @@ class ChatTable:
             history["messages"][message_id]["statusHistory"] = status_history
 
         chat["history"] = history
-        return self.update_chat_by_id(id, chat)
+        return self.update_chat_by_id(id, chat, update_search=False)
 
     def insert_shared_chat_by_chat_id(self, chat_id: str) -> Optional[ChatModel]:
         with get_db() as db:
@@ -310,7 +724,7 @@ class ChatTable:
                     "id": str(uuid.uuid4()),
                     "user_id": f"shared-{chat_id}",
                     "title": chat.title,
-                    "chat": chat.chat,
+                    "chat": self._apply_message_deltas(db, chat).chat,
                     "meta": chat.meta,
                     "pinned": chat.pinned,
                     "folder_id": chat.folder_id,
@@ -344,7 +758,7 @@ class ChatTable:
                     return self.insert_shared_chat_by_chat_id(chat_id)
 
                 shared_chat.title = chat.title
-                shared_chat.chat = chat.chat
+                shared_chat.chat = self._apply_message_deltas(db, chat).chat
                 shared_chat.meta = chat.meta
                 shared_chat.pinned = chat.pinned
                 shared_chat.folder_id = chat.folder_id
@@ -375,7 +789,7 @@ class ChatTable:
                 chat.share_id = share_id
                 db.commit()
                 db.refresh(chat)
-                return ChatModel.model_validate(chat)
+                return self._apply_message_deltas(db, chat)
         except Exception:
             return None
 
@@ -387,7 +801,7 @@ class ChatTable:
                 chat.updated_at = int(time.time())
                 db.commit()
                 db.refresh(chat)
-                return ChatModel.model_validate(chat)
+                return self._apply_message_deltas(db, chat)
         except Exception:
             return None
 
@@ -399,7 +813,7 @@ class ChatTable:
                 chat.updated_at = int(time.time())
                 db.commit()
                 db.refresh(chat)
-                return ChatModel.model_validate(chat)
+                return self._apply_message_deltas(db, chat)
         except Exception:
             return None
 
@@ -418,10 +832,12 @@ class ChatTable:
         filter: Optional[dict] = None,
         skip: int = 0,
         limit: int = 50,
-    ) -> list[ChatModel]:
+    ) -> list[ChatListItemResponse]:
 
         with get_db() as db:
-            query = db.query(Chat).filter_by(user_id=user_id, archived=True)
+            query = self._get_chat_list_query(db).filter_by(
+                user_id=user_id, archived=True
+            )
 
             if filter:
                 query_key = filter.get("query")
@@ -447,7 +863,7 @@ class ChatTable:
                 query = query.limit(limit)
 
             all_chats = query.all()
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return [self._to_chat_list_item(chat) for chat in all_chats]
 
     def get_chat_list_by_user_id(
         self,
@@ -456,9 +872,11 @@ class ChatTable:
         filter: Optional[dict] = None,
         skip: int = 0,
         limit: int = 50,
-    ) -> list[ChatModel]:
+        before_updated_at: Optional[int] = None,
+        before_id: Optional[str] = None,
+    ) -> list[ChatListItemResponse]:
         with get_db() as db:
-            query = db.query(Chat).filter_by(user_id=user_id)
+            query = self._get_chat_list_query(db).filter_by(user_id=user_id)
             if not include_archived:
                 query = query.filter_by(archived=False)
 
@@ -478,7 +896,9 @@ class ChatTable:
                     else:
                         raise ValueError("Invalid direction for ordering")
             else:
-                query = query.order_by(Chat.updated_at.desc())
+                query = self._apply_chat_list_keyset(
+                    query, before_updated_at, before_id
+                )
 
             if skip:
                 query = query.offset(skip)
@@ -486,7 +906,7 @@ class ChatTable:
                 query = query.limit(limit)
 
             all_chats = query.all()
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return [self._to_chat_list_item(chat) for chat in all_chats]
 
     def get_chat_title_id_list_by_user_id(
         self,
@@ -494,6 +914,8 @@ class ChatTable:
         include_archived: bool = False,
         skip: Optional[int] = None,
         limit: Optional[int] = None,
+        before_updated_at: Optional[int] = None,
+        before_id: Optional[str] = None,
     ) -> list[ChatTitleIdResponse]:
         with get_db() as db:
             query = db.query(Chat).filter_by(user_id=user_id).filter_by(folder_id=None)
@@ -502,9 +924,9 @@ class ChatTable:
             if not include_archived:
                 query = query.filter_by(archived=False)
 
-            query = query.order_by(Chat.updated_at.desc()).with_entities(
-                Chat.id, Chat.title, Chat.updated_at, Chat.created_at
-            )
+            query = self._apply_chat_list_keyset(
+                query, before_updated_at, before_id
+            ).with_entities(Chat.id, Chat.title, Chat.updated_at, Chat.created_at)
 
             if skip:
                 query = query.offset(skip)
@@ -528,22 +950,31 @@ class ChatTable:
 
     def get_chat_list_by_chat_ids(
         self, chat_ids: list[str], skip: int = 0, limit: int = 50
-    ) -> list[ChatModel]:
+    ) -> list[ChatListItemResponse]:
         with get_db() as db:
             all_chats = (
-                db.query(Chat)
+                self._get_chat_list_query(db)
                 .filter(Chat.id.in_(chat_ids))
                 .filter_by(archived=False)
                 .order_by(Chat.updated_at.desc())
                 .all()
             )
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return [self._to_chat_list_item(chat) for chat in all_chats]
 
     def get_chat_by_id(self, id: str) -> Optional[ChatModel]:
         try:
             with get_db() as db:
                 chat = db.get(Chat, id)
-                return ChatModel.model_validate(chat)
+                return self._apply_message_deltas(db, chat)
+        except Exception:
+            return None
+
+    @async_db_fallback(get_chat_by_id)
+    async def get_chat_by_id_async(self, id: str) -> Optional[ChatModel]:
+        try:
+            async with get_async_db() as db:
+                chat = await db.get(Chat, id)
+                return await self._apply_message_deltas_async(db, chat)
         except Exception:
             return None
 
@@ -565,7 +996,21 @@ class ChatTable:
         try:
             with get_db() as db:
                 chat = db.query(Chat).filter_by(id=id, user_id=user_id).first()
-                return ChatModel.model_validate(chat)
+                return self._apply_message_deltas(db, chat)
+        except Exception:
+            return None
+
+    @async_db_fallback(get_chat_by_id_and_user_id)
+    async def get_chat_by_id_and_user_id_async(
+        self, id: str, user_id: str
+    ) -> Optional[ChatModel]:
+        try:
+            async with get_async_db() as db:
+                result = await db.execute(
+                    select(Chat).filter_by(id=id, user_id=user_id)
+                )
+                chat = result.scalars().first()
+                return await self._apply_message_deltas_async(db, chat)
         except Exception:
             return None
 
@@ -574,9 +1019,9 @@ class ChatTable:
             all_chats = (
                 db.query(Chat)
                 # .limit(limit).offset(skip)
-                .order_by(Chat.updated_at.desc())
+                .order_by(Chat.updated_at.desc()).all()
             )
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._apply_message_deltas_to_chats(db, all_chats)
 
     def get_chats_by_user_id(self, user_id: str) -> list[ChatModel]:
         with get_db() as db:
@@ -584,17 +1029,18 @@ class ChatTable:
                 db.query(Chat)
                 .filter_by(user_id=user_id)
                 .order_by(Chat.updated_at.desc())
+                .all()
             )
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._apply_message_deltas_to_chats(db, all_chats)
 
-    def get_pinned_chats_by_user_id(self, user_id: str) -> list[ChatModel]:
+    def get_pinned_chats_by_user_id(self, user_id: str) -> list[ChatListItemResponse]:
         with get_db() as db:
             all_chats = (
-                db.query(Chat)
+                self._get_chat_list_query(db)
                 .filter_by(user_id=user_id, pinned=True, archived=False)
                 .order_by(Chat.updated_at.desc())
             )
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return [self._to_chat_list_item(chat) for chat in all_chats]
 
     def get_archived_chats_by_user_id(self, user_id: str) -> list[ChatModel]:
         with get_db() as db:
@@ -602,8 +1048,33 @@ class ChatTable:
                 db.query(Chat)
                 .filter_by(user_id=user_id, archived=True)
                 .order_by(Chat.updated_at.desc())
+                .all()
             )
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._apply_message_deltas_to_chats(db, all_chats)
+
+    def _get_chat_search_subquery(self, dialect_name: str, search_query: str):
+        if dialect_name == "sqlite":
+            sql = """
+                SELECT chat_search.chat_id AS chat_id,
+                    -bm25(chat_search_fts, 10.0, 1.0) AS rank
+                FROM chat_search_fts
+                JOIN chat_search ON chat_search.id = chat_search_fts.rowid
+                WHERE chat_search_fts MATCH :search_query
+            """
+        else:
+            sql = """
+                SELECT chat_id,
+                    ts_rank_cd(document, to_tsquery('simple', :search_query)) AS rank
+                FROM chat_search
+                WHERE document @@ to_tsquery('simple', :search_query)
+            """
+
+        return (
+            text(sql)
+            .bindparams(search_query=search_query)
+            .columns(chat_id=String, rank=Float)
+            .subquery("chat_search_result")
+        )
 
     def get_chats_by_user_id_and_search_text(
         self,
@@ -612,9 +1083,10 @@ class ChatTable:
         include_archived: bool = False,
         skip: int = 0,
         limit: int = 60,
-    ) -> list[ChatModel]:
+    ) -> list[ChatListItemResponse]:
         """
-        Filters chats based on a search query using Python, allowing pagination using skip and limit.
+        Filters chats based on a search query using the chat_search full-text
+        index, ranked by relevance, allowing pagination using skip and limit.
         """
         search_text = search_text.replace("\u0000", "").lower().strip()
 
@@ -676,7 +1148,7 @@ class ChatTable:
         search_text = " ".join(search_text_words)
 
         with get_db() as db:
-            query = db.query(Chat).filter(Chat.user_id == user_id)
+            query = self._get_chat_list_query(db).filter(Chat.user_id == user_id)
 
             if is_archived is not None:
                 query = query.filter(Chat.archived == is_archived)
@@ -695,26 +1167,9 @@ class ChatTable:
             if folder_ids:
                 query = query.filter(Chat.folder_id.in_(folder_ids))
 
-            query = query.order_by(Chat.updated_at.desc())
-
             # Check if the database dialect is either 'sqlite' or 'postgresql'
             dialect_name = db.bind.dialect.name
             if dialect_name == "sqlite":
-                # SQLite case: using JSON1 extension for JSON searching
-                sqlite_content_sql = (
-                    "EXISTS ("
-                    "    SELECT 1 "
-                    "    FROM json_each(Chat.chat, '$.messages') AS message "
-                    "    WHERE LOWER(message.value->>'content') LIKE '%' || :content_key || '%'"
-                    ")"
-                )
-                sqlite_content_clause = text(sqlite_content_sql)
-                query = query.filter(
-                    or_(
-                        Chat.title.ilike(bindparam("title_key")), sqlite_content_clause
-                    ).params(title_key=f"%{search_text}%", content_key=search_text)
-                )
-
                 # Check if there are any tags to filter, it should have all the tags
                 if "none" in tag_ids:
                     query = query.filter(
@@ -746,22 +1201,6 @@ class ChatTable:
                     )
 
             elif dialect_name == "postgresql":
-                # PostgreSQL relies on proper JSON query for search
-                postgres_content_sql = (
-                    "EXISTS ("
-                    "    SELECT 1 "
-                    "    FROM json_array_elements(Chat.chat->'messages') AS message "
-                    "    WHERE LOWER(message->>'content') LIKE '%' || :content_key || '%'"
-                    ")"
-                )
-                postgres_content_clause = text(postgres_content_sql)
-                query = query.filter(
-                    or_(
-                        Chat.title.ilike(bindparam("title_key")),
-                        postgres_content_clause,
-                    ).params(title_key=f"%{search_text}%", content_key=search_text)
-                )
-
                 # Check if there are any tags to filter, it should have all the tags
                 if "none" in tag_ids:
                     query = query.filter(
@@ -796,26 +1235,42 @@ class ChatTable:
                     f"Unsupported dialect: {db.bind.dialect.name}"
                 )
 
+            search_query = get_chat_search_query(dialect_name, search_text)
+            if search_query:
+                # Ranked full-text match against the chat_search index
+                search_result = self._get_chat_search_subquery(
+                    dialect_name, search_query
+                )
+                query = query.join(
+                    search_result, search_result.c.chat_id == Chat.id
+                ).order_by(search_result.c.rank.desc(), Chat.updated_at.desc())
+            else:
+                if search_text:
+                    query = query.filter(Chat.title.ilike(f"%{search_text}%"))
+                query = query.order_by(Chat.updated_at.desc())
+
             # Perform pagination at the SQL level
             all_chats = query.offset(skip).limit(limit).all()
 
             log.info(f"The number of chats: {len(all_chats)}")
 
             # Validate and return chats
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return [self._to_chat_list_item(chat) for chat in all_chats]
 
     def get_chats_by_folder_id_and_user_id(
         self, folder_id: str, user_id: str
-    ) -> list[ChatModel]:
+    ) -> list[ChatListItemResponse]:
         with get_db() as db:
-            query = db.query(Chat).filter_by(folder_id=folder_id, user_id=user_id)
+            query = self._get_chat_list_query(db).filter_by(
+                folder_id=folder_id, user_id=user_id
+            )
             query = query.filter(or_(Chat.pinned == False, Chat.pinned == None))
             query = query.filter_by(archived=False)
 
             query = query.order_by(Chat.updated_at.desc())
 
             all_chats = query.all()
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return [self._to_chat_list_item(chat) for chat in all_chats]
 
     def get_chats_by_folder_ids_and_user_id(
         self, folder_ids: list[str], user_id: str
@@ -830,7 +1285,7 @@ class ChatTable:
             query = query.order_by(Chat.updated_at.desc())
 
             all_chats = query.all()
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._apply_message_deltas_to_chats(db, all_chats)
 
     def update_chat_folder_id_by_id_and_user_id(
         self, id: str, user_id: str, folder_id: str
@@ -843,7 +1298,7 @@ class ChatTable:
                 chat.pinned = False
                 db.commit()
                 db.refresh(chat)
-                return ChatModel.model_validate(chat)
+                return self._apply_message_deltas(db, chat)
         except Exception:
             return None
 
@@ -855,9 +1310,9 @@ class ChatTable:
 
     def get_chat_list_by_user_id_and_tag_name(
         self, user_id: str, tag_name: str, skip: int = 0, limit: int = 50
-    ) -> list[ChatModel]:
+    ) -> list[ChatListItemResponse]:
         with get_db() as db:
-            query = db.query(Chat).filter_by(user_id=user_id)
+            query = self._get_chat_list_query(db).filter_by(user_id=user_id)
             tag_id = tag_name.replace(" ", "_").lower()
 
             log.info(f"DB dialect name: {db.bind.dialect.name}")
@@ -882,7 +1337,7 @@ class ChatTable:
 
             all_chats = query.all()
             log.debug(f"all_chats: {all_chats}")
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return [self._to_chat_list_item(chat) for chat in all_chats]
 
     def add_chat_tag_by_id_and_user_id_and_tag_name(
         self, id: str, user_id: str, tag_name: str
@@ -903,7 +1358,7 @@ class ChatTable:
 
                 db.commit()
                 db.refresh(chat)
-                return ChatModel.model_validate(chat)
+                return self._apply_message_deltas(db, chat)
         except Exception:
             return None
 
@@ -979,6 +1434,8 @@ class ChatTable:
     def delete_chat_by_id(self, id: str) -> bool:
         try:
             with get_db() as db:
+                db.query(ChatMessageDelta).filter_by(chat_id=id).delete()
+                db.query(ChatSearch).filter_by(chat_id=id).delete()
                 db.query(Chat).filter_by(id=id).delete()
                 db.commit()
 
@@ -989,7 +1446,9 @@ class ChatTable:
     def delete_chat_by_id_and_user_id(self, id: str, user_id: str) -> bool:
         try:
             with get_db() as db:
-                db.query(Chat).filter_by(id=id, user_id=user_id).delete()
+                if db.query(Chat).filter_by(id=id, user_id=user_id).delete():
+                    db.query(ChatMessageDelta).filter_by(chat_id=id).delete()
+                    db.query(ChatSearch).filter_by(chat_id=id).delete()
                 db.commit()
 
                 return True and self.delete_shared_chat_by_chat_id(id)
@@ -1001,6 +1460,14 @@ class ChatTable:
             with get_db() as db:
                 self.delete_shared_chats_by_user_id(user_id)
 
+                db.query(ChatMessageDelta).filter(
+                    ChatMessageDelta.chat_id.in_(
+                        select(Chat.id).filter_by(user_id=user_id)
+                    )
+                ).delete(synchronize_session=False)
+                db.query(ChatSearch).filter(
+                    ChatSearch.chat_id.in_(select(Chat.id).filter_by(user_id=user_id))
+                ).delete(synchronize_session=False)
                 db.query(Chat).filter_by(user_id=user_id).delete()
                 db.commit()
 
@@ -1013,6 +1480,16 @@ class ChatTable:
     ) -> bool:
         try:
             with get_db() as db:
+                db.query(ChatMessageDelta).filter(
+                    ChatMessageDelta.chat_id.in_(
+                        select(Chat.id).filter_by(user_id=user_id, folder_id=folder_id)
+                    )
+                ).delete(synchronize_session=False)
+                db.query(ChatSearch).filter(
+                    ChatSearch.chat_id.in_(
+                        select(Chat.id).filter_by(user_id=user_id, folder_id=folder_id)
+                    )
+                ).delete(synchronize_session=False)
                 db.query(Chat).filter_by(user_id=user_id, folder_id=folder_id).delete()
                 db.commit()
 
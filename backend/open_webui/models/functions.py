@@ -4,7 +4,8 @@ from typing import Optional
 
 from open_webui.internal.db import Base, JSONField, get_db
 from open_webui.models.users import Users
-from open_webui.env import SRC_LOG_LEVELS
+from open_webui.env import MODEL_VIEW_CACHE_TTL, SRC_LOG_LEVELS
+from open_webui.utils.cache import LocalCache
 from pydantic import BaseModel, ConfigDict
 from sqlalchemy import BigInteger, Boolean, Column, String, Text, Index
 
@@ -83,6 +84,14 @@ class FunctionValves(BaseModel):
 
 
 class FunctionsTable:
+    def __init__(self):
+        # Active functions, read for every model list; any function change
+        # drops them
+        self.cache = LocalCache("function", ttl=MODEL_VIEW_CACHE_TTL)
+
+    def invalidate_cache(self) -> None:
+        self.cache.clear()
+
     def insert_new_function(
         self, user_id: str, type: str, form_data: FunctionForm
     ) -> Optional[FunctionModel]:
@@ -102,6 +111,7 @@ class FunctionsTable:
                 db.add(result)
                 db.commit()
                 db.refresh(result)
+                self.invalidate_cache()
                 if result:
                     return FunctionModel.model_validate(result)
                 else:
@@ -149,6 +159,7 @@ class FunctionsTable:
                         db.delete(func)
 
                 db.commit()
+                self.invalidate_cache()
 
                 return [
                     FunctionModel.model_validate(func)
@@ -179,6 +190,12 @@ class FunctionsTable:
                     for function in db.query(Function).all()
                 ]
 
+    def get_active_functions(self) -> list[FunctionModel]:
+        """Active functions, shared with the cache: read-only."""
+        return self.cache.get_or_set(
+            "active", lambda: self.get_functions(active_only=True)
+        )
+
     def get_functions_by_type(
         self, type: str, active_only=False
     ) -> list[FunctionModel]:
@@ -233,6 +250,7 @@ class FunctionsTable:
                 function.updated_at = int(time.time())
                 db.commit()
                 db.refresh(function)
+                self.invalidate_cache()
                 return self.get_function_by_id(id)
             except Exception:
                 return None
@@ -290,6 +308,7 @@ class FunctionsTable:
                     }
                 )
                 db.commit()
+                self.invalidate_cache()
                 return self.get_function_by_id(id)
             except Exception:
                 return None
@@ -304,6 +323,7 @@ class FunctionsTable:
                     }
                 )
                 db.commit()
+                self.invalidate_cache()
                 return True
             except Exception:
                 return None
@@ -313,6 +333,7 @@ class FunctionsTable:
             try:
                 db.query(Function).filter_by(id=id).delete()
                 db.commit()
+                self.invalidate_cache()
 
                 return True
             except Exception:
@@ -5,13 +5,14 @@ from typing import Optional
 import uuid
 
 from open_webui.internal.db import Base, get_db
-from open_webui.env import SRC_LOG_LEVELS
+from open_webui.env import GROUP_CACHE_TTL, SRC_LOG_LEVELS
+from open_webui.utils.cache import LocalCache
 
 from open_webui.models.files import FileMetadataResponse
 
 
 from pydantic import BaseModel, ConfigDict
-from sqlalchemy import BigInteger, Column, String, Text, JSON, func
+from sqlalchemy import BigInteger, Column, Index, Text, JSON
 
 
 log = logging.getLogger(__name__)
@@ -41,6 +42,19 @@ class Group(Base):
     updated_at = Column(BigInteger)
 
 
+class GroupMember(Base):
+    __tablename__ = "group_member"
+
+    # Normalized copy of `group.user_ids`, written together with it, so that
+    # the groups of a user are an index lookup instead of a JSON scan
+    group_id = Column(Text, primary_key=True)
+    user_id = Column(Text, primary_key=True)
+
+    created_at = Column(BigInteger)
+
+    __table_args__ = (Index("group_member_user_id_idx", "user_id"),)
+
+
 class GroupModel(BaseModel):
     model_config = ConfigDict(from_attributes=True)
     id: str
@@ -92,6 +106,25 @@ class GroupUpdateForm(GroupForm, UserIdsForm):
 
 
 class GroupTable:
+    def __init__(self):
+        # user id -> [(group id, group permissions)] and the effective
+        # permissions derived from them; any group change drops both
+        self.member_cache = LocalCache("group_member", ttl=GROUP_CACHE_TTL)
+        self.permission_cache = LocalCache("group_permission", ttl=GROUP_CACHE_TTL)
+
+    def invalidate_cache(self) -> None:
+        self.member_cache.clear()
+        self.permission_cache.clear()
+
+    def _set_group_members(self, db, id: str, user_ids: list[str]) -> None:
+        db.query(GroupMember).filter_by(group_id=id).delete()
+        db.add_all(
+            [
+                GroupMember(group_id=id, user_id=user_id, created_at=int(time.time()))
+                for user_id in dict.fromkeys(user_ids)
+            ]
+        )
+
     def insert_new_group(
         self, user_id: str, form_data: GroupForm
     ) -> Optional[GroupModel]:
@@ -109,8 +142,10 @@ class GroupTable:
             try:
                 result = Group(**group.model_dump())
                 db.add(result)
+                self._set_group_members(db, group.id, group.user_ids)
                 db.commit()
                 db.refresh(result)
+                self.invalidate_cache()
                 if result:
                     return GroupModel.model_validate(result)
                 else:
@@ -131,16 +166,35 @@ class GroupTable:
             return [
                 GroupModel.model_validate(group)
                 for group in db.query(Group)
-                .filter(
-                    func.json_array_length(Group.user_ids) > 0
-                )  # Ensure array exists
-                .filter(
-                    Group.user_ids.cast(String).like(f'%"{user_id}"%')
-                )  # String-based check
+                .join(GroupMember, GroupMember.group_id == Group.id)
+                .filter(GroupMember.user_id == user_id)
                 .order_by(Group.updated_at.desc())
                 .all()
             ]
 
+    def _get_member_group_entries(self, user_id: str) -> list[tuple[str, dict]]:
+        def get_entries():
+            with get_db() as db:
+                return [
+                    (id, permissions or {})
+                    for id, permissions in db.query(Group.id, Group.permissions)
+                    .join(GroupMember, GroupMember.group_id == Group.id)
+                    .filter(GroupMember.user_id == user_id)
+                    .order_by(Group.updated_at.desc())
+                    .all()
+                ]
+
+        return self.member_cache.get_or_set(user_id, get_entries)
+
+    def get_group_ids_by_member_id(self, user_id: str) -> list[str]:
+        return [id for id, _ in self._get_member_group_entries(user_id)]
+
+    def get_group_permissions_by_member_id(self, user_id: str) -> list[dict]:
+        """Permissions of every group of the user, shared with the cache: read-only."""
+        return [
+            permissions for _, permissions in self._get_member_group_entries(user_id)
+        ]
+
     def get_group_by_id(self, id: str) -> Optional[GroupModel]:
         try:
             with get_db() as db:
@@ -167,7 +221,10 @@ class GroupTable:
                         "updated_at": int(time.time()),
                     }
                 )
+                if form_data.user_ids is not None:
+                    self._set_group_members(db, id, form_data.user_ids)
                 db.commit()
+                self.invalidate_cache()
                 return self.get_group_by_id(id=id)
         except Exception as e:
             log.exception(e)
@@ -177,7 +234,9 @@ class GroupTable:
         try:
             with get_db() as db:
                 db.query(Group).filter_by(id=id).delete()
+                db.query(GroupMember).filter_by(group_id=id).delete()
                 db.commit()
+                self.invalidate_cache()
                 return True
         except Exception:
             return False
@@ -186,7 +245,9 @@ class GroupTable:
         with get_db() as db:
             try:
                 db.query(Group).delete()
+                db.query(GroupMember).delete()
                 db.commit()
+                self.invalidate_cache()
 
                 return True
             except Exception:
@@ -198,14 +259,16 @@ class GroupTable:
                 groups = self.get_groups_by_member_id(user_id)
 
                 for group in groups:
-                    group.user_ids.remove(user_id)
                     db.query(Group).filter_by(id=group.id).update(
                         {
-                            "user_ids": group.user_ids,
+                            "user_ids": [id for id in group.user_ids if id != user_id],
                             "updated_at": int(time.time()),
                         }
                     )
-                    db.commit()
+
+                db.query(GroupMember).filter_by(user_id=user_id).delete()
+                db.commit()
+                self.invalidate_cache()
 
                 return True
             except Exception:
@@ -254,26 +317,37 @@ class GroupTable:
 
                 for group in existing_groups:
                     if group.id not in group_ids:
-                        group.user_ids.remove(user_id)
                         db.query(Group).filter_by(id=group.id).update(
                             {
-                                "user_ids": group.user_ids,
+                                "user_ids": [
+                                    id for id in group.user_ids if id != user_id
+                                ],
                                 "updated_at": int(time.time()),
                             }
                         )
+                        db.query(GroupMember).filter_by(
+                            group_id=group.id, user_id=user_id
+                        ).delete()
 
                 # Add user to new groups
                 for group in groups:
-                    if user_id not in group.user_ids:
-                        group.user_ids.append(user_id)
+                    if user_id not in (group.user_ids or []):
                         db.query(Group).filter_by(id=group.id).update(
                             {
-                                "user_ids": group.user_ids,
+                                "user_ids": [*(group.user_ids or []), user_id],
                                 "updated_at": int(time.time()),
                             }
                         )
+                        db.merge(
+                            GroupMember(
+                                group_id=group.id,
+                                user_id=user_id,
+                                created_at=int(time.time()),
+                            )
+                        )
 
                 db.commit()
+                self.invalidate_cache()
                 return True
             except Exception as e:
                 log.exception(e)
@@ -288,16 +362,17 @@ class GroupTable:
                 if not group:
                     return None
 
-                if not group.user_ids:
-                    group.user_ids = []
-
-                for user_id in user_ids:
-                    if user_id not in group.user_ids:
-                        group.user_ids.append(user_id)
+                # Assigned as a new list, in-place changes of a JSON column
+                # are not tracked
+                group.user_ids = list(
+                    dict.fromkeys([*(group.user_ids or []), *user_ids])
+                )
+                self._set_group_members(db, group.id, group.user_ids)
 
                 group.updated_at = int(time.time())
                 db.commit()
                 db.refresh(group)
+                self.invalidate_cache()
                 return GroupModel.model_validate(group)
         except Exception as e:
             log.exception(e)
@@ -315,13 +390,13 @@ class GroupTable:
                 if not group.user_ids:
                     return GroupModel.model_validate(group)
 
-                for user_id in user_ids:
-                    if user_id in group.user_ids:
-                        group.user_ids.remove(user_id)
+                group.user_ids = [id for id in group.user_ids if id not in user_ids]
+                self._set_group_members(db, group.id, group.user_ids)
 
                 group.updated_at = int(time.time())
                 db.commit()
                 db.refresh(group)
+                self.invalidate_cache()
                 return GroupModel.model_validate(group)
         except Exception as e:
             log.exception(e)
@@ -3,7 +3,7 @@ import time
 import uuid
 from typing import Optional
 
-from open_webui.internal.db import Base, get_db
+from open_webui.internal.db import Base, async_db_fallback, get_async_db, get_db
 from open_webui.models.tags import TagModel, Tag, Tags
 
 
@@ -122,6 +122,33 @@ class MessageTable:
             db.refresh(result)
             return MessageModel.model_validate(result) if result else None
 
+    @async_db_fallback(insert_new_message)
+    async def insert_new_message_async(
+        self, form_data: MessageForm, channel_id: str, user_id: str
+    ) -> Optional[MessageModel]:
+        async with get_async_db() as db:
+            id = str(uuid.uuid4())
+
+            ts = int(time.time_ns())
+            message = MessageModel(
+                **{
+                    "id": id,
+                    "user_id": user_id,
+                    "channel_id": channel_id,
+                    "parent_id": form_data.parent_id,
+                    "content": form_data.content,
+                    "data": form_data.data,
+                    "meta": form_data.meta,
+                    "created_at": ts,
+                    "updated_at": ts,
+                }
+            )
+
+            result = Message(**message.model_dump())
+            db.add(result)
+            await db.commit()
+            return MessageModel.model_validate(result) if result else None
+
     def get_message_by_id(self, id: str) -> Optional[MessageResponse]:
         with get_db() as db:
             message = db.get(Message, id)
@@ -140,6 +167,32 @@ class MessageTable:
                 }
             )
 
+    @async_db_fallback(get_message_by_id)
+    async def get_message_by_id_async(self, id: str) -> Optional[MessageResponse]:
+        async with get_async_db() as db:
+            message = await db.get(Message, id)
+            if not message:
+                return None
+
+            result = await db.execute(select(MessageReaction).filter_by(message_id=id))
+            reactions = self._group_reactions(result.scalars().all())
+
+            result = await db.execute(
+                select(Message)
+                .filter_by(parent_id=id)
+                .order_by(Message.created_at.desc())
+            )
+            replies = result.scalars().all()
+
+            return MessageResponse(
+                **{
+                    **MessageModel.model_validate(message).model_dump(),
+                    "latest_reply_at": replies[0].created_at if replies else None,
+                    "reply_count": len(replies),
+                    "reactions": reactions,
+                }
+            )
+
     def get_replies_by_message_id(self, id: str) -> list[MessageModel]:
         with get_db() as db:
             all_messages = (
@@ -226,22 +279,25 @@ class MessageTable:
             db.refresh(result)
             return MessageReactionModel.model_validate(result) if result else None
 
+    @staticmethod
+    def _group_reactions(all_reactions: list[MessageReaction]) -> list[Reactions]:
+        reactions = {}
+        for reaction in all_reactions:
+            if reaction.name not in reactions:
+                reactions[reaction.name] = {
+                    "name": reaction.name,
+                    "user_ids": [],
+                    "count": 0,
+                }
+            reactions[reaction.name]["user_ids"].append(reaction.user_id)
+            reactions[reaction.name]["count"] += 1
+
+        return [Reactions(**reaction) for reaction in reactions.values()]
+
     def get_reactions_by_message_id(self, id: str) -> list[Reactions]:
         with get_db() as db:
             all_reactions = db.query(MessageReaction).filter_by(message_id=id).all()
-
-            reactions = {}
-            for reaction in all_reactions:
-                if reaction.name not in reactions:
-                    reactions[reaction.name] = {
-                        "name": reaction.name,
-                        "user_ids": [],
-                        "count": 0,
-                    }
-                reactions[reaction.name]["user_ids"].append(reaction.user_id)
-                reactions[reaction.name]["count"] += 1
-
-            return [Reactions(**reaction) for reaction in reactions.values()]
+            return self._group_reactions(all_reactions)
 
     def remove_reaction_by_id_and_user_id_and_name(
         self, id: str, user_id: str, name: str
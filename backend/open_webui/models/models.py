@@ -3,7 +3,7 @@ import time
 from typing import Optional
 
 from open_webui.internal.db import Base, JSONField, get_db
-from open_webui.env import SRC_LOG_LEVELS
+from open_webui.env import MODEL_VIEW_CACHE_TTL, SRC_LOG_LEVELS
 
 from open_webui.models.users import Users, UserResponse
 
@@ -16,6 +16,7 @@ from sqlalchemy import BigInteger, Column, Text, JSON, Boolean
 
 
 from open_webui.utils.access_control import has_access
+from open_webui.utils.cache import LocalCache
 
 
 log = logging.getLogger(__name__)
@@ -143,6 +144,16 @@ class ModelForm(BaseModel):
 
 
 class ModelsTable:
+    def __init__(self):
+        # id -> model for the model list, and the access decisions made from
+        # it per user; any model change drops both
+        self.model_cache = LocalCache("model", ttl=MODEL_VIEW_CACHE_TTL)
+        self.access_cache = LocalCache("model_access", ttl=MODEL_VIEW_CACHE_TTL)
+
+    def invalidate_cache(self) -> None:
+        self.model_cache.clear()
+        self.access_cache.clear()
+
     def insert_new_model(
         self, form_data: ModelForm, user_id: str
     ) -> Optional[ModelModel]:
@@ -160,6 +171,7 @@ class ModelsTable:
                 db.add(result)
                 db.commit()
                 db.refresh(result)
+                self.invalidate_cache()
 
                 if result:
                     return ModelModel.model_validate(result)
@@ -173,6 +185,12 @@ class ModelsTable:
         with get_db() as db:
             return [ModelModel.model_validate(model) for model in db.query(Model).all()]
 
+    def get_model_snapshot(self) -> dict[str, ModelModel]:
+        """Every model by id, shared with the cache: read-only."""
+        return self.model_cache.get_or_set(
+            "all", lambda: {model.id: model for model in self.get_all_models()}
+        )
+
     def get_models(self) -> list[ModelUserResponse]:
         with get_db() as db:
             models = []
@@ -226,6 +244,7 @@ class ModelsTable:
                     }
                 )
                 db.commit()
+                self.invalidate_cache()
 
                 return self.get_model_by_id(id)
             except Exception:
@@ -241,6 +260,7 @@ class ModelsTable:
                     .update(model.model_dump(exclude={"id"}))
                 )
                 db.commit()
+                self.invalidate_cache()
 
                 model = db.get(Model, id)
                 db.refresh(model)
@@ -254,6 +274,7 @@ class ModelsTable:
             with get_db() as db:
                 db.query(Model).filter_by(id=id).delete()
                 db.commit()
+                self.invalidate_cache()
 
                 return True
         except Exception:
@@ -264,6 +285,7 @@ class ModelsTable:
             with get_db() as db:
                 db.query(Model).delete()
                 db.commit()
+                self.invalidate_cache()
 
                 return True
         except Exception:
@@ -305,6 +327,7 @@ class ModelsTable:
                         db.delete(model)
 
                 db.commit()
+                self.invalidate_cache()
 
                 return [
                     ModelModel.model_validate(model) for model in db.query(Model).all()
@@ -1,21 +1,38 @@
+import logging
+import threading
 import time
 from typing import Optional
 
-from open_webui.internal.db import Base, JSONField, get_db
-
-
-from open_webui.env import DATABASE_USER_ACTIVE_STATUS_UPDATE_INTERVAL
+from open_webui.internal.db import (
+    Base,
+    JSONField,
+    async_db_fallback,
+    get_async_db,
+    get_db,
+)
+
+
+from open_webui.env import (
+    DATABASE_USER_ACTIVE_STATUS_FLUSH_INTERVAL,
+    DATABASE_USER_ACTIVE_STATUS_UPDATE_INTERVAL,
+    USER_CACHE_TTL,
+    SRC_LOG_LEVELS,
+)
 from open_webui.models.chats import Chats
 from open_webui.models.groups import Groups
+from open_webui.utils.cache import LocalCache
 from open_webui.utils.misc import throttle
 
 
 from pydantic import BaseModel, ConfigDict
 from sqlalchemy import BigInteger, Column, String, Text, Date
-from sqlalchemy import or_
+from sqlalchemy import case, or_, select
 
 import datetime
 
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["MODELS"])
+
 ####################
 # User DB Schema
 ####################
@@ -141,6 +158,20 @@ class UserUpdateForm(BaseModel):
 
 
 class UsersTable:
+    def __init__(self):
+        # Short-lived cache of users by id, shared invalidation across workers
+        self.cache = LocalCache("user", ttl=USER_CACHE_TTL)
+
+        # api_key -> user id; entries are verified against the cached user so
+        # API keys never have to be published for invalidation
+        self.api_key_cache = LocalCache("user_api_key", ttl=USER_CACHE_TTL, redis=None)
+
+        self._last_active: dict[str, int] = {}
+        self._last_active_lock = threading.Lock()
+
+    def invalidate_user_cache(self, id: str) -> None:
+        self.cache.delete(id)
+
     def insert_new_user(
         self,
         id: str,
@@ -174,21 +205,78 @@ class UsersTable:
                 return None
 
     def get_user_by_id(self, id: str) -> Optional[UserModel]:
+        user = self.cache.get(id)
+        if user is not None:
+            return user.model_copy(deep=True)
+
         try:
             with get_db() as db:
-                user = db.query(User).filter_by(id=id).first()
-                return UserModel.model_validate(user)
+                user = UserModel.model_validate(db.query(User).filter_by(id=id).first())
+                self.cache.set(id, user)
+                return user.model_copy(deep=True)
         except Exception:
             return None
 
+    @async_db_fallback(get_user_by_id)
+    async def get_user_by_id_async(self, id: str) -> Optional[UserModel]:
+        user = self.cache.get(id)
+        if user is not None:
+            return user.model_copy(deep=True)
+
+        # Database errors propagate, they must not look like an unknown user
+        async with get_async_db() as db:
+            user = await db.get(User, id)
+            if user is None:
+                return None
+
+            user = UserModel.model_validate(user)
+            self.cache.set(id, user)
+            return user.model_copy(deep=True)
+
     def get_user_by_api_key(self, api_key: str) -> Optional[UserModel]:
+        id = self.api_key_cache.get(api_key)
+        if id is not None:
+            user = self.get_user_by_id(id)
+            if user is not None and user.api_key == api_key:
+                return user
+            self.api_key_cache.delete(api_key)
+
         try:
             with get_db() as db:
-                user = db.query(User).filter_by(api_key=api_key).first()
-                return UserModel.model_validate(user)
+                user = UserModel.model_validate(
+                    db.query(User).filter_by(api_key=api_key).first()
+                )
+
+                if self.cache.enabled:
+                    self.cache.set(user.id, user)
+                    self.api_key_cache.set(api_key, user.id)
+
+                return user.model_copy(deep=True)
         except Exception:
             return None
 
+    @async_db_fallback(get_user_by_api_key)
+    async def get_user_by_api_key_async(self, api_key: str) -> Optional[UserModel]:
+        id = self.api_key_cache.get(api_key)
+        if id is not None:
+            user = await self.get_user_by_id_async(id)
+            if user is not None and user.api_key == api_key:
+                return user
+            self.api_key_cache.delete(api_key)
+
+        async with get_async_db() as db:
+            result = await db.execute(select(User).filter_by(api_key=api_key))
+            user = result.scalars().first()
+            if user is None:
+                return None
+
+            user = UserModel.model_validate(user)
+            if self.cache.enabled:
+                self.cache.set(user.id, user)
+                self.api_key_cache.set(api_key, user.id)
+
+            return user.model_copy(deep=True)
+
     def get_user_by_email(self, email: str) -> Optional[UserModel]:
         try:
             with get_db() as db:
@@ -317,6 +405,7 @@ class UsersTable:
             with get_db() as db:
                 db.query(User).filter_by(id=id).update({"role": role})
                 db.commit()
+                self.invalidate_user_cache(id)
                 user = db.query(User).filter_by(id=id).first()
                 return UserModel.model_validate(user)
         except Exception:
@@ -331,6 +420,7 @@ class UsersTable:
                     {"profile_image_url": profile_image_url}
                 )
                 db.commit()
+                self.invalidate_user_cache(id)
 
                 user = db.query(User).filter_by(id=id).first()
                 return UserModel.model_validate(user)
@@ -338,18 +428,42 @@ class UsersTable:
             return None
 
     @throttle(DATABASE_USER_ACTIVE_STATUS_UPDATE_INTERVAL)
-    def update_user_last_active_by_id(self, id: str) -> Optional[UserModel]:
+    def update_user_last_active_by_id(self, id: str) -> None:
+        """
+        Record a user as active. Timestamps are only collected in memory and
+        written in one bulk UPDATE by the periodic activity flush, every
+        DATABASE_USER_ACTIVE_STATUS_FLUSH_INTERVAL seconds; an interval of 0
+        writes through immediately.
+        """
+        now = int(time.time())
+
+        user = self.cache.get(id)
+        if user is not None:
+            user.last_active_at = now
+
+        with self._last_active_lock:
+            self._last_active[id] = now
+
+        if DATABASE_USER_ACTIVE_STATUS_FLUSH_INTERVAL <= 0:
+            self.flush_user_last_active()
+
+    def flush_user_last_active(self) -> None:
+        with self._last_active_lock:
+            pending = self._last_active
+            self._last_active = {}
+
+        if not pending:
+            return
+
         try:
             with get_db() as db:
-                db.query(User).filter_by(id=id).update(
-                    {"last_active_at": int(time.time())}
+                db.query(User).filter(User.id.in_(pending.keys())).update(
+                    {"last_active_at": case(pending, value=User.id)},
+                    synchronize_session=False,
                 )
                 db.commit()
-
-                user = db.query(User).filter_by(id=id).first()
-                return UserModel.model_validate(user)
-        except Exception:
-            return None
+        except Exception as e:
+            log.warning(f"Failed to update last active of {len(pending)} users: {e}")
 
     def update_user_oauth_sub_by_id(
         self, id: str, oauth_sub: str
@@ -358,6 +472,7 @@ class UsersTable:
             with get_db() as db:
                 db.query(User).filter_by(id=id).update({"oauth_sub": oauth_sub})
                 db.commit()
+                self.invalidate_user_cache(id)
 
                 user = db.query(User).filter_by(id=id).first()
                 return UserModel.model_validate(user)
@@ -369,6 +484,7 @@ class UsersTable:
             with get_db() as db:
                 db.query(User).filter_by(id=id).update(updated)
                 db.commit()
+                self.invalidate_user_cache(id)
 
                 user = db.query(User).filter_by(id=id).first()
                 return UserModel.model_validate(user)
@@ -389,6 +505,7 @@ class UsersTable:
 
                 db.query(User).filter_by(id=id).update({"settings": user_settings})
                 db.commit()
+                self.invalidate_user_cache(id)
 
                 user = db.query(User).filter_by(id=id).first()
                 return UserModel.model_validate(user)
@@ -407,6 +524,7 @@ class UsersTable:
                     # Delete User
                     db.query(User).filter_by(id=id).delete()
                     db.commit()
+                    self.invalidate_user_cache(id)
 
                 return True
             else:
@@ -419,6 +537,7 @@ class UsersTable:
             with get_db() as db:
                 result = db.query(User).filter_by(id=id).update({"api_key": api_key})
                 db.commit()
+                self.invalidate_user_cache(id)
                 return True if result == 1 else False
         except Exception:
             return False
@@ -0,0 +1,527 @@
+import heapq
+import json
+import logging
+import math
+import os
+import re
+import shutil
+import sqlite3
+import threading
+from collections import Counter
+from typing import Dict, List, Optional, Union
+
+from open_webui.retrieval.vector.main import (
+    GetResult,
+    SearchResult,
+    VectorDBBase,
+    VectorItem,
+)
+from open_webui.config import (
+    ENABLE_RAG_BM25_INDEX,
+    RAG_BM25_INDEX_DIR,
+    RAG_BM25_K1,
+    RAG_BM25_B,
+)
+from open_webui.env import SRC_LOG_LEVELS
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["RAG"])
+
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(text.lower()) if text else []
+
+
+def is_indexed_value(value) -> bool:
+    return isinstance(value, (str, int, float, bool))
+
+
+def get_metadata_rows(doc_id: str, metadata: Optional[dict]) -> List[tuple]:
+    """(key, value, doc_id) rows for the scalar metadata values delete() filters on."""
+    return [
+        (key, json.dumps(value), doc_id)
+        for key, value in (metadata or {}).items()
+        if is_indexed_value(value)
+    ]
+
+
+class BM25Index:
+    """
+    Persistent inverted index used for the lexical half of hybrid search.
+
+    Every collection gets its own SQLite file holding the chunk texts, their
+    metadata and a (term, doc_id) -> tf postings table. The index is updated
+    incrementally whenever chunks are added to or removed from the vector
+    database, so a query only has to read the postings of its own terms
+    instead of re-tokenizing the whole collection. Scalar metadata values are
+    indexed as well, so deleting by filter does not scan every chunk.
+    """
+
+    def __init__(self, path: str, k1: float = 1.5, b: float = 0.75):
+        self.path = path
+        self.k1 = k1
+        self.b = b
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_lock = threading.Lock()
+        os.makedirs(self.path, exist_ok=True)
+
+    def _get_lock(self, collection_name: str) -> threading.Lock:
+        with self._locks_lock:
+            if collection_name not in self._locks:
+                self._locks[collection_name] = threading.Lock()
+            return self._locks[collection_name]
+
+    def _get_db_path(self, collection_name: str) -> str:
+        filename = re.sub(r"[^A-Za-z0-9_.-]", "_", collection_name)
+        return os.path.join(self.path, f"{filename}.db")
+
+    def _connect(self, collection_name: str) -> sqlite3.Connection:
+        conn = sqlite3.connect(self._get_db_path(collection_name), timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS document (
+                id TEXT PRIMARY KEY,
+                text TEXT NOT NULL,
+                metadata TEXT,
+                length INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS posting (
+                term TEXT NOT NULL,
+                doc_id TEXT NOT NULL,
+                tf INTEGER NOT NULL,
+                PRIMARY KEY (term, doc_id)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS posting_doc_id_idx ON posting (doc_id);
+            CREATE TABLE IF NOT EXISTS metadata (
+                key TEXT NOT NULL,
+                value TEXT NOT NULL,
+                doc_id TEXT NOT NULL,
+                PRIMARY KEY (key, value, doc_id)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS metadata_doc_id_idx ON metadata (doc_id);
+            CREATE TABLE IF NOT EXISTS stat (
+                key TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            );
+            INSERT OR IGNORE INTO stat (key, value) VALUES ('doc_count', 0);
+            INSERT OR IGNORE INTO stat (key, value) VALUES ('total_length', 0);
+            """
+        )
+
+        # Indexes written before the metadata table existed are backfilled once
+        if (
+            conn.execute("SELECT 1 FROM stat WHERE key = 'metadata_indexed'").fetchone()
+            is None
+        ):
+            with conn:
+                for doc_id, metadata in conn.execute(
+                    "SELECT id, metadata FROM document"
+                ).fetchall():
+                    conn.executemany(
+                        "INSERT OR IGNORE INTO metadata (key, value, doc_id) VALUES (?, ?, ?)",
+                        get_metadata_rows(doc_id, json.loads(metadata or "{}")),
+                    )
+                conn.execute(
+                    "INSERT OR IGNORE INTO stat (key, value) VALUES ('metadata_indexed', 1)"
+                )
+        return conn
+
+    def has_collection(self, collection_name: str) -> bool:
+        return os.path.exists(self._get_db_path(collection_name))
+
+    def _remove_documents(self, conn: sqlite3.Connection, ids: List[str]) -> None:
+        for doc_id in ids:
+            row = conn.execute(
+                "SELECT length FROM document WHERE id = ?", (doc_id,)
+            ).fetchone()
+            if row is None:
+                continue
+
+            conn.execute("DELETE FROM posting WHERE doc_id = ?", (doc_id,))
+            conn.execute("DELETE FROM metadata WHERE doc_id = ?", (doc_id,))
+            conn.execute("DELETE FROM document WHERE id = ?", (doc_id,))
+            conn.execute("UPDATE stat SET value = value - 1 WHERE key = 'doc_count'")
+            conn.execute(
+                "UPDATE stat SET value = value - ? WHERE key = 'total_length'",
+                (row[0],),
+            )
+
+    def upsert(self, collection_name: str, items: List[dict]) -> None:
+        """Add or replace chunks ({id, text, metadata}) in a collection index."""
+        if not items:
+            return
+
+        with self._get_lock(collection_name):
+            conn = self._connect(collection_name)
+            try:
+                with conn:
+                    self._remove_documents(conn, [item["id"] for item in items])
+
+                    total_length = 0
+                    for item in items:
+                        tokens = tokenize(item["text"])
+                        total_length += len(tokens)
+
+                        conn.execute(
+                            "INSERT INTO document (id, text, metadata, length) VALUES (?, ?, ?, ?)",
+                            (
+                                item["id"],
+                                item["text"],
+                                json.dumps(item.get("metadata") or {}, default=str),
+                                len(tokens),
+                            ),
+                        )
+                        conn.executemany(
+                            "INSERT INTO posting (term, doc_id, tf) VALUES (?, ?, ?)",
+                            [
+                                (term, item["id"], tf)
+                                for term, tf in Counter(tokens).items()
+                            ],
+                        )
+                        conn.executemany(
+                            "INSERT INTO metadata (key, value, doc_id) VALUES (?, ?, ?)",
+                            get_metadata_rows(item["id"], item.get("metadata")),
+                        )
+
+                    conn.execute(
+                        "UPDATE stat SET value = value + ? WHERE key = 'doc_count'",
+                        (len(items),),
+                    )
+                    conn.execute(
+                        "UPDATE stat SET value = value + ? WHERE key = 'total_length'",
+                        (total_length,),
+                    )
+            finally:
+                conn.close()
+
+    def build(self, collection_name: str, result: Optional[GetResult]) -> None:
+        """(Re)build a collection index from a full vector DB get() result."""
+        self.delete_collection(collection_name)
+
+        items = []
+        if result is not None and result.ids:
+            items = [
+                {
+                    "id": id,
+                    "text": result.documents[0][idx],
+                    "metadata": result.metadatas[0][idx],
+                }
+                for idx, id in enumerate(result.ids[0])
+            ]
+
+        # Always create the file so empty collections are not rebuilt per query
+        with self._get_lock(collection_name):
+            self._connect(collection_name).close()
+        self.upsert(collection_name, items)
+
+    def delete(
+        self,
+        collection_name: str,
+        ids: Optional[List[str]] = None,
+        filter: Optional[Dict] = None,
+    ) -> None:
+        if not self.has_collection(collection_name):
+            return
+
+        if ids is None and filter is None:
+            self.delete_collection(collection_name)
+            return
+
+        with self._get_lock(collection_name):
+            conn = self._connect(collection_name)
+            try:
+                with conn:
+                    if filter:
+                        matches = self._get_filtered_ids(conn, filter)
+                        ids = [
+                            doc_id for doc_id in matches if ids is None or doc_id in ids
+                        ]
+                    self._remove_documents(conn, ids or [])
+            finally:
+                conn.close()
+
+    def _get_filtered_ids(self, conn: sqlite3.Connection, filter: Dict) -> List[str]:
+        if not all(is_indexed_value(value) for value in filter.values()):
+            # Only scalar values are indexed, anything else is matched by scanning
+            return [
+                doc_id
+                for doc_id, metadata in conn.execute(
+                    "SELECT id, metadata FROM document"
+                )
+                if all(
+                    json.loads(metadata or "{}").get(key) == value
+                    for key, value in filter.items()
+                )
+            ]
+
+        query = " INTERSECT ".join(
+            "SELECT doc_id FROM metadata WHERE key = ? AND value = ?" for _ in filter
+        )
+        params = [
+            param for key, value in filter.items() for param in (key, json.dumps(value))
+        ]
+        return [row[0] for row in conn.execute(query, params)]
+
+    def delete_collection(self, collection_name: str) -> None:
+        with self._get_lock(collection_name):
+            db_path = self._get_db_path(collection_name)
+            for suffix in ["", "-wal", "-shm"]:
+                if os.path.exists(f"{db_path}{suffix}"):
+                    os.remove(f"{db_path}{suffix}")
+
+    def reset(self) -> None:
+        with self._locks_lock:
+            shutil.rmtree(self.path, ignore_errors=True)
+            os.makedirs(self.path, exist_ok=True)
+
+    def search(self, collection_name: str, query: str, limit: int) -> SearchResult:
+        """Score the postings of the query terms with Okapi BM25."""
+        terms = list(set(tokenize(query)))
+        if not terms or not self.has_collection(collection_name):
+            return SearchResult(
+                ids=[[]], documents=[[]], metadatas=[[]], distances=[[]]
+            )
+
+        conn = self._connect(collection_name)
+        try:
+            stats = dict(conn.execute("SELECT key, value FROM stat"))
+            doc_count = stats.get("doc_count", 0)
+            avg_length = stats.get("total_length", 0) / doc_count if doc_count else 0
+
+            placeholders = ", ".join("?" for _ in terms)
+            postings: Dict[str, list] = {}
+            for term, doc_id, tf, length in conn.execute(
+                f"""
+                SELECT p.term, p.doc_id, p.tf, d.length
+                FROM posting p JOIN document d ON d.id = p.doc_id
+                WHERE p.term IN ({placeholders})
+                """,
+                terms,
+            ):
+                postings.setdefault(term, []).append((doc_id, tf, length))
+
+            scores: Dict[str, float] = {}
+            for term, entries in postings.items():
+                df = len(entries)
+                idf = math.log((doc_count - df + 0.5) / (df + 0.5) + 1)
+                for doc_id, tf, length in entries:
+                    norm = self.k1 * (
+                        1 - self.b + self.b * (length / avg_length if avg_length else 0)
+                    )
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * (
+                        tf * (self.k1 + 1) / (tf + norm)
+                    )
+
+            top = heapq.nlargest(limit, scores.items(), key=lambda x: x[1])
+
+            ids, documents, metadatas, distances = [], [], [], []
+            for doc_id, score in top:
+                row = conn.execute(
+                    "SELECT text, metadata FROM document WHERE id = ?", (doc_id,)
+                ).fetchone()
+                if row is None:
+                    continue
+                ids.append(doc_id)
+                documents.append(row[0])
+                metadatas.append(json.loads(row[1] or "{}"))
+                distances.append(score)
+
+            return SearchResult(
+                ids=[ids],
+                documents=[documents],
+                metadatas=[metadatas],
+                distances=[distances],
+            )
+        finally:
+            conn.close()
+
+
+class BM25IndexedVectorClient(VectorDBBase):
+    """
+    Vector DB client that keeps the BM25 index in step with every write.
+
+    Inserts, upserts and deletes go to the wrapped client first and are then
+    applied to the index, so no caller has to maintain it separately. A
+    collection that already held chunks before it had an index is not indexed
+    incrementally; its index is built from the vector DB on its first hybrid
+    search instead. Reads go straight to the wrapped client.
+    """
+
+    def __init__(self, client: VectorDBBase, index: BM25Index):
+        self.client = client
+        self.index = index
+        self.supports_multi_vector_search = client.supports_multi_vector_search
+        self.supports_multi_collection_search = client.supports_multi_collection_search
+        self.supports_quantization = client.supports_quantization
+
+    def __getattr__(self, name: str):
+        # Backend specific helpers the base class does not define
+        if name == "client":
+            raise AttributeError(name)
+        return getattr(self.client, name)
+
+    def _is_indexed(self, collection_name: str) -> bool:
+        return self.index.has_collection(
+            collection_name
+        ) or not self.client.has_collection(collection_name)
+
+    def _update_index(self, collection_name: str, update, *args, **kwargs) -> None:
+        try:
+            update(collection_name, *args, **kwargs)
+        except Exception as e:
+            # Drop the stale index, it is rebuilt on the next hybrid search
+            log.exception(f"Error updating BM25 index of {collection_name}: {e}")
+            self.index.delete_collection(collection_name)
+
+    def _index_items(
+        self, collection_name: str, items: List[VectorItem], indexed: bool
+    ) -> None:
+        if indexed:
+            self._update_index(
+                collection_name,
+                self.index.upsert,
+                items=[
+                    {
+                        "id": item["id"],
+                        "text": item["text"],
+                        "metadata": item.get("metadata"),
+                    }
+                    for item in items
+                ],
+            )
+
+    def has_collection(self, collection_name: str) -> bool:
+        return self.client.has_collection(collection_name)
+
+    def delete_collection(self, collection_name: str) -> None:
+        self.client.delete_collection(collection_name)
+        self.index.delete_collection(collection_name)
+
+    def insert(self, collection_name: str, items: List[VectorItem]) -> None:
+        indexed = self._is_indexed(collection_name)
+        self.client.insert(collection_name, items)
+        self._index_items(collection_name, items, indexed)
+
+    def upsert(self, collection_name: str, items: List[VectorItem]) -> None:
+        indexed = self._is_indexed(collection_name)
+        self.client.upsert(collection_name, items)
+        self._index_items(collection_name, items, indexed)
+
+    def search(
+        self, collection_name: str, vectors: List[List[Union[float, int]]], limit: int
+    ) -> Optional[SearchResult]:
+        return self.client.search(collection_name, vectors, limit)
+
+    def search_vectors(
+        self, collection_name: str, vectors: List[List[Union[float, int]]], limit: int
+    ) -> Optional[SearchResult]:
+        return self.client.search_vectors(collection_name, vectors, limit)
+
+    def search_collections(
+        self,
+        collection_names: List[str],
+        vectors: List[List[Union[float, int]]],
+        limit: int,
+    ) -> Dict[str, Optional[SearchResult]]:
+        return self.client.search_collections(collection_names, vectors, limit)
+
+    def query(
+        self, collection_name: str, filter: Dict, limit: Optional[int] = None
+    ) -> Optional[GetResult]:
+        return self.client.query(collection_name, filter, limit)
+
+    def get(self, collection_name: str) -> Optional[GetResult]:
+        return self.client.get(collection_name)
+
+    def delete(
+        self,
+        collection_name: str,
+        ids: Optional[List[str]] = None,
+        filter: Optional[Dict] = None,
+    ) -> None:
+        self.client.delete(collection_name, ids=ids, filter=filter)
+        self._update_index(collection_name, self.index.delete, ids=ids, filter=filter)
+
+    def reset(self) -> None:
+        self.client.reset()
+        self.index.reset()
+
+    def rebuild_index(self, collection_name: Optional[str] = None) -> None:
+        return self.client.rebuild_index(collection_name)
+
+    # Keep the native async implementations of the wrapped client
+    async def has_collection_async(self, collection_name: str) -> bool:
+        return await self.client.has_collection_async(collection_name)
+
+    async def delete_collection_async(self, collection_name: str) -> None:
+        await self.client.delete_collection_async(collection_name)
+        await self._run_in_executor(self.index.delete_collection, collection_name)
+
+    async def insert_async(self, collection_name: str, items: List[VectorItem]) -> None:
+        indexed = await self._run_in_executor(self._is_indexed, collection_name)
+        await self.client.insert_async(collection_name, items)
+        await self._run_in_executor(self._index_items, collection_name, items, indexed)
+
+    async def upsert_async(self, collection_name: str, items: List[VectorItem]) -> None:
+        indexed = await self._run_in_executor(self._is_indexed, collection_name)
+        await self.client.upsert_async(collection_name, items)
+        await self._run_in_executor(self._index_items, collection_name, items, indexed)
+
+    async def search_async(
+        self, collection_name: str, vectors: List[List[Union[float, int]]], limit: int
+    ) -> Optional[SearchResult]:
+        return await self.client.search_async(collection_name, vectors, limit)
+
+    async def search_vectors_async(
+        self, collection_name: str, vectors: List[List[Union[float, int]]], limit: int
+    ) -> Optional[SearchResult]:
+        return await self.client.search_vectors_async(collection_name, vectors, limit)
+
+    async def search_collections_async(
+        self,
+        collection_names: List[str],
+        vectors: List[List[Union[float, int]]],
+        limit: int,
+    ) -> Dict[str, Optional[SearchResult]]:
+        return await self.client.search_collections_async(
+            collection_names, vectors, limit
+        )
+
+    async def query_async(
+        self, collection_name: str, filter: Dict, limit: Optional[int] = None
+    ) -> Optional[GetResult]:
+        return await self.client.query_async(collection_name, filter, limit)
+
+    async def get_async(self, collection_name: str) -> Optional[GetResult]:
+        return await self.client.get_async(collection_name)
+
+    async def delete_async(
+        self,
+        collection_name: str,
+        ids: Optional[List[str]] = None,
+        filter: Optional[Dict] = None,
+    ) -> None:
+        await self.client.delete_async(collection_name, ids=ids, filter=filter)
+        await self._run_in_executor(
+            self._update_index,
+            collection_name,
+            self.index.delete,
+            ids=ids,
+            filter=filter,
+        )
+
+    async def reset_async(self) -> None:
+        await self.client.reset_async()
+        await self._run_in_executor(self.index.reset)
+
+
+BM25_INDEX = (
+    BM25Index(RAG_BM25_INDEX_DIR, k1=RAG_BM25_K1, b=RAG_BM25_B)
+    if ENABLE_RAG_BM25_INDEX
+    else None
+)
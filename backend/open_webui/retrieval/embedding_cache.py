@@ -0,0 +1,243 @@
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+
+from open_webui.config import (
+    ENABLE_RAG_EMBEDDING_CACHE,
+    RAG_EMBEDDING_CACHE_DIR,
+    RAG_EMBEDDING_CACHE_MAX_ENTRIES,
+    RAG_EMBEDDING_CACHE_MEMORY_ENTRIES,
+)
+from open_webui.env import SRC_LOG_LEVELS
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["RAG"])
+
+# Access times only have to order entries for eviction, so a hit refreshes a
+# row at most once per interval instead of writing on every lookup
+ACCESS_UPDATE_INTERVAL = 60 * 60
+
+
+class EmbeddingCache:
+    """
+    Content-addressed cache for embeddings.
+
+    Entries are keyed by (sha256(prefix + text), engine, model) and kept in a
+    small in-process LRU in front of a persistent SQLite store shared by all
+    workers. The store is trimmed to `max_entries` by evicting the least
+    recently used rows. Rows are only counted once the approximate count kept
+    by this worker may exceed the limit, and trimming leaves some headroom so
+    that does not happen on every write.
+    """
+
+    def __init__(self, path: str, max_entries: int, memory_entries: int):
+        self.path = path
+        self.max_entries = max_entries
+        self.memory_entries = memory_entries
+
+        self.hits = 0
+        self.misses = 0
+
+        # Exact row count at the last check plus the rows written since; rows
+        # written by other workers are picked up by recounting periodically
+        self._row_count: Optional[int] = None
+        self._written = 0
+        self._recount_interval = max(1, max_entries // 10)
+
+        self._memory: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+        os.makedirs(self.path, exist_ok=True)
+        self._db_path = os.path.join(self.path, "embeddings.db")
+
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS embedding (
+                        hash TEXT NOT NULL,
+                        engine TEXT NOT NULL,
+                        model TEXT NOT NULL,
+                        vector BLOB NOT NULL,
+                        accessed_at REAL NOT NULL,
+                        PRIMARY KEY (hash, engine, model)
+                    )
+                    """
+                )
+                conn.execute(
+                    "CREATE INDEX IF NOT EXISTS embedding_accessed_at_idx ON embedding (accessed_at)"
+                )
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self._db_path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @staticmethod
+    def get_hash(text: str, prefix: Optional[str] = None) -> str:
+        return hashlib.sha256(f"{prefix or ''}{text}".encode()).hexdigest()
+
+    def _remember(self, key: tuple, vector: list[float]) -> None:
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def get_many(self, hashes: List[str], engine: str, model: str) -> Dict[str, list]:
+        result = {}
+        missing = []
+
+        with self._lock:
+            for hash in hashes:
+                key = (hash, engine, model)
+                if key in self._memory:
+                    self._memory.move_to_end(key)
+                    result[hash] = self._memory[key]
+                else:
+                    missing.append(hash)
+
+        if missing:
+            conn = self._connect()
+            try:
+                with conn:
+                    for i in range(0, len(missing), 500):
+                        batch = missing[i : i + 500]
+                        placeholders = ", ".join("?" for _ in batch)
+                        rows = conn.execute(
+                            f"SELECT hash, vector, accessed_at FROM embedding WHERE engine = ? AND model = ? AND hash IN ({placeholders})",
+                            [engine, model, *batch],
+                        ).fetchall()
+
+                        now = time.time()
+                        stale = [
+                            (now, hash, engine, model)
+                            for hash, _, accessed_at in rows
+                            if now - accessed_at >= ACCESS_UPDATE_INTERVAL
+                        ]
+                        if stale:
+                            conn.executemany(
+                                "UPDATE embedding SET accessed_at = ? WHERE hash = ? AND engine = ? AND model = ?",
+                                stale,
+                            )
+
+                        for hash, blob, _ in rows:
+                            result[hash] = array("f", blob).tolist()
+            finally:
+                conn.close()
+
+            with self._lock:
+                for hash in missing:
+                    if hash in result:
+                        self._remember((hash, engine, model), result[hash])
+
+        with self._lock:
+            self.hits += len(result)
+            self.misses += len(hashes) - len(result)
+
+        return result
+
+    def set_many(self, vectors: Dict[str, list], engine: str, model: str) -> None:
+        if not vectors:
+            return
+
+        with self._lock:
+            for hash, vector in vectors.items():
+                self._remember((hash, engine, model), vector)
+
+        now = time.time()
+        conn = self._connect()
+        try:
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO embedding (hash, engine, model, vector, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                    [
+                        (hash, engine, model, array("f", vector).tobytes(), now)
+                        for hash, vector in vectors.items()
+                    ],
+                )
+
+                if self._needs_count(len(vectors)):
+                    self._trim(conn)
+        finally:
+            conn.close()
+
+    def _needs_count(self, written: int) -> bool:
+        with self._lock:
+            self._written += written
+            return (
+                self._row_count is None
+                or self._row_count + self._written > self.max_entries
+                or self._written >= self._recount_interval
+            )
+
+    def _trim(self, conn: sqlite3.Connection) -> None:
+        (count,) = conn.execute("SELECT COUNT(*) FROM embedding").fetchone()
+        if count > self.max_entries:
+            target = self.max_entries - self.max_entries // 10
+            conn.execute(
+                "DELETE FROM embedding WHERE rowid IN (SELECT rowid FROM embedding ORDER BY accessed_at LIMIT ?)",
+                (count - target,),
+            )
+            count = target
+
+        with self._lock:
+            self._row_count = count
+            self._written = 0
+
+    def wrap(self, func: Callable, engine: str, model: str) -> Callable:
+        """Wrap an embedding function returned by get_embedding_function."""
+
+        def cached_func(query, prefix=None, user=None):
+            texts = query if isinstance(query, list) else [query]
+            hashes = [self.get_hash(text, prefix) for text in texts]
+
+            try:
+                cached = self.get_many(hashes, engine, model)
+            except Exception as e:
+                log.warning(f"Embedding cache lookup failed: {e}")
+                cached = {}
+
+            # Only embed each distinct uncached text once
+            missing = {}
+            for text, hash in zip(texts, hashes):
+                if hash not in cached and hash not in missing:
+                    missing[hash] = text
+
+            if missing:
+                embeddings = func(list(missing.values()), prefix, user)
+                if embeddings is None:
+                    return None
+
+                computed = dict(zip(missing.keys(), embeddings))
+                cached.update(computed)
+
+                try:
+                    self.set_many(computed, engine, model)
+                except Exception as e:
+                    log.warning(f"Embedding cache update failed: {e}")
+
+            embeddings = [cached[hash] for hash in hashes]
+            return embeddings if isinstance(query, list) else embeddings[0]
+
+        return cached_func
+
+
+EMBEDDING_CACHE = (
+    EmbeddingCache(
+        RAG_EMBEDDING_CACHE_DIR,
+        max_entries=RAG_EMBEDDING_CACHE_MAX_ENTRIES,
+        memory_entries=RAG_EMBEDDING_CACHE_MEMORY_ENTRIES,
+    )
+    if ENABLE_RAG_EMBEDDING_CACHE
+    else None
+)
@@ -3,6 +3,7 @@ import logging
 import ftfy
 import sys
 import json
+from typing import Iterator
 
 from langchain_community.document_loaders import (
     AzureAIDocumentIntelligenceLoader,
@@ -214,15 +215,24 @@ class Loader:
     def load(
         self, filename: str, file_content_type: str, file_path: str
     ) -> list[Document]:
+        return list(self.lazy_load(filename, file_content_type, file_path))
+
+    def lazy_load(
+        self, filename: str, file_content_type: str, file_path: str
+    ) -> Iterator[Document]:
         loader = self._get_loader(filename, file_content_type, file_path)
-        docs = loader.load()
 
-        return [
-            Document(
+        # Langchain loaders yield one document per page, the remote extraction
+        # engines only implement load() and return everything at once
+        if hasattr(loader, "lazy_load"):
+            docs = loader.lazy_load()
+        else:
+            docs = loader.load()
+
+        for doc in docs:
+            yield Document(
                 page_content=ftfy.fix_text(doc.page_content), metadata=doc.metadata
             )
-            for doc in docs
-        ]
 
     def _is_text_file(self, file_ext: str, file_content_type: str) -> bool:
         return file_ext in known_source_ext or (
@@ -1,10 +1,13 @@
+import asyncio
+import functools
+import itertools
 import logging
 import os
 from typing import Optional, Union
 
 import requests
 import hashlib
-from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 import time
 
 from urllib.parse import quote
@@ -15,13 +18,19 @@ from langchain_core.documents import Document
 
 from open_webui.config import VECTOR_DB
 from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
+from open_webui.retrieval.bm25 import BM25_INDEX
+from open_webui.retrieval.embedding_cache import EMBEDDING_CACHE
 
 from open_webui.models.users import UserModel
 from open_webui.models.files import Files
 from open_webui.models.knowledge import Knowledges
 from open_webui.models.notes import Notes
 
-from open_webui.retrieval.vector.main import GetResult
+from open_webui.retrieval.vector.main import (
+    GetResult,
+    VECTOR_DB_EXECUTOR,
+    submit_to_vector_db_executor,
+)
 from open_webui.utils.access_control import has_access
 
 
@@ -34,6 +43,7 @@ from open_webui.config import (
     RAG_EMBEDDING_QUERY_PREFIX,
     RAG_EMBEDDING_CONTENT_PREFIX,
     RAG_EMBEDDING_PREFIX_FIELD_NAME,
+    RAG_EMBEDDING_DIMENSIONS,
 )
 
 log = logging.getLogger(__name__)
@@ -78,6 +88,28 @@ class VectorSearchRetriever(BaseRetriever):
         return results
 
 
+class BM25IndexRetriever(BaseRetriever):
+    collection_name: Any
+    top_k: int
+
+    def _get_relevant_documents(
+        self,
+        query: str,
+        *,
+        run_manager: CallbackManagerForRetrieverRun,
+    ) -> list[Document]:
+        result = BM25_INDEX.search(
+            collection_name=self.collection_name,
+            query=query,
+            limit=self.top_k,
+        )
+
+        return [
+            Document(metadata=metadata, page_content=document)
+            for document, metadata in zip(result.documents[0], result.metadatas[0])
+        ]
+
+
 def query_doc(
     collection_name: str, query_embedding: list[float], k: int, user: UserModel = None
 ):
@@ -112,6 +144,27 @@ def get_doc(collection_name: str, user: UserModel = None):
         raise e
 
 
+def get_bm25_collection_result(collection_name: str):
+    """
+    Prepare a collection for the BM25 half of hybrid search.
+
+    Returns None if the collection does not exist. When the persistent BM25
+    index is enabled the index is built on first use and an empty list is
+    returned, as the collection data does not need to be fetched anymore.
+    Otherwise the full collection is fetched for an in-memory BM25 retriever.
+    """
+    if BM25_INDEX and BM25_INDEX.has_collection(collection_name):
+        return []
+
+    result = VECTOR_DB_CLIENT.get(collection_name=collection_name)
+    if result is None or not BM25_INDEX:
+        return result
+
+    log.info(f"Building BM25 index for collection {collection_name}")
+    BM25_INDEX.build(collection_name, result)
+    return []
+
+
 def query_doc_with_hybrid_search(
     collection_name: str,
     collection_result: GetResult,
@@ -127,11 +180,17 @@ def query_doc_with_hybrid_search(
         # BM_25 required only if weight is greater than 0
         if hybrid_bm25_weight > 0:
             log.debug(f"query_doc_with_hybrid_search:doc {collection_name}")
-            bm25_retriever = BM25Retriever.from_texts(
-                texts=collection_result.documents[0],
-                metadatas=collection_result.metadatas[0],
-            )
-            bm25_retriever.k = k
+            if BM25_INDEX and BM25_INDEX.has_collection(collection_name):
+                bm25_retriever = BM25IndexRetriever(
+                    collection_name=collection_name,
+                    top_k=k,
+                )
+            else:
+                bm25_retriever = BM25Retriever.from_texts(
+                    texts=collection_result.documents[0],
+                    metadatas=collection_result.metadatas[0],
+                )
+                bm25_retriever.k = k
 
         vector_search_retriever = VectorSearchRetriever(
             collection_name=collection_name,
@@ -216,42 +275,64 @@ def merge_get_results(get_results: list[dict]) -> dict:
 
 
 def merge_and_sort_query_results(query_results: list[dict], k: int) -> dict:
-    # Initialize lists to store combined data
-    combined = dict()  # To store documents with unique document hashes
-
+    """
+    Merge query results into the top k unique chunks by score.
+
+    Chunks are deduplicated by the `chunk_hash` stored in their metadata at
+    ingest (falling back to hashing the text for older collections), keeping
+    the best score, and the top k are selected with a partition instead of
+    sorting every candidate. Ties keep the order in which the chunks first
+    appeared.
+    """
+    scores = []
+    documents = []
+    metadatas = []
+    codes = []
+    keys = {}
+
+    # Every row of every result, i.e. the hits of every query vector
     for data in query_results:
-        distances = data["distances"][0]
-        documents = data["documents"][0]
-        metadatas = data["metadatas"][0]
-
-        for distance, document, metadata in zip(distances, documents, metadatas):
-            if isinstance(document, str):
-                doc_hash = hashlib.sha256(
-                    document.encode()
-                ).hexdigest()  # Compute a hash for uniqueness
-
-                if doc_hash not in combined.keys():
-                    combined[doc_hash] = (distance, document, metadata)
-                    continue  # if doc is new, no further comparison is needed
-
-                # if doc is alredy in, but new distance is better, update
-                if distance > combined[doc_hash][0]:
-                    combined[doc_hash] = (distance, document, metadata)
-
-    combined = list(combined.values())
-    # Sort the list based on distances
-    combined.sort(key=lambda x: x[0], reverse=True)
-
-    # Slice to keep only the top k elements
-    sorted_distances, sorted_documents, sorted_metadatas = (
-        zip(*combined[:k]) if combined else ([], [], [])
-    )
+        for distance, document, metadata in zip(
+            itertools.chain.from_iterable(data["distances"]),
+            itertools.chain.from_iterable(data["documents"]),
+            itertools.chain.from_iterable(data["metadatas"]),
+        ):
+            if not isinstance(document, str):
+                continue
+
+            key = (metadata or {}).get("chunk_hash") or hashlib.sha256(
+                document.encode()
+            ).hexdigest()
+
+            scores.append(distance)
+            documents.append(document)
+            metadatas.append(metadata)
+            codes.append(keys.setdefault(key, len(keys)))
+
+    if not scores:
+        return {"distances": [[]], "documents": [[]], "metadatas": [[]]}
+
+    scores = np.asarray(scores, dtype=np.float64)
+    codes = np.asarray(codes, dtype=np.int64)
+
+    # Best scoring occurrence of every chunk: order by chunk, then by score
+    # descending (stable, so the first occurrence wins ties) and take the
+    # first row of each chunk
+    order = np.lexsort((-scores, codes))
+    _, first = np.unique(codes[order], return_index=True)
+    unique = order[first]
+
+    if k < len(unique):
+        # Everything scoring at least the k-th best score, so that ties at the
+        # cut are broken by first appearance like the rest
+        kth = np.partition(scores[unique], len(unique) - k)[len(unique) - k]
+        unique = unique[scores[unique] >= kth]
+    top = unique[np.lexsort((codes[unique], -scores[unique]))][:k]
 
-    # Create and return the output dictionary
     return {
-        "distances": [list(sorted_distances)],
-        "documents": [list(sorted_documents)],
-        "metadatas": [list(sorted_metadatas)],
+        "distances": [scores[top].tolist()],
+        "documents": [[documents[idx] for idx in top]],
+        "metadatas": [[metadatas[idx] for idx in top]],
     }
 
 
@@ -272,22 +353,106 @@ def get_all_items_from_collections(collection_names: list[str]) -> dict:
     return merge_get_results(results)
 
 
+def process_query_collection(collection_name: str, query_embeddings, k: int):
+    # All query embeddings in one search, one result row per embedding
+    try:
+        if collection_name:
+            log.debug(f"process_query_collection:doc {collection_name}")
+            result = VECTOR_DB_CLIENT.search_vectors(
+                collection_name=collection_name,
+                vectors=query_embeddings,
+                limit=k,
+            )
+            if result is not None:
+                return result.model_dump(), None
+        return None, None
+    except Exception as e:
+        log.exception(f"Error when querying the collection: {e}")
+        return None, e
+
+
+def process_query_collections(collection_names: list[str], query_embeddings, k: int):
+    # All collections and query embeddings in a single vector DB round trip
+    try:
+        results = VECTOR_DB_CLIENT.search_collections(
+            collection_names=[name for name in collection_names if name],
+            vectors=query_embeddings,
+            limit=k,
+        )
+        return [
+            (result.model_dump(), None)
+            for result in results.values()
+            if result is not None
+        ]
+    except Exception as e:
+        log.exception(f"Error when querying the collections: {e}")
+        return [(None, e)]
+
+
+def collect_query_results(task_results: list[tuple]) -> tuple[list[dict], bool]:
+    results = []
+    error = False
+
+    for result, err in task_results:
+        if err is not None:
+            error = True
+        elif result is not None:
+            results.append(result)
+
+    return results, error
+
+
 def query_collection(
     collection_names: list[str],
     queries: list[str],
     embedding_function,
     k: int,
 ) -> dict:
-    results = []
-    error = False
+    # Generate all query embeddings (in one call)
+    query_embeddings = embedding_function(queries, prefix=RAG_EMBEDDING_QUERY_PREFIX)
+    log.debug(
+        f"query_collection: processing {len(queries)} queries across {len(collection_names)} collections"
+    )
 
-    def process_query_collection(collection_name, query_embedding):
+    if VECTOR_DB_CLIENT.supports_multi_collection_search:
+        task_results = process_query_collections(collection_names, query_embeddings, k)
+    else:
+        future_results = [
+            submit_to_vector_db_executor(
+                process_query_collection, collection_name, query_embeddings, k
+            )
+            for collection_name in collection_names
+        ]
+        task_results = [future.result() for future in future_results]
+
+    results, error = collect_query_results(task_results)
+    if error and not results:
+        log.warning("All collection queries failed. No results returned.")
+
+    return merge_and_sort_query_results(results, k=k)
+
+
+async def query_collection_async(
+    collection_names: list[str],
+    queries: list[str],
+    embedding_function,
+    k: int,
+) -> dict:
+    """query_collection for async callers; searches run concurrently."""
+    query_embeddings = await asyncio.to_thread(
+        embedding_function, queries, prefix=RAG_EMBEDDING_QUERY_PREFIX
+    )
+    log.debug(
+        f"query_collection_async: processing {len(queries)} queries across {len(collection_names)} collections"
+    )
+
+    async def process(collection_name):
         try:
             if collection_name:
-                result = query_doc(
+                result = await VECTOR_DB_CLIENT.search_vectors_async(
                     collection_name=collection_name,
-                    k=k,
-                    query_embedding=query_embedding,
+                    vectors=query_embeddings,
+                    limit=k,
                 )
                 if result is not None:
                     return result.model_dump(), None
@@ -296,47 +461,31 @@ def query_collection(
             log.exception(f"Error when querying the collection: {e}")
             return None, e
 
-    # Generate all query embeddings (in one call)
-    query_embeddings = embedding_function(queries, prefix=RAG_EMBEDDING_QUERY_PREFIX)
-    log.debug(
-        f"query_collection: processing {len(queries)} queries across {len(collection_names)} collections"
-    )
-
-    with ThreadPoolExecutor() as executor:
-        future_results = []
-        for query_embedding in query_embeddings:
-            for collection_name in collection_names:
-                result = executor.submit(
-                    process_query_collection, collection_name, query_embedding
-                )
-                future_results.append(result)
-        task_results = [future.result() for future in future_results]
-
-    for result, err in task_results:
-        if err is not None:
-            error = True
-        elif result is not None:
-            results.append(result)
+    if VECTOR_DB_CLIENT.supports_multi_collection_search:
+        loop = asyncio.get_running_loop()
+        task_results = await loop.run_in_executor(
+            VECTOR_DB_EXECUTOR,
+            process_query_collections,
+            collection_names,
+            query_embeddings,
+            k,
+        )
+    else:
+        task_results = await asyncio.gather(
+            *[process(collection_name) for collection_name in collection_names]
+        )
 
+    results, error = collect_query_results(task_results)
     if error and not results:
         log.warning("All collection queries failed. No results returned.")
 
     return merge_and_sort_query_results(results, k=k)
 
 
-def query_collection_with_hybrid_search(
-    collection_names: list[str],
-    queries: list[str],
-    embedding_function,
-    k: int,
-    reranking_function,
-    k_reranker: int,
-    r: float,
-    hybrid_bm25_weight: float,
+def get_hybrid_search_collection_results(
+    collection_names: list[str], hybrid_bm25_weight: float
 ) -> dict:
-    results = []
-    error = False
-    # Fetch collection data once per collection sequentially
+    # Fetch collection data once per collection
     # Avoid fetching the same data multiple times later
     collection_results = {}
     # Only retrieve entire collection if bm_25 calculation is required
@@ -344,9 +493,9 @@ def query_collection_with_hybrid_search(
         for collection_name in collection_names:
             try:
                 log.debug(
-                    f"query_collection_with_hybrid_search:VECTOR_DB_CLIENT.get:collection {collection_name}"
+                    f"query_collection_with_hybrid_search:get_bm25_collection_result:collection {collection_name}"
                 )
-                collection_results[collection_name] = VECTOR_DB_CLIENT.get(
+                collection_results[collection_name] = get_bm25_collection_result(
                     collection_name=collection_name
                 )
             except Exception as e:
@@ -355,47 +504,114 @@ def query_collection_with_hybrid_search(
     else:
         for collection_name in collection_names:
             collection_results[collection_name] = []
+    return collection_results
+
+
+def process_hybrid_search_query(collection_name: str, query: str, **kwargs):
+    try:
+        result = query_doc_with_hybrid_search(
+            collection_name=collection_name, query=query, **kwargs
+        )
+        return result, None
+    except Exception as e:
+        log.exception(f"Error when querying the collection with hybrid_search: {e}")
+        return None, e
+
+
+def query_collection_with_hybrid_search(
+    collection_names: list[str],
+    queries: list[str],
+    embedding_function,
+    k: int,
+    reranking_function,
+    k_reranker: int,
+    r: float,
+    hybrid_bm25_weight: float,
+) -> dict:
+    collection_results = get_hybrid_search_collection_results(
+        collection_names, hybrid_bm25_weight
+    )
     log.info(
         f"Starting hybrid search for {len(queries)} queries in {len(collection_names)} collections..."
     )
 
-    def process_query(collection_name, query):
-        try:
-            result = query_doc_with_hybrid_search(
-                collection_name=collection_name,
-                collection_result=collection_results[collection_name],
-                query=query,
-                embedding_function=embedding_function,
-                k=k,
-                reranking_function=reranking_function,
-                k_reranker=k_reranker,
-                r=r,
-                hybrid_bm25_weight=hybrid_bm25_weight,
-            )
-            return result, None
-        except Exception as e:
-            log.exception(f"Error when querying the collection with hybrid_search: {e}")
-            return None, e
-
     # Prepare tasks for all collections and queries
     # Avoid running any tasks for collections that failed to fetch data (have assigned None)
-    tasks = [
-        (cn, q)
+    future_results = [
+        submit_to_vector_db_executor(
+            process_hybrid_search_query,
+            collection_name=cn,
+            query=q,
+            collection_result=collection_results[cn],
+            embedding_function=embedding_function,
+            k=k,
+            reranking_function=reranking_function,
+            k_reranker=k_reranker,
+            r=r,
+            hybrid_bm25_weight=hybrid_bm25_weight,
+        )
         for cn in collection_names
         if collection_results[cn] is not None
         for q in queries
     ]
+    task_results = [future.result() for future in future_results]
 
-    with ThreadPoolExecutor() as executor:
-        future_results = [executor.submit(process_query, cn, q) for cn, q in tasks]
-        task_results = [future.result() for future in future_results]
+    results, error = collect_query_results(task_results)
+    if error and not results:
+        raise Exception(
+            "Hybrid search failed for all collections. Using Non-hybrid search as fallback."
+        )
+
+    return merge_and_sort_query_results(results, k=k)
 
-    for result, err in task_results:
-        if err is not None:
-            error = True
-        elif result is not None:
-            results.append(result)
 
+async def query_collection_with_hybrid_search_async(
+    collection_names: list[str],
+    queries: list[str],
+    embedding_function,
+    k: int,
+    reranking_function,
+    k_reranker: int,
+    r: float,
+    hybrid_bm25_weight: float,
+) -> dict:
+    """query_collection_with_hybrid_search for async callers."""
+    loop = asyncio.get_running_loop()
+
+    collection_results = await loop.run_in_executor(
+        VECTOR_DB_EXECUTOR,
+        get_hybrid_search_collection_results,
+        collection_names,
+        hybrid_bm25_weight,
+    )
+    log.info(
+        f"Starting hybrid search for {len(queries)} queries in {len(collection_names)} collections..."
+    )
+
+    task_results = await asyncio.gather(
+        *[
+            loop.run_in_executor(
+                VECTOR_DB_EXECUTOR,
+                functools.partial(
+                    process_hybrid_search_query,
+                    collection_name=cn,
+                    query=q,
+                    collection_result=collection_results[cn],
+                    embedding_function=embedding_function,
+                    k=k,
+                    reranking_function=reranking_function,
+                    k_reranker=k_reranker,
+                    r=r,
+                    hybrid_bm25_weight=hybrid_bm25_weight,
+                ),
+            )
+            for cn in collection_names
+            if collection_results[cn] is not None
+            for q in queries
+        ]
+    )
+
+    results, error = collect_query_results(task_results)
     if error and not results:
         raise Exception(
             "Hybrid search failed for all collections. Using Non-hybrid search as fallback."
@@ -404,6 +620,26 @@ def query_collection_with_hybrid_search(
     return merge_and_sort_query_results(results, k=k)
 
 
+def truncate_embeddings(embeddings, dimensions: int):
+    """
+    Keeps the first `dimensions` of every embedding and re-normalizes them,
+    which only preserves similarities for Matryoshka-trained models.
+    """
+    if not embeddings or dimensions <= 0:
+        return embeddings
+
+    single = not isinstance(embeddings[0], (list, tuple, np.ndarray))
+    vectors = np.asarray([embeddings] if single else embeddings, dtype=np.float32)
+    if vectors.shape[1] <= dimensions:
+        return embeddings
+
+    vectors = vectors[:, :dimensions]
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    vectors = (vectors / norms).tolist()
+    return vectors[0] if single else vectors
+
+
 def get_embedding_function(
     embedding_engine,
     embedding_model,
@@ -414,7 +650,7 @@ def get_embedding_function(
     azure_api_version=None,
 ):
     if embedding_engine == "":
-        return lambda query, prefix=None, user=None: embedding_function.encode(
+        embedding_fn = lambda query, prefix=None, user=None: embedding_function.encode(
             query, **({"prompt": prefix} if prefix else {})
         ).tolist()
     elif embedding_engine in ["ollama", "openai", "azure_openai"]:
@@ -444,12 +680,24 @@ def get_embedding_function(
             else:
                 return func(query, prefix, user)
 
-        return lambda query, prefix=None, user=None: generate_multiple(
+        embedding_fn = lambda query, prefix=None, user=None: generate_multiple(
             query, prefix, user, func
         )
     else:
         raise ValueError(f"Unknown embedding engine: {embedding_engine}")
 
+    if EMBEDDING_CACHE:
+        embedding_fn = EMBEDDING_CACHE.wrap(
+            embedding_fn, embedding_engine, embedding_model
+        )
+
+    if RAG_EMBEDDING_DIMENSIONS > 0:
+        # Truncated outside of the cache, which keeps the full embeddings
+        return lambda query, prefix=None, user=None: truncate_embeddings(
+            embedding_fn(query, prefix=prefix, user=user), RAG_EMBEDDING_DIMENSIONS
+        )
+    return embedding_fn
+
 
 def get_reranking_function(reranking_engine, reranking_model, reranking_function):
     if reranking_function is None:
@@ -0,0 +1,797 @@
+import hashlib
+import json
+import logging
+import math
+import os
+import re
+import shutil
+import threading
+import uuid
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows, a single process is supported there
+    fcntl = None
+
+import numpy as np
+
+from open_webui.retrieval.vector.main import (
+    VectorDBBase,
+    VectorItem,
+    SearchResult,
+    GetResult,
+)
+from open_webui.retrieval.vector.utils import stringify_metadata
+from open_webui.config import (
+    VECTOR_DB_QUANTIZATION,
+    VECTOR_DB_RESCORE_FACTOR,
+    LOCAL_VECTOR_DB_PATH,
+    LOCAL_VECTOR_DB_IVF_MIN_ROWS,
+    LOCAL_VECTOR_DB_IVF_PROBES,
+    LOCAL_VECTOR_DB_MAX_SEGMENTS,
+    LOCAL_VECTOR_DB_COMPACT_RATIO,
+)
+from open_webui.env import SRC_LOG_LEVELS
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["RAG"])
+
+
+MANIFEST = "manifest.json"
+COLLECTION_PREFIX = "collection-"
+# Lock files live outside of the collection directories, which get deleted
+LOCKS_DIR = ".locks"
+# Rows scored per matrix product when scanning or assigning a whole segment
+CHUNK_ROWS = 65536
+# Number of set bits of every byte value, for Hamming distances of sign bits
+POPCOUNT = np.array([bin(value).count("1") for value in range(256)], dtype=np.uint8)
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def load_array(path: str, mmap: bool = True) -> Optional[np.ndarray]:
+    if not os.path.exists(path):
+        return None
+    return np.load(path, mmap_mode="r" if mmap else None)
+
+
+@contextmanager
+def file_lock(path: str, exclusive: bool):
+    """Advisory lock shared by every process (uvicorn worker) on this host."""
+    if fcntl is None:
+        yield
+        return
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "a+b") as f:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def write_atomic(path: str, write):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        write(f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class Segment:
+    """
+    Immutable batch of rows: unit-length vectors in memory-mapped .npy files
+    and their ids, texts and metadata in a JSON lines file. Deleted rows are
+    only masked out of `live`.
+
+    Quantized segments hold int8 codes with a float32 scale per row, or the
+    sign bits of every dimension, which are scanned instead of the float32
+    vectors; those are only kept (see VECTOR_DB_RESCORE_FACTOR) to re-score
+    the best candidates.
+    """
+
+    def __init__(self, path: str, name: str, dim: int):
+        self.name = name
+        self.dim = dim
+
+        self.vectors = load_array(os.path.join(path, f"{name}.npy"))
+        self.codes = load_array(os.path.join(path, f"{name}.codes.npy"))
+        self.scales = load_array(os.path.join(path, f"{name}.scale.npy"), mmap=False)
+
+        with open(os.path.join(path, f"{name}.jsonl"), "r", encoding="utf-8") as f:
+            self.records = [json.loads(line) for line in f if line.strip()]
+
+        self.live = np.ones(len(self.records), dtype=bool)
+        # IVF list of every row, set while the collection has an IVF index
+        self.lists: Optional[np.ndarray] = None
+
+    @property
+    def binary(self) -> bool:
+        return self.codes is not None and self.scales is None
+
+    @staticmethod
+    def write(
+        path: str,
+        name: str,
+        vectors: np.ndarray,
+        records: List[dict],
+        quantization: str,
+        keep_vectors: bool = True,
+    ):
+        if quantization == "int8":
+            scales = np.abs(vectors).max(axis=1) / 127.0
+            scales[scales == 0] = 1.0
+            codes = np.round(vectors / scales[:, None]).astype(np.int8)
+            write_atomic(
+                os.path.join(path, f"{name}.scale.npy"),
+                lambda f: np.save(f, scales.astype(np.float32)),
+            )
+            write_atomic(
+                os.path.join(path, f"{name}.codes.npy"), lambda f: np.save(f, codes)
+            )
+        elif quantization == "binary":
+            codes = np.packbits(vectors > 0, axis=1)
+            write_atomic(
+                os.path.join(path, f"{name}.codes.npy"), lambda f: np.save(f, codes)
+            )
+
+        if quantization == "none" or keep_vectors:
+            write_atomic(
+                os.path.join(path, f"{name}.npy"),
+                lambda f: np.save(f, vectors.astype(np.float32)),
+            )
+
+        write_atomic(
+            os.path.join(path, f"{name}.jsonl"),
+            lambda f: f.writelines(
+                (json.dumps(record, default=str) + "\n").encode("utf-8")
+                for record in records
+            ),
+        )
+
+    def remove(self, path: str):
+        for suffix in [".npy", ".codes.npy", ".scale.npy", ".jsonl"]:
+            try:
+                os.remove(os.path.join(path, f"{self.name}{suffix}"))
+            except FileNotFoundError:
+                pass
+
+    def get_vectors(self, rows=None) -> np.ndarray:
+        """Full precision vectors, or the best approximation the segment holds."""
+        if self.vectors is not None:
+            vectors = self.vectors if rows is None else self.vectors[rows]
+            return np.asarray(vectors, dtype=np.float32)
+
+        codes = self.codes if rows is None else self.codes[rows]
+        if self.binary:
+            signs = np.unpackbits(codes, axis=1, count=self.dim).astype(np.float32)
+            return (signs * 2.0 - 1.0) / math.sqrt(self.dim)
+
+        scales = self.scales if rows is None else self.scales[rows]
+        return codes.astype(np.float32) * scales[:, None]
+
+    def get_scores(self, queries: np.ndarray, rows=None) -> np.ndarray:
+        """
+        (rows, queries) cosine similarities of unit-length queries, estimated
+        from the codes of quantized segments.
+        """
+        if self.codes is None:
+            vectors = self.vectors if rows is None else self.vectors[rows]
+            return np.asarray(vectors, dtype=np.float32) @ queries.T
+
+        codes = self.codes if rows is None else self.codes[rows]
+        if self.binary:
+            # The share of differing signs estimates the angle between vectors
+            query_codes = np.packbits(queries > 0, axis=1)
+            distances = POPCOUNT[
+                np.bitwise_xor(np.asarray(codes)[:, None, :], query_codes[None, :, :])
+            ].sum(axis=2, dtype=np.float32)
+            return np.cos(np.pi * distances / self.dim)
+
+        scales = self.scales if rows is None else self.scales[rows]
+        return (codes.astype(np.float32) @ queries.T) * scales[:, None]
+
+
+class Collection:
+    """
+    Append-only collection: every write adds a segment and records deletions
+    in the manifest, which is replaced atomically and is the only source of
+    truth, so a crash never leaves a half-written collection behind. Segments
+    are merged (and deleted rows dropped) by compaction.
+
+    Several processes may open the same collection: writes hold an exclusive
+    file lock and start from the latest manifest, reads hold a shared one and
+    reload the manifest whenever another process has replaced it.
+    """
+
+    def __init__(
+        self, path: str, name: str, lock_path: str, quantization: str = "none"
+    ):
+        self.path = path
+        self.name = name
+        self.lock_path = lock_path
+        self.default_quantization = quantization
+        self.lock = threading.RLock()
+
+        self.manifest = self.get_empty_manifest()
+        # (inode, mtime, size) of the loaded manifest file, None if missing
+        self.manifest_stat = None
+        self.segments: Dict[str, Segment] = {}
+        # id -> (segment name, row) of the live row of every id
+        self.locations: Dict[str, Tuple[str, int]] = {}
+
+        self.centroids: Optional[np.ndarray] = None
+        self.indexed_rows = 0
+
+    def get_empty_manifest(self) -> dict:
+        return {
+            "id": uuid.uuid4().hex,
+            "version": 0,
+            "name": self.name,
+            "dim": None,
+            "quantization": self.default_quantization,
+            "next_segment": 0,
+            "segments": [],
+            "deleted": {},
+        }
+
+    @contextmanager
+    def reading(self):
+        with self.lock, file_lock(self.lock_path, exclusive=False):
+            if self.get_manifest_stat() != self.manifest_stat:
+                self.load()
+            yield
+
+    @contextmanager
+    def writing(self):
+        with self.lock, file_lock(self.lock_path, exclusive=True):
+            # The manifest stat could be reused by a later file, its content not
+            self.load()
+            yield
+
+    def get_manifest_stat(self):
+        try:
+            stat = os.stat(os.path.join(self.path, MANIFEST))
+        except FileNotFoundError:
+            return None
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    def load(self):
+        """Loads the manifest, reusing the segments that are already open."""
+        manifest_stat = self.get_manifest_stat()
+        try:
+            with open(os.path.join(self.path, MANIFEST), "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            manifest = None
+
+        if manifest is None:
+            if self.manifest_stat is None:
+                return
+            # Deleted by another process
+            manifest = self.get_empty_manifest()
+        elif (manifest["id"], manifest["version"]) == (
+            self.manifest["id"],
+            self.manifest["version"],
+        ):
+            self.manifest_stat = manifest_stat
+            return
+
+        segments = {}
+        for name in manifest["segments"]:
+            segment = self.segments.get(name)
+            if segment is None:
+                segment = Segment(self.path, name, manifest["dim"])
+            segment.live[:] = True
+            segment.live[manifest["deleted"].get(name, [])] = False
+            segments[name] = segment
+
+        self.locations = {}
+        for name, segment in segments.items():
+            for row in np.flatnonzero(segment.live):
+                self.locations[segment.records[row]["id"]] = (name, int(row))
+
+        self.manifest = manifest
+        self.manifest_stat = manifest_stat
+        removed = any(name not in segments for name in self.segments)
+        self.segments = segments
+
+        if self.centroids is not None:
+            if removed:
+                # Compacted by another process, the lists are rebuilt lazily
+                self.centroids = None
+                self.indexed_rows = 0
+            else:
+                for segment in segments.values():
+                    if segment.lists is None:
+                        self.assign_lists(segment)
+
+    def clear(self):
+        shutil.rmtree(self.path, ignore_errors=True)
+        self.manifest = self.get_empty_manifest()
+        self.manifest_stat = None
+        self.segments = {}
+        self.locations = {}
+        self.centroids = None
+        self.indexed_rows = 0
+
+    @property
+    def exists(self) -> bool:
+        return bool(self.manifest["segments"])
+
+    @property
+    def quantization(self) -> str:
+        return self.manifest["quantization"]
+
+    def save_manifest(self):
+        self.manifest["version"] += 1
+        os.makedirs(self.path, exist_ok=True)
+        write_atomic(
+            os.path.join(self.path, MANIFEST),
+            lambda f: f.write(json.dumps(self.manifest).encode("utf-8")),
+        )
+        self.manifest_stat = self.get_manifest_stat()
+
+    def count(self) -> int:
+        return len(self.locations)
+
+    def mark_deleted(self, locations: List[Tuple[str, int]]):
+        for name, row in locations:
+            self.segments[name].live[row] = False
+            self.manifest["deleted"].setdefault(name, []).append(row)
+
+    def add(self, items: List[VectorItem], overwrite: bool):
+        if not items:
+            return
+
+        # Last item of an id wins, existing ids are kept unless overwritten
+        items = list({item["id"]: item for item in items}.values())
+        if not overwrite:
+            items = [item for item in items if item["id"] not in self.locations]
+            if not items:
+                return
+
+        vectors = normalize(
+            np.asarray([item["vector"] for item in items], dtype=np.float32)
+        )
+        if self.manifest["dim"] is None:
+            self.manifest["dim"] = int(vectors.shape[1])
+        elif vectors.shape[1] != self.manifest["dim"]:
+            raise ValueError(
+                f"Vector dimension {vectors.shape[1]} does not match the "
+                f"collection dimension {self.manifest['dim']}"
+            )
+
+        name = f"segment-{self.manifest['next_segment']:06d}"
+        os.makedirs(self.path, exist_ok=True)
+        Segment.write(
+            self.path,
+            name,
+            vectors,
+            [
+                {
+                    "id": item["id"],
+                    "text": item["text"],
+                    "metadata": stringify_metadata(item["metadata"] or {}),
+                }
+                for item in items
+            ],
+            self.quantization,
+            keep_vectors=VECTOR_DB_RESCORE_FACTOR > 0,
+        )
+
+        self.mark_deleted(
+            [
+                self.locations[item["id"]]
+                for item in items
+                if item["id"] in self.locations
+            ]
+        )
+        self.manifest["next_segment"] += 1
+        self.manifest["segments"].append(name)
+        self.save_manifest()
+
+        segment = Segment(self.path, name, self.manifest["dim"])
+        self.segments[name] = segment
+        for row, item in enumerate(items):
+            self.locations[item["id"]] = (name, row)
+        if self.centroids is not None:
+            self.assign_lists(segment)
+
+        self.maybe_compact()
+
+    def delete(self, ids: Optional[List[str]] = None, filter: Optional[dict] = None):
+        if ids is not None:
+            ids = [id for id in ids if id in self.locations]
+        elif filter:
+            ids = [record["id"] for record in self.iter_records(filter)]
+        else:
+            ids = list(self.locations.keys())
+
+        if not ids:
+            return
+
+        self.mark_deleted([self.locations.pop(id) for id in ids])
+        self.save_manifest()
+        self.maybe_compact()
+
+    def maybe_compact(self):
+        total = sum(len(segment.records) for segment in self.segments.values())
+        deleted = total - self.count()
+        if len(self.segments) > max(LOCAL_VECTOR_DB_MAX_SEGMENTS, 1) or (
+            total and deleted / total > LOCAL_VECTOR_DB_COMPACT_RATIO
+        ):
+            self.compact()
+
+    def compact(self):
+        """Merges all live rows into a single segment."""
+        old_segments = list(self.segments.values())
+
+        vectors = []
+        records = []
+        for segment in old_segments:
+            rows = np.flatnonzero(segment.live)
+            if len(rows):
+                vectors.append(segment.get_vectors(rows))
+                records.extend(segment.records[row] for row in rows)
+
+        self.segments = {}
+        self.locations = {}
+        self.manifest["segments"] = []
+        self.manifest["deleted"] = {}
+
+        if records:
+            name = f"segment-{self.manifest['next_segment']:06d}"
+            # Rows without a float copy are re-quantized from their approximation,
+            # which keeps their codes up to rounding
+            Segment.write(
+                self.path,
+                name,
+                normalize(np.concatenate(vectors)),
+                records,
+                self.quantization,
+                keep_vectors=VECTOR_DB_RESCORE_FACTOR > 0,
+            )
+            self.manifest["next_segment"] += 1
+            self.manifest["segments"].append(name)
+
+        self.save_manifest()
+
+        for segment in old_segments:
+            try:
+                segment.remove(self.path)
+            except Exception as e:
+                log.warning(f"Unable to remove segment {segment.name}: {e}")
+
+        for name in self.manifest["segments"]:
+            segment = Segment(self.path, name, self.manifest["dim"])
+            self.segments[name] = segment
+            for row, record in enumerate(segment.records):
+                self.locations[record["id"]] = (name, row)
+
+        self.centroids = None
+        self.indexed_rows = 0
+        log.debug(f"Compacted {self.path} into {len(records)} rows")
+
+    def iter_records(self, filter: Optional[dict] = None):
+        for segment in self.segments.values():
+            for row in np.flatnonzero(segment.live):
+                record = segment.records[row]
+                metadata = record["metadata"] or {}
+                if not filter or all(
+                    key in metadata and str(metadata[key]) == str(value)
+                    for key, value in filter.items()
+                ):
+                    yield record
+
+    ####################
+    # IVF index
+    ####################
+
+    def assign_lists(self, segment: Segment):
+        lists = np.empty(len(segment.records), dtype=np.int32)
+        for start in range(0, len(lists), CHUNK_ROWS):
+            rows = slice(start, start + CHUNK_ROWS)
+            scores = segment.get_vectors(np.arange(len(lists))[rows]) @ self.centroids.T
+            lists[rows] = np.argmax(scores, axis=1)
+        segment.lists = lists
+
+    def build_index(self):
+        """Spherical k-means over a sample of the live rows, sqrt(n) lists."""
+        count = self.count()
+        nlist = max(1, min(int(math.sqrt(count)), 4096))
+
+        rng = np.random.default_rng(0)
+        sample_size = min(count, nlist * 64)
+        locations = list(self.locations.values())
+        picks = rng.choice(len(locations), size=sample_size, replace=False)
+
+        by_segment: Dict[str, List[int]] = {}
+        for pick in picks:
+            name, row = locations[pick]
+            by_segment.setdefault(name, []).append(row)
+        sample = np.concatenate(
+            [
+                self.segments[name].get_vectors(np.sort(rows))
+                for name, rows in by_segment.items()
+            ]
+        )
+
+        centroids = sample[rng.choice(len(sample), size=nlist, replace=False)]
+        for _ in range(10):
+            assignments = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignments, sample)
+            empty = np.bincount(assignments, minlength=nlist) == 0
+            sums[empty] = centroids[empty]
+            centroids = normalize(sums)
+
+        self.centroids = centroids.astype(np.float32)
+        for segment in self.segments.values():
+            self.assign_lists(segment)
+        self.indexed_rows = count
+        log.debug(f"Built IVF index of {self.path} with {nlist} lists")
+
+    def use_index(self) -> bool:
+        if LOCAL_VECTOR_DB_IVF_MIN_ROWS <= 0:
+            return False
+
+        count = self.count()
+        if count < LOCAL_VECTOR_DB_IVF_MIN_ROWS:
+            return False
+        # Rebuilt once the collection has doubled, the lists stay balanced
+        if self.centroids is None or count > 2 * self.indexed_rows:
+            self.build_index()
+        return True
+
+    ####################
+    # Search
+    ####################
+
+    def search_candidates(
+        self, query: np.ndarray, limit: int, lists: Optional[np.ndarray] = None
+    ) -> List[Tuple[float, str, int]]:
+        candidates = []
+        for segment in self.segments.values():
+            mask = segment.live
+            if lists is not None:
+                mask = mask & np.isin(segment.lists, lists)
+            rows = np.flatnonzero(mask)
+            if not len(rows):
+                continue
+
+            # Scored in chunks so a large segment is never fully paged in at once
+            for start in range(0, len(rows), CHUNK_ROWS):
+                chunk = rows[start : start + CHUNK_ROWS]
+                scores = segment.get_scores(query[None, :], chunk)[:, 0]
+                if len(scores) > limit:
+                    top = np.argpartition(-scores, limit - 1)[:limit]
+                else:
+                    top = np.arange(len(scores))
+                candidates.extend(
+                    (float(scores[idx]), segment.name, int(chunk[idx])) for idx in top
+                )
+
+        candidates.sort(key=lambda candidate: -candidate[0])
+        return candidates[:limit]
+
+    def rescore(
+        self, query: np.ndarray, candidates: List[Tuple[float, str, int]]
+    ) -> List[Tuple[float, str, int]]:
+        """Replaces the estimated scores of candidates with full precision ones."""
+        rescored = []
+        by_segment: Dict[str, List[Tuple[float, str, int]]] = {}
+        for candidate in candidates:
+            by_segment.setdefault(candidate[1], []).append(candidate)
+
+        for name, segment_candidates in by_segment.items():
+            segment = self.segments[name]
+            if segment.vectors is None:
+                rescored.extend(segment_candidates)
+                continue
+
+            rows = [row for _, _, row in segment_candidates]
+            scores = np.asarray(segment.vectors[rows], dtype=np.float32) @ query
+            rescored.extend(
+                (float(score), name, row) for score, row in zip(scores, rows)
+            )
+
+        rescored.sort(key=lambda candidate: -candidate[0])
+        return rescored
+
+    def search(self, vectors: List[List[float]], limit: int) -> SearchResult:
+        queries = normalize(np.asarray(vectors, dtype=np.float32))
+        if queries.shape[1] != self.manifest["dim"]:
+            raise ValueError(
+                f"Query dimension {queries.shape[1]} does not match the "
+                f"collection dimension {self.manifest['dim']}"
+            )
+
+        use_index = self.use_index()
+        # Quantized scores only pick the candidates, ranked at full precision
+        rescore = self.quantization != "none" and VECTOR_DB_RESCORE_FACTOR > 0
+        num_candidates = limit * VECTOR_DB_RESCORE_FACTOR if rescore else limit
+
+        ids, distances, documents, metadatas = [], [], [], []
+        for query in queries:
+            candidates = None
+            if use_index:
+                probes = min(max(LOCAL_VECTOR_DB_IVF_PROBES, 1), len(self.centroids))
+                lists = np.argpartition(-(self.centroids @ query), probes - 1)[:probes]
+                candidates = self.search_candidates(query, num_candidates, lists)
+            # Fall back to a full scan when the probed lists hold too few rows
+            if candidates is None or len(candidates) < min(limit, self.count()):
+                candidates = self.search_candidates(query, num_candidates)
+            if rescore:
+                candidates = self.rescore(query, candidates)[:limit]
+
+            records = [self.segments[name].records[row] for _, name, row in candidates]
+            ids.append([record["id"] for record in records])
+            # cosine similarity [-1, 1] to a [0, 1] score, as the other backends
+            distances.append([(score + 1.0) / 2.0 for score, _, _ in candidates])
+            documents.append([record["text"] for record in records])
+            metadatas.append([record["metadata"] for record in records])
+
+        return SearchResult(
+            ids=ids, distances=distances, documents=documents, metadatas=metadatas
+        )
+
+
+class LocalVectorClient(VectorDBBase):
+    """
+    Embedded vector store for single-node deployments, without any external
+    service or native dependency beyond NumPy.
+
+    Every collection is a directory of append-only segments of memory-mapped
+    NumPy matrices (quantized according to VECTOR_DB_QUANTIZATION when it is
+    created) under LOCAL_VECTOR_DB_PATH, so opening a collection only reads
+    its ids and texts. Small collections are searched exactly; larger ones
+    through an in-memory IVF index built on first search.
+    """
+
+    supports_multi_vector_search = True
+    supports_quantization = True
+
+    def __init__(self):
+        self.path = LOCAL_VECTOR_DB_PATH
+        self.collections: Dict[str, Collection] = {}
+        self.lock = threading.Lock()
+        os.makedirs(self.path, exist_ok=True)
+
+    def get_collection_path(self, collection_name: str) -> str:
+        # Collection names come from users: the readable part is only a hint,
+        # the fixed prefix and the name hash keep every collection in its own
+        # directory right under LOCAL_VECTOR_DB_PATH
+        slug = re.sub(r"[^A-Za-z0-9_-]", "_", collection_name)[:64]
+        digest = hashlib.sha256(collection_name.encode()).hexdigest()[:16]
+        path = os.path.join(self.path, f"{COLLECTION_PREFIX}{slug}-{digest}")
+
+        if os.path.dirname(os.path.realpath(path)) != os.path.realpath(self.path):
+            raise ValueError(f"Invalid collection name: {collection_name!r}")
+        return path
+
+    def get_collection(self, collection_name: str) -> Collection:
+        with self.lock:
+            collection = self.collections.get(collection_name)
+            if collection is None:
+                path = self.get_collection_path(collection_name)
+                collection = Collection(
+                    path,
+                    collection_name,
+                    os.path.join(
+                        self.path, LOCKS_DIR, f"{os.path.basename(path)}.lock"
+                    ),
+                    VECTOR_DB_QUANTIZATION,
+                )
+                self.collections[collection_name] = collection
+            return collection
+
+    def has_collection(self, collection_name: str) -> bool:
+        return os.path.exists(
+            os.path.join(self.get_collection_path(collection_name), MANIFEST)
+        )
+
+    def delete_collection(self, collection_name: str) -> None:
+        collection = self.get_collection(collection_name)
+        with collection.writing():
+            collection.clear()
+
+    def insert(self, collection_name: str, items: List[VectorItem]) -> None:
+        collection = self.get_collection(collection_name)
+        with collection.writing():
+            collection.add(items, overwrite=False)
+
+    def upsert(self, collection_name: str, items: List[VectorItem]) -> None:
+        collection = self.get_collection(collection_name)
+        with collection.writing():
+            collection.add(items, overwrite=True)
+
+    def search(
+        self, collection_name: str, vectors: List[List[float | int]], limit: int
+    ) -> Optional[SearchResult]:
+        try:
+            if not vectors or not self.has_collection(collection_name):
+                return None
+
+            collection = self.get_collection(collection_name)
+            with collection.reading():
+                if not collection.exists:
+                    return None
+                return collection.search(vectors, limit)
+        except Exception as e:
+            log.exception(f"Error during search: {e}")
+            return None
+
+    def query(
+        self, collection_name: str, filter: Dict, limit: Optional[int] = None
+    ) -> Optional[GetResult]:
+        if not self.has_collection(collection_name):
+            return None
+
+        collection = self.get_collection(collection_name)
+        with collection.reading():
+            records = []
+            for record in collection.iter_records(filter):
+                if limit is not None and len(records) >= limit:
+                    break
+                records.append(record)
+
+        return GetResult(
+            ids=[[record["id"] for record in records]],
+            documents=[[record["text"] for record in records]],
+            metadatas=[[record["metadata"] for record in records]],
+        )
+
+    def get(self, collection_name: str) -> Optional[GetResult]:
+        return self.query(collection_name, filter={})
+
+    def delete(
+        self,
+        collection_name: str,
+        ids: Optional[List[str]] = None,
+        filter: Optional[Dict] = None,
+    ) -> None:
+        if not self.has_collection(collection_name):
+            return
+
+        collection = self.get_collection(collection_name)
+        with collection.writing():
+            collection.delete(ids=ids, filter=filter)
+
+    def reset(self) -> None:
+        with self.lock:
+            self.collections = {}
+            # The lock files are kept, other processes may be waiting on them
+            for directory in os.listdir(self.path):
+                if directory != LOCKS_DIR:
+                    shutil.rmtree(
+                        os.path.join(self.path, directory), ignore_errors=True
+                    )
+
+    def rebuild_index(self, collection_name: Optional[str] = None) -> None:
+        """Compacts the collections and drops their IVF index, rebuilt on next search."""
+        if collection_name is not None:
+            collection_names = [collection_name]
+        else:
+            collection_names = []
+            for directory in os.listdir(self.path):
+                manifest_path = os.path.join(self.path, directory, MANIFEST)
+                if directory.startswith(COLLECTION_PREFIX) and os.path.exists(
+                    manifest_path
+                ):
+                    with open(manifest_path, "r", encoding="utf-8") as f:
+                        collection_names.append(json.load(f)["name"])
+
+        for name in collection_names:
+            collection = self.get_collection(name)
+            with collection.writing():
+                if collection.exists:
+                    collection.compact()
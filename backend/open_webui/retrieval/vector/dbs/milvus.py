@@ -30,6 +30,8 @@ log.setLevel(SRC_LOG_LEVELS["RAG"])
 
 
 class MilvusClient(VectorDBBase):
+    supports_multi_vector_search = True
+
     def __init__(self):
         self.collection_prefix = "open_webui"
         if MILVUS_TOKEN is None:
@@ -1,4 +1,5 @@
 from typing import Optional, List, Dict, Any
+import hashlib
 import logging
 import json
 from sqlalchemy import (
@@ -15,6 +16,7 @@ from sqlalchemy import (
     text,
     Text,
     Table,
+    union_all,
     values,
 )
 from sqlalchemy.sql import true
@@ -22,7 +24,8 @@ from sqlalchemy.pool import NullPool, QueuePool
 
 from sqlalchemy.orm import declarative_base, scoped_session, sessionmaker
 from sqlalchemy.dialects.postgresql import JSONB, array
-from pgvector.sqlalchemy import Vector
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from pgvector.sqlalchemy import Vector, HALFVEC, BIT
 from sqlalchemy.ext.mutable import MutableDict
 from sqlalchemy.exc import NoSuchTableError
 
@@ -33,8 +36,11 @@ from open_webui.retrieval.vector.main import (
     VectorItem,
     SearchResult,
     GetResult,
+    VECTOR_DB_EXECUTOR,
 )
 from open_webui.config import (
+    VECTOR_DB_QUANTIZATION,
+    VECTOR_DB_RESCORE_FACTOR,
     PGVECTOR_DB_URL,
     PGVECTOR_INITIALIZE_MAX_VECTOR_LENGTH,
     PGVECTOR_PGCRYPTO,
@@ -43,11 +49,25 @@ from open_webui.config import (
     PGVECTOR_POOL_MAX_OVERFLOW,
     PGVECTOR_POOL_TIMEOUT,
     PGVECTOR_POOL_RECYCLE,
+    PGVECTOR_INSERT_BATCH_SIZE,
+    PGVECTOR_INDEX_METHOD,
+    PGVECTOR_INDEX_SCOPE,
+    PGVECTOR_INDEX_MIN_ROWS,
+    PGVECTOR_HNSW_M,
+    PGVECTOR_HNSW_EF_CONSTRUCTION,
+    PGVECTOR_HNSW_EF_SEARCH,
+    PGVECTOR_HNSW_ITERATIVE_SCAN,
+    PGVECTOR_IVFFLAT_LISTS,
+    PGVECTOR_IVFFLAT_PROBES,
 )
 
 from open_webui.env import SRC_LOG_LEVELS
 
 VECTOR_LENGTH = PGVECTOR_INITIALIZE_MAX_VECTOR_LENGTH
+# Name of the global ANN index, per-collection indexes append a name hash
+INDEX_NAME = "idx_document_chunk_vector"
+# The ANN indexes hold quantized vectors, the table keeps them at full precision
+QUANTIZED_INDEX = VECTOR_DB_QUANTIZATION != "none" and PGVECTOR_INDEX_METHOD != "none"
 Base = declarative_base()
 
 log = logging.getLogger(__name__)
@@ -58,6 +78,20 @@ def pgcrypto_encrypt(val, key):
     return func.pgp_sym_encrypt(val, literal(key))
 
 
+def quantize(vector):
+    # Must stay in sync with the indexed expression of get_index_sql. pgvector
+    # has no int8 type, int8 quantization is stored as half precision.
+    if VECTOR_DB_QUANTIZATION == "binary":
+        return cast(func.binary_quantize(vector), BIT(VECTOR_LENGTH))
+    return cast(vector, HALFVEC(VECTOR_LENGTH))
+
+
+def quantized_distance(vector, query_vector):
+    if VECTOR_DB_QUANTIZATION == "binary":
+        return quantize(vector).hamming_distance(quantize(query_vector))
+    return quantize(vector).cosine_distance(quantize(query_vector))
+
+
 def pgcrypto_decrypt(col, key, outtype="text"):
     return func.cast(func.pgp_sym_decrypt(col, literal(key)), outtype)
 
@@ -78,7 +112,16 @@ class DocumentChunk(Base):
 
 
 class PgvectorClient(VectorDBBase):
+    supports_multi_vector_search = True
+    supports_multi_collection_search = True
+    supports_quantization = True
+
     def __init__(self) -> None:
+        # Collections known to have their partial ANN index
+        self._indexed_collections = set()
+        # collection -> (rows at the last count, rows written since), so the
+        # collection is only counted again once the index might be due
+        self._collection_rows: dict[str, tuple[int, int]] = {}
 
         # if no pgvector uri, use the existing database connection
         if not PGVECTOR_DB_URL:
@@ -155,13 +198,19 @@ class PgvectorClient(VectorDBBase):
             connection = self.session.connection()
             Base.metadata.create_all(bind=connection)
 
-            # Create an index on the vector column if it doesn't exist
-            self.session.execute(
-                text(
-                    "CREATE INDEX IF NOT EXISTS idx_document_chunk_vector "
-                    "ON document_chunk USING ivfflat (vector vector_cosine_ops) WITH (lists = 100);"
+            # Create the global ANN index on the vector column if it doesn't exist
+            if PGVECTOR_INDEX_METHOD != "none" and PGVECTOR_INDEX_SCOPE == "global":
+                self.session.execute(
+                    text(
+                        self.get_index_sql(
+                            INDEX_NAME,
+                            # Only auto-sized IVFFlat lists need the row count
+                            rows=(
+                                self.count_rows() if PGVECTOR_IVFFLAT_LISTS <= 0 else 0
+                            ),
+                        )
+                    )
                 )
-            )
             self.session.execute(
                 text(
                     "CREATE INDEX IF NOT EXISTS idx_document_chunk_collection_name "
@@ -169,6 +218,7 @@ class PgvectorClient(VectorDBBase):
                 )
             )
             self.session.commit()
+            self.check_vector_index()
             log.info("Initialization complete.")
         except Exception as e:
             self.session.rollback()
@@ -210,6 +260,262 @@ class PgvectorClient(VectorDBBase):
                 "The 'vector' column does not exist in the 'document_chunk' table."
             )
 
+    def check_vector_index(self) -> None:
+        """
+        Warn about an existing global index that does not match the configured
+        index method or scope; it is only replaced by an explicit rebuild.
+        """
+        try:
+            indexdef = self.session.execute(
+                text(
+                    "SELECT indexdef FROM pg_indexes "
+                    "WHERE tablename = 'document_chunk' AND indexname = :name"
+                ),
+                {"name": INDEX_NAME},
+            ).scalar()
+            self.session.rollback()
+        except Exception as e:
+            self.session.rollback()
+            log.warning(f"Unable to check the vector index: {e}")
+            return
+
+        if indexdef is None:
+            return
+        if PGVECTOR_INDEX_SCOPE != "global" or PGVECTOR_INDEX_METHOD == "none":
+            log.warning(
+                f"Global vector index '{INDEX_NAME}' exists but PGVECTOR_INDEX_SCOPE is "
+                f"'{PGVECTOR_INDEX_SCOPE}' and PGVECTOR_INDEX_METHOD is "
+                f"'{PGVECTOR_INDEX_METHOD}', rebuild the vector indexes to apply them."
+            )
+        elif f"USING {PGVECTOR_INDEX_METHOD} " not in indexdef:
+            log.warning(
+                f"Vector index '{INDEX_NAME}' does not use {PGVECTOR_INDEX_METHOD}, "
+                "rebuild the vector indexes to apply PGVECTOR_INDEX_METHOD."
+            )
+        elif ("binary_quantize" in indexdef, "halfvec" in indexdef) != (
+            VECTOR_DB_QUANTIZATION == "binary",
+            VECTOR_DB_QUANTIZATION == "int8",
+        ):
+            log.warning(
+                f"Vector index '{INDEX_NAME}' does not match VECTOR_DB_QUANTIZATION "
+                f"'{VECTOR_DB_QUANTIZATION}', rebuild the vector indexes to apply it."
+            )
+
+    def count_rows(self, collection_name: Optional[str] = None) -> int:
+        query = self.session.query(func.count(DocumentChunk.id))
+        if collection_name is not None:
+            query = query.filter(DocumentChunk.collection_name == collection_name)
+        return query.scalar() or 0
+
+    @staticmethod
+    def get_collection_index_name(collection_name: str) -> str:
+        # Index names are limited to 63 bytes, collection names are not
+        return (
+            f"{INDEX_NAME}_{hashlib.sha256(collection_name.encode()).hexdigest()[:16]}"
+        )
+
+    def get_index_sql(
+        self,
+        name: str,
+        collection_name: Optional[str] = None,
+        rows: int = 0,
+        concurrently: bool = False,
+    ) -> str:
+        if VECTOR_DB_QUANTIZATION == "binary":
+            column = f"(binary_quantize(vector)::bit({VECTOR_LENGTH})) bit_hamming_ops"
+        elif VECTOR_DB_QUANTIZATION == "int8":
+            column = f"(vector::halfvec({VECTOR_LENGTH})) halfvec_cosine_ops"
+        else:
+            column = "vector vector_cosine_ops"
+
+        if PGVECTOR_INDEX_METHOD == "hnsw":
+            using = (
+                f"hnsw ({column}) WITH "
+                f"(m = {PGVECTOR_HNSW_M}, ef_construction = {PGVECTOR_HNSW_EF_CONSTRUCTION})"
+            )
+        else:
+            lists = PGVECTOR_IVFFLAT_LISTS
+            if lists <= 0:
+                lists = max(rows // 1000, 1)
+            using = f"ivfflat ({column}) WITH (lists = {lists})"
+
+        sql = (
+            f"CREATE INDEX {'CONCURRENTLY ' if concurrently else ''}IF NOT EXISTS "
+            f"{name} ON document_chunk USING {using}"
+        )
+        if collection_name is not None:
+            # DDL takes no bind parameters
+            escaped_collection_name = collection_name.replace("'", "''")
+            sql += f" WHERE collection_name = '{escaped_collection_name}'"
+        return sql
+
+    def execute_autocommit(self, *statements: str) -> None:
+        # (CREATE|DROP) INDEX CONCURRENTLY cannot run inside a transaction
+        with self.session.get_bind().connect() as connection:
+            connection = connection.execution_options(isolation_level="AUTOCOMMIT")
+            for statement in statements:
+                connection.execute(text(statement))
+
+    def swap_index(
+        self, name: str, collection_name: Optional[str] = None, rows: int = 0
+    ) -> None:
+        # Build the new index next to the old one, so searches and writes
+        # never wait for the rebuild
+        new_name, old_name = f"{name}_new", f"{name}_old"
+        self.execute_autocommit(
+            f"DROP INDEX CONCURRENTLY IF EXISTS {new_name}",
+            f"DROP INDEX CONCURRENTLY IF EXISTS {old_name}",
+            self.get_index_sql(new_name, collection_name, rows, concurrently=True),
+        )
+
+        # Both renames commit together, so the old index stays in place until
+        # the new one has taken its name
+        with self.session.get_bind().begin() as connection:
+            connection.execute(
+                text(f"ALTER INDEX IF EXISTS {name} RENAME TO {old_name}")
+            )
+            connection.execute(text(f"ALTER INDEX {new_name} RENAME TO {name}"))
+
+        self.execute_autocommit(f"DROP INDEX CONCURRENTLY IF EXISTS {old_name}")
+
+    def get_collection_index_names(self) -> List[str]:
+        names = self.session.execute(
+            text("SELECT indexname FROM pg_indexes WHERE tablename = 'document_chunk'")
+        ).scalars()
+        self.session.rollback()
+        return [name for name in names if name.startswith(f"{INDEX_NAME}_")]
+
+    def build_collection_index(self, collection_name: str, rows: int) -> None:
+        try:
+            self.execute_autocommit(
+                self.get_index_sql(
+                    self.get_collection_index_name(collection_name),
+                    collection_name,
+                    rows,
+                    concurrently=True,
+                )
+            )
+            log.info(f"Built vector index of collection '{collection_name}'")
+        except Exception as e:
+            self._indexed_collections.discard(collection_name)
+            log.warning(f"Unable to index collection '{collection_name}': {e}")
+
+    def ensure_collection_index(self, collection_name: str, written: int) -> None:
+        """
+        Builds the partial index of a collection once it is large enough for
+        an approximate search to pay off, in the background.
+
+        The collection is counted when it is first written to, and again only
+        when the rows written since could have taken it over
+        PGVECTOR_INDEX_MIN_ROWS or make up a tenth of it (writes of other
+        workers are not seen here).
+        """
+        if (
+            PGVECTOR_INDEX_METHOD == "none"
+            or PGVECTOR_INDEX_SCOPE != "collection"
+            or collection_name in self._indexed_collections
+        ):
+            return
+
+        entry = self._collection_rows.get(collection_name)
+        if entry is not None:
+            rows, written = entry[0], entry[1] + written
+            if (
+                rows + written < PGVECTOR_INDEX_MIN_ROWS
+                and written < PGVECTOR_INDEX_MIN_ROWS // 10
+            ):
+                self._collection_rows[collection_name] = (rows, written)
+                return
+
+        try:
+            rows = self.count_rows(collection_name)
+            self.session.rollback()
+        except Exception as e:
+            self.session.rollback()
+            log.warning(f"Unable to count collection '{collection_name}': {e}")
+            return
+
+        if rows >= PGVECTOR_INDEX_MIN_ROWS:
+            self._collection_rows.pop(collection_name, None)
+            self._indexed_collections.add(collection_name)
+            VECTOR_DB_EXECUTOR.submit(
+                self.build_collection_index, collection_name, rows
+            )
+        else:
+            self._collection_rows[collection_name] = (rows, 0)
+
+    def rebuild_index(self, collection_name: Optional[str] = None) -> None:
+        """
+        Rebuilds the ANN indexes with the current index settings, online. A
+        collection name only rebuilds that collection's partial index.
+        """
+        if collection_name is not None:
+            if PGVECTOR_INDEX_METHOD == "none" or PGVECTOR_INDEX_SCOPE != "collection":
+                raise ValueError("Per-collection vector indexes are disabled.")
+
+            self.swap_index(
+                self.get_collection_index_name(collection_name),
+                collection_name,
+                self.count_rows(collection_name),
+            )
+            self.session.rollback()
+            self._indexed_collections.add(collection_name)
+            return
+
+        collection_index_names = self.get_collection_index_names()
+
+        if PGVECTOR_INDEX_METHOD != "none" and PGVECTOR_INDEX_SCOPE == "global":
+            rows = self.count_rows()
+            self.session.rollback()
+            self.swap_index(INDEX_NAME, rows=rows)
+        else:
+            self.execute_autocommit(f"DROP INDEX CONCURRENTLY IF EXISTS {INDEX_NAME}")
+
+        if PGVECTOR_INDEX_METHOD != "none" and PGVECTOR_INDEX_SCOPE == "collection":
+            counts = (
+                self.session.query(
+                    DocumentChunk.collection_name, func.count(DocumentChunk.id)
+                )
+                .group_by(DocumentChunk.collection_name)
+                .having(func.count(DocumentChunk.id) >= PGVECTOR_INDEX_MIN_ROWS)
+                .all()
+            )
+            self.session.rollback()
+
+            for name, rows in counts:
+                index_name = self.get_collection_index_name(name)
+                self.swap_index(index_name, name, rows)
+                self._indexed_collections.add(name)
+                if index_name in collection_index_names:
+                    collection_index_names.remove(index_name)
+
+        # Indexes of the previous settings or of collections gone since
+        self.execute_autocommit(
+            *[
+                f"DROP INDEX CONCURRENTLY IF EXISTS {name}"
+                for name in collection_index_names
+            ]
+        )
+        log.info("Vector indexes rebuilt.")
+
+    def set_search_params(self, limit: Optional[int] = None) -> None:
+        # Transaction-local, undone by the rollback that ends every search
+        params = {}
+        if PGVECTOR_INDEX_METHOD == "hnsw":
+            if PGVECTOR_HNSW_EF_SEARCH > 0 or QUANTIZED_INDEX:
+                # The index never returns more than ef_search rows
+                params["hnsw.ef_search"] = max(PGVECTOR_HNSW_EF_SEARCH, limit or 0)
+            if PGVECTOR_HNSW_ITERATIVE_SCAN:
+                params["hnsw.iterative_scan"] = PGVECTOR_HNSW_ITERATIVE_SCAN
+        elif PGVECTOR_INDEX_METHOD == "ivfflat" and PGVECTOR_IVFFLAT_PROBES > 0:
+            params["ivfflat.probes"] = PGVECTOR_IVFFLAT_PROBES
+
+        for name, value in params.items():
+            self.session.execute(
+                text("SELECT set_config(:name, :value, true)"),
+                {"name": name, "value": str(value)},
+            )
+
     def adjust_vector_length(self, vector: List[float]) -> List[float]:
         # Adjust vector to have length VECTOR_LENGTH
         current_length = len(vector)
@@ -221,56 +527,67 @@ class PgvectorClient(VectorDBBase):
             vector = vector[:VECTOR_LENGTH]
         return vector
 
-    def insert(self, collection_name: str, items: List[VectorItem]) -> None:
-        try:
-            if PGVECTOR_PGCRYPTO:
-                for item in items:
-                    vector = self.adjust_vector_length(item["vector"])
-                    # Use raw SQL for BYTEA/pgcrypto
-                    # Ensure metadata is converted to its JSON text representation
-                    json_metadata = json.dumps(item["metadata"])
-                    self.session.execute(
-                        text(
-                            """
-                            INSERT INTO document_chunk
-                            (id, vector, collection_name, text, vmetadata)
-                            VALUES (
-                                :id, :vector, :collection_name,
-                                pgp_sym_encrypt(:text, :key),
-                                pgp_sym_encrypt(:metadata_text, :key)
-                            )
-                            ON CONFLICT (id) DO NOTHING
-                        """
-                        ),
-                        {
-                            "id": item["id"],
-                            "vector": vector,
-                            "collection_name": collection_name,
-                            "text": item["text"],
-                            "metadata_text": json_metadata,
-                            "key": PGVECTOR_PGCRYPTO_KEY,
-                        },
-                    )
-                self.session.commit()
-                log.info(f"Encrypted & inserted {len(items)} into '{collection_name}'")
+    def get_chunk_values(self, collection_name: str, item: VectorItem) -> dict:
+        values = {
+            "id": item["id"],
+            "vector": self.adjust_vector_length(item["vector"]),
+            "collection_name": collection_name,
+        }
+        if PGVECTOR_PGCRYPTO:
+            # Encrypted server side, the metadata as its JSON text representation
+            values["text"] = pgcrypto_encrypt(item["text"], PGVECTOR_PGCRYPTO_KEY)
+            values["vmetadata"] = pgcrypto_encrypt(
+                json.dumps(item["metadata"]), PGVECTOR_PGCRYPTO_KEY
+            )
+        else:
+            values["text"] = item["text"]
+            values["vmetadata"] = stringify_metadata(item["metadata"])
+        return values
 
-            else:
-                new_items = []
-                for item in items:
-                    vector = self.adjust_vector_length(item["vector"])
-                    new_chunk = DocumentChunk(
-                        id=item["id"],
-                        vector=vector,
-                        collection_name=collection_name,
-                        text=item["text"],
-                        vmetadata=stringify_metadata(item["metadata"]),
-                    )
-                    new_items.append(new_chunk)
-                self.session.bulk_save_objects(new_items)
-                self.session.commit()
-                log.info(
-                    f"Inserted {len(new_items)} items into collection '{collection_name}'."
+    def write_chunks(
+        self, collection_name: str, items: List[VectorItem], update: bool
+    ) -> None:
+        """
+        Writes items with one multi-row INSERT ... ON CONFLICT per batch of
+        PGVECTOR_INSERT_BATCH_SIZE instead of a statement (or a lookup) per
+        item, in a single transaction. Existing ids are skipped, or
+        overwritten when `update` is set.
+        """
+        batch_size = max(PGVECTOR_INSERT_BATCH_SIZE, 1)
+
+        for start in range(0, len(items), batch_size):
+            batch = items[start : start + batch_size]
+            if update:
+                # A statement can only update a row once, the last item wins
+                batch = list({item["id"]: item for item in batch}.values())
+
+            stmt = pg_insert(DocumentChunk).values(
+                [self.get_chunk_values(collection_name, item) for item in batch]
+            )
+            if update:
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[DocumentChunk.id],
+                    set_={
+                        "vector": stmt.excluded.vector,
+                        "collection_name": stmt.excluded.collection_name,
+                        "text": stmt.excluded.text,
+                        "vmetadata": stmt.excluded.vmetadata,
+                    },
                 )
+            else:
+                stmt = stmt.on_conflict_do_nothing(index_elements=[DocumentChunk.id])
+            self.session.execute(stmt)
+
+        self.session.commit()
+
+    def insert(self, collection_name: str, items: List[VectorItem]) -> None:
+        try:
+            self.write_chunks(collection_name, items, update=False)
+            log.info(
+                f"{'Encrypted & inserted' if PGVECTOR_PGCRYPTO else 'Inserted'} "
+                f"{len(items)} items into collection '{collection_name}'."
+            )
+            self.ensure_collection_index(collection_name, len(items))
         except Exception as e:
             self.session.rollback()
             log.exception(f"Error during insert: {e}")
@@ -278,66 +595,12 @@ class PgvectorClient(VectorDBBase):
 
     def upsert(self, collection_name: str, items: List[VectorItem]) -> None:
         try:
-            if PGVECTOR_PGCRYPTO:
-                for item in items:
-                    vector = self.adjust_vector_length(item["vector"])
-                    json_metadata = json.dumps(item["metadata"])
-                    self.session.execute(
-                        text(
-                            """
-                            INSERT INTO document_chunk
-                            (id, vector, collection_name, text, vmetadata)
-                            VALUES (
-                                :id, :vector, :collection_name,
-                                pgp_sym_encrypt(:text, :key),
-                                pgp_sym_encrypt(:metadata_text, :key)
-                            )
-                            ON CONFLICT (id) DO UPDATE SET
-                              vector = EXCLUDED.vector,
-                              collection_name = EXCLUDED.collection_name,
-                              text = EXCLUDED.text,
-                              vmetadata = EXCLUDED.vmetadata
-                        """
-                        ),
-                        {
-                            "id": item["id"],
-                            "vector": vector,
-                            "collection_name": collection_name,
-                            "text": item["text"],
-                            "metadata_text": json_metadata,
-                            "key": PGVECTOR_PGCRYPTO_KEY,
-                        },
-                    )
-                self.session.commit()
-                log.info(f"Encrypted & upserted {len(items)} into '{collection_name}'")
-            else:
-                for item in items:
-                    vector = self.adjust_vector_length(item["vector"])
-                    existing = (
-                        self.session.query(DocumentChunk)
-                        .filter(DocumentChunk.id == item["id"])
-                        .first()
-                    )
-                    if existing:
-                        existing.vector = vector
-                        existing.text = item["text"]
-                        existing.vmetadata = stringify_metadata(item["metadata"])
-                        existing.collection_name = (
-                            collection_name  # Update collection_name if necessary
-                        )
-                    else:
-                        new_chunk = DocumentChunk(
-                            id=item["id"],
-                            vector=vector,
-                            collection_name=collection_name,
-                            text=item["text"],
-                            vmetadata=stringify_metadata(item["metadata"]),
-                        )
-                        self.session.add(new_chunk)
-                self.session.commit()
-                log.info(
-                    f"Upserted {len(items)} items into collection '{collection_name}'."
-                )
+            self.write_chunks(collection_name, items, update=True)
+            log.info(
+                f"{'Encrypted & upserted' if PGVECTOR_PGCRYPTO else 'Upserted'} "
+                f"{len(items)} items into collection '{collection_name}'."
+            )
+            self.ensure_collection_index(collection_name, len(items))
         except Exception as e:
             self.session.rollback()
             log.exception(f"Error during upsert: {e}")
@@ -349,9 +612,20 @@ class PgvectorClient(VectorDBBase):
         vectors: List[List[float]],
         limit: Optional[int] = None,
     ) -> Optional[SearchResult]:
+        return self.search_collections([collection_name], vectors, limit).get(
+            collection_name
+        )
+
+    def search_collections(
+        self,
+        collection_names: List[str],
+        vectors: List[List[float]],
+        limit: Optional[int] = None,
+    ) -> Dict[str, Optional[SearchResult]]:
         try:
-            if not vectors:
-                return None
+            if not vectors or not collection_names:
+                return {}
+            collection_names = list(dict.fromkeys(collection_names))
 
             # Adjust query vectors to VECTOR_LENGTH
             vectors = [self.adjust_vector_length(vector) for vector in vectors]
@@ -394,65 +668,96 @@ class PgvectorClient(VectorDBBase):
                 )
             )
 
-            # Build the lateral subquery for each query vector
-            subq = (
-                select(*result_fields)
-                .where(DocumentChunk.collection_name == collection_name)
-                .order_by(
-                    (DocumentChunk.vector.cosine_distance(query_vectors.c.q_vector))
+            # With a quantized index the candidates are picked by their
+            # quantized distance, VECTOR_DB_RESCORE_FACTOR times as many as
+            # requested, and re-ranked by their full precision distance
+            quantized = QUANTIZED_INDEX and limit is not None
+            num_candidates = limit
+            if quantized and VECTOR_DB_RESCORE_FACTOR > 0:
+                num_candidates = limit * VECTOR_DB_RESCORE_FACTOR
+
+            # One lateral subquery per collection, every query vector getting
+            # its own top `limit`. The collection name is a constant of each
+            # branch so the planner can use the collection's partial index.
+            collection_queries = []
+            for idx, collection_name in enumerate(collection_names):
+                subq = select(*result_fields).where(
+                    DocumentChunk.collection_name == collection_name
                 )
-            )
-            if limit is not None:
-                subq = subq.limit(limit)
-            subq = subq.lateral("result")
-
-            # Build the main query by joining query_vectors and the lateral subquery
-            stmt = (
-                select(
-                    query_vectors.c.qid,
-                    subq.c.id,
-                    subq.c.text,
-                    subq.c.vmetadata,
-                    subq.c.distance,
+                if quantized:
+                    subq = subq.order_by(
+                        quantized_distance(
+                            DocumentChunk.vector, query_vectors.c.q_vector
+                        )
+                    ).limit(num_candidates)
+                    if num_candidates > limit:
+                        candidates = subq.correlate(query_vectors).subquery(
+                            f"candidates_{idx}"
+                        )
+                        subq = (
+                            select(candidates)
+                            .order_by(candidates.c.distance)
+                            .limit(limit)
+                        )
+                else:
+                    subq = subq.order_by(
+                        (DocumentChunk.vector.cosine_distance(query_vectors.c.q_vector))
+                    )
+                    if limit is not None:
+                        subq = subq.limit(limit)
+                subq = subq.lateral(f"result_{idx}")
+
+                collection_queries.append(
+                    select(
+                        literal(collection_name, Text).label("q_collection_name"),
+                        query_vectors.c.qid,
+                        subq.c.id,
+                        subq.c.text,
+                        subq.c.vmetadata,
+                        subq.c.distance,
+                    )
+                    .select_from(query_vectors)
+                    .join(subq, true())
                 )
-                .select_from(query_vectors)
-                .join(subq, true())
-                .order_by(query_vectors.c.qid, subq.c.distance)
+
+            # Build the main query over the results of all collections
+            results_subq = union_all(*collection_queries).subquery("results")
+            stmt = select(results_subq).order_by(
+                results_subq.c.q_collection_name,
+                results_subq.c.qid,
+                results_subq.c.distance,
             )
 
+            self.set_search_params(num_candidates)
             result_proxy = self.session.execute(stmt)
             results = result_proxy.all()
 
-            ids = [[] for _ in range(num_queries)]
-            distances = [[] for _ in range(num_queries)]
-            documents = [[] for _ in range(num_queries)]
-            metadatas = [[] for _ in range(num_queries)]
-
-            if not results:
-                return SearchResult(
-                    ids=ids,
-                    distances=distances,
-                    documents=documents,
-                    metadatas=metadatas,
+            search_results = {
+                collection_name: SearchResult(
+                    ids=[[] for _ in range(num_queries)],
+                    distances=[[] for _ in range(num_queries)],
+                    documents=[[] for _ in range(num_queries)],
+                    metadatas=[[] for _ in range(num_queries)],
                 )
+                for collection_name in collection_names
+            }
 
             for row in results:
+                result = search_results[row.q_collection_name]
                 qid = int(row.qid)
-                ids[qid].append(row.id)
+                result.ids[qid].append(row.id)
                 # normalize and re-orders pgvec distance from [2, 0] to [0, 1] score range
                 # https://github.com/pgvector/pgvector?tab=readme-ov-file#querying
-                distances[qid].append((2.0 - row.distance) / 2.0)
-                documents[qid].append(row.text)
-                metadatas[qid].append(row.vmetadata)
+                result.distances[qid].append((2.0 - row.distance) / 2.0)
+                result.documents[qid].append(row.text)
+                result.metadatas[qid].append(row.vmetadata)
 
             self.session.rollback()  # read-only transaction
-            return SearchResult(
-                ids=ids, distances=distances, documents=documents, metadatas=metadatas
-            )
+            return search_results
         except Exception as e:
             self.session.rollback()
             log.exception(f"Error during search: {e}")
-            return None
+            return {collection_name: None for collection_name in collection_names}
 
     def query(
         self, collection_name: str, filter: Dict[str, Any], limit: Optional[int] = None
@@ -603,6 +908,15 @@ class PgvectorClient(VectorDBBase):
         try:
             deleted = self.session.query(DocumentChunk).delete()
             self.session.commit()
+
+            self.execute_autocommit(
+                *[
+                    f"DROP INDEX CONCURRENTLY IF EXISTS {name}"
+                    for name in self.get_collection_index_names()
+                ]
+            )
+            self._indexed_collections.clear()
+            self._collection_rows.clear()
             log.info(
                 f"Reset complete. Deleted {deleted} items from 'document_chunk' table."
             )
@@ -631,4 +945,14 @@ class PgvectorClient(VectorDBBase):
 
     def delete_collection(self, collection_name: str) -> None:
         self.delete(collection_name)
+        if PGVECTOR_INDEX_SCOPE == "collection":
+            try:
+                self.execute_autocommit(
+                    "DROP INDEX CONCURRENTLY IF EXISTS "
+                    f"{self.get_collection_index_name(collection_name)}"
+                )
+            except Exception as e:
+                log.warning(f"Unable to drop index of '{collection_name}': {e}")
+            self._indexed_collections.discard(collection_name)
+            self._collection_rows.pop(collection_name, None)
         log.info(f"Collection '{collection_name}' deleted.")
@@ -1,6 +1,17 @@
+import logging
+
 from open_webui.retrieval.vector.main import VectorDBBase
 from open_webui.retrieval.vector.type import VectorType
-from open_webui.config import VECTOR_DB, ENABLE_QDRANT_MULTITENANCY_MODE
+from open_webui.retrieval.bm25 import BM25_INDEX, BM25IndexedVectorClient
+from open_webui.config import (
+    VECTOR_DB,
+    VECTOR_DB_QUANTIZATION,
+    ENABLE_QDRANT_MULTITENANCY_MODE,
+)
+from open_webui.env import SRC_LOG_LEVELS
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["RAG"])
 
 
 class Vector:
@@ -56,8 +67,21 @@ class Vector:
                 from open_webui.retrieval.vector.dbs.oracle23ai import Oracle23aiClient
 
                 return Oracle23aiClient()
+            case VectorType.LOCAL:
+                from open_webui.retrieval.vector.dbs.local import LocalVectorClient
+
+                return LocalVectorClient()
             case _:
                 raise ValueError(f"Unsupported vector type: {vector_type}")
 
 
 VECTOR_DB_CLIENT = Vector.get_vector(VECTOR_DB)
+
+if BM25_INDEX:
+    VECTOR_DB_CLIENT = BM25IndexedVectorClient(VECTOR_DB_CLIENT, BM25_INDEX)
+
+if VECTOR_DB_QUANTIZATION != "none" and not VECTOR_DB_CLIENT.supports_quantization:
+    log.warning(
+        f"VECTOR_DB_QUANTIZATION is '{VECTOR_DB_QUANTIZATION}' but {VECTOR_DB} "
+        "does not support quantization, vectors are stored at full precision."
+    )
@@ -1,7 +1,46 @@
+import asyncio
+import functools
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
 from pydantic import BaseModel
 from abc import ABC, abstractmethod
 from typing import Any, Dict, List, Optional, Union
 
+from open_webui.config import VECTOR_DB_MAX_WORKERS
+
+_executor_thread = threading.local()
+
+
+def _init_executor_thread():
+    _executor_thread.active = True
+
+
+# Shared, bounded pool for blocking vector DB calls, so fanning out over
+# collections and queries never creates threads per request
+VECTOR_DB_EXECUTOR = ThreadPoolExecutor(
+    max_workers=VECTOR_DB_MAX_WORKERS,
+    thread_name_prefix="vector_db",
+    initializer=_init_executor_thread,
+)
+
+
+def submit_to_vector_db_executor(fn, /, *args, **kwargs) -> Future:
+    """
+    Submits `fn` to VECTOR_DB_EXECUTOR, or runs it inline when already on one
+    of its threads: a worker waiting for work queued behind it on the bounded
+    pool deadlocks once every worker does.
+    """
+    if not getattr(_executor_thread, "active", False):
+        return VECTOR_DB_EXECUTOR.submit(fn, *args, **kwargs)
+
+    future = Future()
+    try:
+        future.set_result(fn(*args, **kwargs))
+    except BaseException as e:
+        future.set_exception(e)
+    return future
+
 
 class VectorItem(BaseModel):
     id: str
@@ -29,8 +68,23 @@ class VectorDBBase(ABC):
 
     Any custom vector database integration must inherit from this class and
     implement all abstract methods.
+
+    The `*_async` variants run the synchronous methods on the shared
+    VECTOR_DB_EXECUTOR; backends with a native async client can override them.
+
+    Backends whose `search` answers every query vector in one call, with one
+    result row per vector, set `supports_multi_vector_search`; backends that
+    can search several collections in one round trip override
+    `search_collections` and set `supports_multi_collection_search`.
+
+    Backends that store vectors quantized according to VECTOR_DB_QUANTIZATION
+    set `supports_quantization`, the others store them at full precision.
     """
 
+    supports_multi_vector_search: bool = False
+    supports_multi_collection_search: bool = False
+    supports_quantization: bool = False
+
     @abstractmethod
     def has_collection(self, collection_name: str) -> bool:
         """Check if the collection exists in the vector DB."""
@@ -58,6 +112,36 @@ class VectorDBBase(ABC):
         """Search for similar vectors in a collection."""
         pass
 
+    def search_vectors(
+        self, collection_name: str, vectors: List[List[Union[float, int]]], limit: int
+    ) -> Optional[SearchResult]:
+        """Search a collection with several query vectors, one result row per vector."""
+        if self.supports_multi_vector_search or len(vectors) <= 1:
+            return self.search(collection_name, vectors, limit)
+
+        rows = {"ids": [], "distances": [], "documents": [], "metadatas": []}
+        found = False
+        for vector in vectors:
+            result = self.search(collection_name, [vector], limit)
+            for field, row in rows.items():
+                values = getattr(result, field, None) if result else None
+                row.append(values[0] if values else [])
+            found = found or result is not None
+
+        return SearchResult(**rows) if found else None
+
+    def search_collections(
+        self,
+        collection_names: List[str],
+        vectors: List[List[Union[float, int]]],
+        limit: int,
+    ) -> Dict[str, Optional[SearchResult]]:
+        """Search several collections with the same query vectors."""
+        return {
+            collection_name: self.search_vectors(collection_name, vectors, limit)
+            for collection_name in collection_names
+        }
+
     @abstractmethod
     def query(
         self, collection_name: str, filter: Dict, limit: Optional[int] = None
@@ -84,3 +168,80 @@ class VectorDBBase(ABC):
     def reset(self) -> None:
         """Reset the vector database by removing all collections or those matching a condition."""
         pass
+
+    def rebuild_index(self, collection_name: Optional[str] = None) -> None:
+        """Rebuild the vector indexes of backends that manage their own, online."""
+        raise NotImplementedError(
+            f"{type(self).__name__} does not support rebuilding its indexes."
+        )
+
+    async def _run_in_executor(self, func, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            VECTOR_DB_EXECUTOR, functools.partial(func, *args, **kwargs)
+        )
+
+    async def has_collection_async(self, collection_name: str) -> bool:
+        return await self._run_in_executor(self.has_collection, collection_name)
+
+    async def delete_collection_async(self, collection_name: str) -> None:
+        return await self._run_in_executor(self.delete_collection, collection_name)
+
+    async def insert_async(self, collection_name: str, items: List[VectorItem]) -> None:
+        return await self._run_in_executor(self.insert, collection_name, items)
+
+    async def upsert_async(self, collection_name: str, items: List[VectorItem]) -> None:
+        return await self._run_in_executor(self.upsert, collection_name, items)
+
+    async def search_async(
+        self, collection_name: str, vectors: List[List[Union[float, int]]], limit: int
+    ) -> Optional[SearchResult]:
+        return await self._run_in_executor(
+            self.search, collection_name=collection_name, vectors=vectors, limit=limit
+        )
+
+    async def search_vectors_async(
+        self, collection_name: str, vectors: List[List[Union[float, int]]], limit: int
+    ) -> Optional[SearchResult]:
+        return await self._run_in_executor(
+            self.search_vectors,
+            collection_name=collection_name,
+            vectors=vectors,
+            limit=limit,
+        )
+
+    async def search_collections_async(
+        self,
+        collection_names: List[str],
+        vectors: List[List[Union[float, int]]],
+        limit: int,
+    ) -> Dict[str, Optional[SearchResult]]:
+        return await self._run_in_executor(
+            self.search_collections,
+            collection_names=collection_names,
+            vectors=vectors,
+            limit=limit,
+        )
+
+    async def query_async(
+        self, collection_name: str, filter: Dict, limit: Optional[int] = None
+    ) -> Optional[GetResult]:
+        return await self._run_in_executor(
+            self.query, collection_name=collection_name, filter=filter, limit=limit
+        )
+
+    async def get_async(self, collection_name: str) -> Optional[GetResult]:
+        return await self._run_in_executor(self.get, collection_name=collection_name)
+
+    async def delete_async(
+        self,
+        collection_name: str,
+        ids: Optional[List[str]] = None,
+        filter: Optional[Dict] = None,
+    ) -> None:
+        return await self._run_in_executor(
+            self.delete, collection_name=collection_name, ids=ids, filter=filter
+        )
+
+    async def reset_async(self) -> None:
+        return await self._run_in_executor(self.reset)
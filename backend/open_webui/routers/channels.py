@@ -244,7 +244,9 @@ async def post_new_message(
         )
 
     try:
-        message = Messages.insert_new_message(form_data, channel.id, user.id)
+        message = await Messages.insert_new_message_async(
+            form_data, channel.id, user.id
+        )
 
         if message:
             event_data = {
@@ -276,7 +278,9 @@ async def post_new_message(
 
             if message.parent_id:
                 # If this message is a reply, emit to the parent message as well
-                parent_message = Messages.get_message_by_id(message.parent_id)
+                parent_message = await Messages.get_message_by_id_async(
+                    message.parent_id
+                )
 
                 if parent_message:
                     await sio.emit(
@@ -344,7 +348,7 @@ async def get_channel_message(
             status_code=status.HTTP_403_FORBIDDEN, detail=ERROR_MESSAGES.DEFAULT()
         )
 
-    message = Messages.get_message_by_id(message_id)
+    message = await Messages.get_message_by_id_async(message_id)
     if not message:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail=ERROR_MESSAGES.NOT_FOUND
@@ -434,7 +438,7 @@ async def update_message_by_id(
             status_code=status.HTTP_404_NOT_FOUND, detail=ERROR_MESSAGES.NOT_FOUND
         )
 
-    message = Messages.get_message_by_id(message_id)
+    message = await Messages.get_message_by_id_async(message_id)
     if not message:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail=ERROR_MESSAGES.NOT_FOUND
@@ -456,7 +460,7 @@ async def update_message_by_id(
 
     try:
         message = Messages.update_message_by_id(message_id, form_data)
-        message = Messages.get_message_by_id(message_id)
+        message = await Messages.get_message_by_id_async(message_id)
 
         if message:
             await sio.emit(
@@ -515,7 +519,7 @@ async def add_reaction_to_message(
             status_code=status.HTTP_403_FORBIDDEN, detail=ERROR_MESSAGES.DEFAULT()
         )
 
-    message = Messages.get_message_by_id(message_id)
+    message = await Messages.get_message_by_id_async(message_id)
     if not message:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail=ERROR_MESSAGES.NOT_FOUND
@@ -528,7 +532,7 @@ async def add_reaction_to_message(
 
     try:
         Messages.add_reaction_to_message(message_id, user.id, form_data.name)
-        message = Messages.get_message_by_id(message_id)
+        message = await Messages.get_message_by_id_async(message_id)
 
         await sio.emit(
             "channel-events",
@@ -581,7 +585,7 @@ async def remove_reaction_by_id_and_user_id_and_name(
             status_code=status.HTTP_403_FORBIDDEN, detail=ERROR_MESSAGES.DEFAULT()
         )
 
-    message = Messages.get_message_by_id(message_id)
+    message = await Messages.get_message_by_id_async(message_id)
     if not message:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail=ERROR_MESSAGES.NOT_FOUND
@@ -597,7 +601,7 @@ async def remove_reaction_by_id_and_user_id_and_name(
             message_id, user.id, form_data.name
         )
 
-        message = Messages.get_message_by_id(message_id)
+        message = await Messages.get_message_by_id_async(message_id)
 
         await sio.emit(
             "channel-events",
@@ -643,7 +647,7 @@ async def delete_message_by_id(
             status_code=status.HTTP_404_NOT_FOUND, detail=ERROR_MESSAGES.NOT_FOUND
         )
 
-    message = Messages.get_message_by_id(message_id)
+    message = await Messages.get_message_by_id_async(message_id)
     if not message:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail=ERROR_MESSAGES.NOT_FOUND
@@ -685,7 +689,7 @@ async def delete_message_by_id(
 
         if message.parent_id:
             # If this message is a reply, emit to the parent message as well
-            parent_message = Messages.get_message_by_id(message.parent_id)
+            parent_message = await Messages.get_message_by_id_async(message.parent_id)
 
             if parent_message:
                 await sio.emit(
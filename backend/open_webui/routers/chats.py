@@ -37,10 +37,21 @@ router = APIRouter()
 @router.get("/", response_model=list[ChatTitleIdResponse])
 @router.get("/list", response_model=list[ChatTitleIdResponse])
 def get_session_user_chat_list(
-    user=Depends(get_verified_user), page: Optional[int] = None
+    user=Depends(get_verified_user),
+    page: Optional[int] = None,
+    before_updated_at: Optional[int] = None,
+    before_id: Optional[str] = None,
 ):
     try:
-        if page is not None:
+        if before_updated_at is not None:
+            # Keyset pagination, continues after the last chat of the previous page
+            return Chats.get_chat_title_id_list_by_user_id(
+                user.id,
+                limit=60,
+                before_updated_at=before_updated_at,
+                before_id=before_id,
+            )
+        elif page is not None:
             limit = 60
             skip = (page - 1) * limit
 
@@ -88,6 +99,8 @@ async def get_user_chat_list_by_user_id(
     query: Optional[str] = None,
     order_by: Optional[str] = None,
     direction: Optional[str] = None,
+    before_updated_at: Optional[int] = None,
+    before_id: Optional[str] = None,
     user=Depends(get_admin_user),
 ):
     if not ENABLE_ADMIN_CHAT_ACCESS:
@@ -110,8 +123,17 @@ async def get_user_chat_list_by_user_id(
     if direction:
         filter["direction"] = direction
 
+    if before_updated_at is not None:
+        skip = 0
+
     return Chats.get_chat_list_by_user_id(
-        user_id, include_archived=True, filter=filter, skip=skip, limit=limit
+        user_id,
+        include_archived=True,
+        filter=filter,
+        skip=skip,
+        limit=limit,
+        before_updated_at=before_updated_at,
+        before_id=before_id,
     )
 
 
@@ -350,7 +372,7 @@ async def get_shared_chat_by_id(share_id: str, user=Depends(get_verified_user)):
     if user.role == "user" or (user.role == "admin" and not ENABLE_ADMIN_CHAT_ACCESS):
         chat = Chats.get_chat_by_share_id(share_id)
     elif user.role == "admin" and ENABLE_ADMIN_CHAT_ACCESS:
-        chat = Chats.get_chat_by_id(share_id)
+        chat = await Chats.get_chat_by_id_async(share_id)
 
     if chat:
         return ChatResponse(**chat.model_dump())
@@ -395,7 +417,7 @@ async def get_user_chat_list_by_tag_name(
 
 @router.get("/{id}", response_model=Optional[ChatResponse])
 async def get_chat_by_id(id: str, user=Depends(get_verified_user)):
-    chat = Chats.get_chat_by_id_and_user_id(id, user.id)
+    chat = await Chats.get_chat_by_id_and_user_id_async(id, user.id)
 
     if chat:
         return ChatResponse(**chat.model_dump())
@@ -415,10 +437,10 @@ async def get_chat_by_id(id: str, user=Depends(get_verified_user)):
 async def update_chat_by_id(
     id: str, form_data: ChatForm, user=Depends(get_verified_user)
 ):
-    chat = Chats.get_chat_by_id_and_user_id(id, user.id)
+    chat = await Chats.get_chat_by_id_and_user_id_async(id, user.id)
     if chat:
         updated_chat = {**chat.chat, **form_data.chat}
-        chat = Chats.update_chat_by_id(id, updated_chat)
+        chat = await Chats.update_chat_by_id_async(id, updated_chat)
         return ChatResponse(**chat.model_dump())
     else:
         raise HTTPException(
@@ -438,7 +460,7 @@ class MessageForm(BaseModel):
 async def update_chat_message_by_id(
     id: str, message_id: str, form_data: MessageForm, user=Depends(get_verified_user)
 ):
-    chat = Chats.get_chat_by_id(id)
+    chat = await Chats.get_chat_by_id_async(id)
 
     if not chat:
         raise HTTPException(
@@ -452,7 +474,7 @@ async def update_chat_message_by_id(
             detail=ERROR_MESSAGES.ACCESS_PROHIBITED,
         )
 
-    chat = Chats.upsert_message_to_chat_by_id_and_message_id(
+    chat = await Chats.upsert_message_to_chat_by_id_and_message_id_async(
         id,
         message_id,
         {
@@ -496,7 +518,7 @@ class EventForm(BaseModel):
 async def send_chat_message_event_by_id(
     id: str, message_id: str, form_data: EventForm, user=Depends(get_verified_user)
 ):
-    chat = Chats.get_chat_by_id(id)
+    chat = await Chats.get_chat_by_id_async(id)
 
     if not chat:
         raise HTTPException(
@@ -536,7 +558,7 @@ async def send_chat_message_event_by_id(
 @router.delete("/{id}", response_model=bool)
 async def delete_chat_by_id(request: Request, id: str, user=Depends(get_verified_user)):
     if user.role == "admin":
-        chat = Chats.get_chat_by_id(id)
+        chat = await Chats.get_chat_by_id_async(id)
         for tag in chat.meta.get("tags", []):
             if Chats.count_chats_by_tag_name_and_user_id(tag, user.id) == 1:
                 Tags.delete_tag_by_name_and_user_id(tag, user.id)
@@ -553,7 +575,7 @@ async def delete_chat_by_id(request: Request, id: str, user=Depends(get_verified
                 detail=ERROR_MESSAGES.ACCESS_PROHIBITED,
             )
 
-        chat = Chats.get_chat_by_id(id)
+        chat = await Chats.get_chat_by_id_async(id)
         for tag in chat.meta.get("tags", []):
             if Chats.count_chats_by_tag_name_and_user_id(tag, user.id) == 1:
                 Tags.delete_tag_by_name_and_user_id(tag, user.id)
@@ -569,7 +591,7 @@ async def delete_chat_by_id(request: Request, id: str, user=Depends(get_verified
 
 @router.get("/{id}/pinned", response_model=Optional[bool])
 async def get_pinned_status_by_id(id: str, user=Depends(get_verified_user)):
-    chat = Chats.get_chat_by_id_and_user_id(id, user.id)
+    chat = await Chats.get_chat_by_id_and_user_id_async(id, user.id)
     if chat:
         return chat.pinned
     else:
@@ -585,7 +607,7 @@ async def get_pinned_status_by_id(id: str, user=Depends(get_verified_user)):
 
 @router.post("/{id}/pin", response_model=Optional[ChatResponse])
 async def pin_chat_by_id(id: str, user=Depends(get_verified_user)):
-    chat = Chats.get_chat_by_id_and_user_id(id, user.id)
+    chat = await Chats.get_chat_by_id_and_user_id_async(id, user.id)
     if chat:
         chat = Chats.toggle_chat_pinned_by_id(id)
         return chat
@@ -608,7 +630,7 @@ class CloneForm(BaseModel):
 async def clone_chat_by_id(
     form_data: CloneForm, id: str, user=Depends(get_verified_user)
 ):
-    chat = Chats.get_chat_by_id_and_user_id(id, user.id)
+    chat = await Chats.get_chat_by_id_and_user_id_async(id, user.id)
     if chat:
         updated_chat = {
             **chat.chat,
@@ -645,7 +667,7 @@ async def clone_chat_by_id(
 async def clone_shared_chat_by_id(id: str, user=Depends(get_verified_user)):
 
     if user.role == "admin":
-        chat = Chats.get_chat_by_id(id)
+        chat = await Chats.get_chat_by_id_async(id)
     else:
         chat = Chats.get_chat_by_share_id(id)
 
@@ -682,7 +704,7 @@ async def clone_shared_chat_by_id(id: str, user=Depends(get_verified_user)):
 
 @router.post("/{id}/archive", response_model=Optional[ChatResponse])
 async def archive_chat_by_id(id: str, user=Depends(get_verified_user)):
-    chat = Chats.get_chat_by_id_and_user_id(id, user.id)
+    chat = await Chats.get_chat_by_id_and_user_id_async(id, user.id)
     if chat:
         chat = Chats.toggle_chat_archive_by_id(id)
 
@@ -723,7 +745,7 @@ async def share_chat_by_id(request: Request, id: str, user=Depends(get_verified_
             detail=ERROR_MESSAGES.ACCESS_PROHIBITED,
         )
 
-    chat = Chats.get_chat_by_id_and_user_id(id, user.id)
+    chat = await Chats.get_chat_by_id_and_user_id_async(id, user.id)
 
     if chat:
         if chat.share_id:
@@ -752,7 +774,7 @@ async def share_chat_by_id(request: Request, id: str, user=Depends(get_verified_
 
 @router.delete("/{id}/share", response_model=Optional[bool])
 async def delete_shared_chat_by_id(id: str, user=Depends(get_verified_user)):
-    chat = Chats.get_chat_by_id_and_user_id(id, user.id)
+    chat = await Chats.get_chat_by_id_and_user_id_async(id, user.id)
     if chat:
         if not chat.share_id:
             return False
@@ -781,7 +803,7 @@ class ChatFolderIdForm(BaseModel):
 async def update_chat_folder_id_by_id(
     id: str, form_data: ChatFolderIdForm, user=Depends(get_verified_user)
 ):
-    chat = Chats.get_chat_by_id_and_user_id(id, user.id)
+    chat = await Chats.get_chat_by_id_and_user_id_async(id, user.id)
     if chat:
         chat = Chats.update_chat_folder_id_by_id_and_user_id(
             id, user.id, form_data.folder_id
@@ -800,7 +822,7 @@ async def update_chat_folder_id_by_id(
 
 @router.get("/{id}/tags", response_model=list[TagModel])
 async def get_chat_tags_by_id(id: str, user=Depends(get_verified_user)):
-    chat = Chats.get_chat_by_id_and_user_id(id, user.id)
+    chat = await Chats.get_chat_by_id_and_user_id_async(id, user.id)
     if chat:
         tags = chat.meta.get("tags", [])
         return Tags.get_tags_by_ids_and_user_id(tags, user.id)
@@ -819,7 +841,7 @@ async def get_chat_tags_by_id(id: str, user=Depends(get_verified_user)):
 async def add_tag_by_id_and_tag_name(
     id: str, form_data: TagForm, user=Depends(get_verified_user)
 ):
-    chat = Chats.get_chat_by_id_and_user_id(id, user.id)
+    chat = await Chats.get_chat_by_id_and_user_id_async(id, user.id)
     if chat:
         tags = chat.meta.get("tags", [])
         tag_id = form_data.name.replace(" ", "_").lower()
@@ -835,7 +857,7 @@ async def add_tag_by_id_and_tag_name(
                 id, user.id, form_data.name
             )
 
-        chat = Chats.get_chat_by_id_and_user_id(id, user.id)
+        chat = await Chats.get_chat_by_id_and_user_id_async(id, user.id)
         tags = chat.meta.get("tags", [])
         return Tags.get_tags_by_ids_and_user_id(tags, user.id)
     else:
@@ -853,14 +875,14 @@ async def add_tag_by_id_and_tag_name(
 async def delete_tag_by_id_and_tag_name(
     id: str, form_data: TagForm, user=Depends(get_verified_user)
 ):
-    chat = Chats.get_chat_by_id_and_user_id(id, user.id)
+    chat = await Chats.get_chat_by_id_and_user_id_async(id, user.id)
     if chat:
         Chats.delete_tag_by_id_and_user_id_and_tag_name(id, user.id, form_data.name)
 
         if Chats.count_chats_by_tag_name_and_user_id(form_data.name, user.id) == 0:
             Tags.delete_tag_by_name_and_user_id(form_data.name, user.id)
 
-        chat = Chats.get_chat_by_id_and_user_id(id, user.id)
+        chat = await Chats.get_chat_by_id_and_user_id_async(id, user.id)
         tags = chat.meta.get("tags", [])
         return Tags.get_tags_by_ids_and_user_id(tags, user.id)
     else:
@@ -876,7 +898,7 @@ async def delete_tag_by_id_and_tag_name(
 
 @router.delete("/{id}/tags/all", response_model=Optional[bool])
 async def delete_all_tags_by_id(id: str, user=Depends(get_verified_user)):
-    chat = Chats.get_chat_by_id_and_user_id(id, user.id)
+    chat = await Chats.get_chat_by_id_and_user_id_async(id, user.id)
     if chat:
         Chats.delete_all_tags_by_id_and_user_id(id, user.id)
 
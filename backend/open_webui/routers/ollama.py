@@ -1,20 +1,14 @@
-# TODO: Implement a more intelligent load balancing mechanism for distributing requests among multiple backend instances.
-# Current implementation uses a simple round-robin approach (random.choice). Consider incorporating algorithms like weighted round-robin,
-# least connections, or least response time for better resource utilization and performance optimization.
-
 import asyncio
 import json
 import logging
 import os
-import random
 import re
 import time
 from datetime import datetime
 
-from typing import Optional, Union
+from typing import Callable, Optional, Union
 from urllib.parse import urlparse
 import aiohttp
-from aiocache import cached
 import requests
 from urllib.parse import quote
 
@@ -37,7 +31,6 @@ from fastapi import (
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, ConfigDict, validator
-from starlette.background import BackgroundTask
 
 
 from open_webui.models.models import Models
@@ -51,6 +44,9 @@ from open_webui.utils.payload import (
 )
 from open_webui.utils.auth import get_admin_user, get_verified_user
 from open_webui.utils.access_control import has_access
+from open_webui.utils.model_registry import MODEL_REGISTRY
+from open_webui.utils.scheduler import SCHEDULER, ReleasingStream
+from open_webui.utils.session_pool import CLIENT_SESSION_POOL
 
 
 from open_webui.config import (
@@ -81,40 +77,68 @@ log.setLevel(SRC_LOG_LEVELS["OLLAMA"])
 async def send_get_request(url, key=None, user: UserModel = None):
     timeout = aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST)
     try:
-        async with aiohttp.ClientSession(timeout=timeout, trust_env=True) as session:
-            async with session.get(
-                url,
-                headers={
-                    "Content-Type": "application/json",
-                    **({"Authorization": f"Bearer {key}"} if key else {}),
-                    **(
-                        {
-                            "X-OpenWebUI-User-Name": quote(user.name, safe=" "),
-                            "X-OpenWebUI-User-Id": user.id,
-                            "X-OpenWebUI-User-Email": user.email,
-                            "X-OpenWebUI-User-Role": user.role,
-                        }
-                        if ENABLE_FORWARD_USER_INFO_HEADERS and user
-                        else {}
-                    ),
-                },
-                ssl=AIOHTTP_CLIENT_SESSION_SSL,
-            ) as response:
-                return await response.json()
+        session = CLIENT_SESSION_POOL.get_session(url)
+        async with session.get(
+            url,
+            headers={
+                "Content-Type": "application/json",
+                **({"Authorization": f"Bearer {key}"} if key else {}),
+                **(
+                    {
+                        "X-OpenWebUI-User-Name": quote(user.name, safe=" "),
+                        "X-OpenWebUI-User-Id": user.id,
+                        "X-OpenWebUI-User-Email": user.email,
+                        "X-OpenWebUI-User-Role": user.role,
+                    }
+                    if ENABLE_FORWARD_USER_INFO_HEADERS and user
+                    else {}
+                ),
+            },
+            ssl=AIOHTTP_CLIENT_SESSION_SSL,
+            timeout=timeout,
+        ) as response:
+            return await response.json()
     except Exception as e:
         # Handle connection error here
         log.error(f"Connection error: {e}")
         return None
 
 
-async def cleanup_response(
+async def send_cached_get_request(
+    url,
+    key=None,
+    user: UserModel = None,
+    ttl: Optional[int] = MODELS_CACHE_TTL,
+    refresh: bool = False,
+):
+    # Served from the model registry, which revalidates in the background
+    return await MODEL_REGISTRY.get(
+        MODEL_REGISTRY.get_key(
+            url, key, user.id if ENABLE_FORWARD_USER_INFO_HEADERS and user else None
+        ),
+        lambda: send_get_request(url, key, user=user),
+        ttl=ttl,
+        refresh=refresh,
+    )
+
+
+def release_response(
     response: Optional[aiohttp.ClientResponse],
-    session: Optional[aiohttp.ClientSession],
+    release: Optional[Callable[[], None]] = None,
 ):
+    # Sessions are shared, only hand the connection back to the pool
     if response:
-        response.close()
-    if session:
-        await session.close()
+        response.release()
+    # and the scheduler slot of the request, if any
+    if release:
+        release()
+
+
+async def cleanup_response(
+    response: Optional[aiohttp.ClientResponse],
+    release: Optional[Callable[[], None]] = None,
+):
+    release_response(response, release)
 
 
 async def send_post_request(
@@ -125,14 +149,13 @@ async def send_post_request(
     content_type: Optional[str] = None,
     user: UserModel = None,
     metadata: Optional[dict] = None,
+    release: Optional[Callable[[], None]] = None,
 ):
 
     r = None
+    streaming = False
     try:
-        session = aiohttp.ClientSession(
-            trust_env=True, timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT)
-        )
-
+        session = CLIENT_SESSION_POOL.get_session(url)
         r = await session.post(
             url,
             data=payload,
@@ -156,12 +179,13 @@ async def send_post_request(
                 ),
             },
             ssl=AIOHTTP_CLIENT_SESSION_SSL,
+            timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT),
         )
 
         if r.ok is False:
             try:
                 res = await r.json()
-                await cleanup_response(r, session)
+                await cleanup_response(r)
                 if "error" in res:
                     raise HTTPException(status_code=r.status, detail=res["error"])
             except HTTPException as e:
@@ -180,13 +204,13 @@ async def send_post_request(
             if content_type:
                 response_headers["Content-Type"] = content_type
 
+            streaming = True
+            # The slot is released with the stream however it ends, the
+            # background task is skipped when the client disconnects
             return StreamingResponse(
-                r.content,
+                ReleasingStream(r.content, lambda: release_response(r, release)),
                 status_code=r.status,
                 headers=response_headers,
-                background=BackgroundTask(
-                    cleanup_response, response=r, session=session
-                ),
             )
         else:
             res = await r.json()
@@ -202,8 +226,8 @@ async def send_post_request(
             detail=detail if e else "Open WebUI: Server Connection Error",
         )
     finally:
-        if not stream:
-            await cleanup_response(r, session)
+        if not streaming:
+            await cleanup_response(r, release)
 
 
 def get_api_key(idx, url, configs):
@@ -214,6 +238,12 @@ def get_api_key(idx, url, configs):
     )  # Legacy support
 
 
+def get_least_loaded_url_idx(request: Request, url_idxs: list[int]) -> int:
+    # The connection with the fewest in-flight and queued requests
+    urls = [request.app.state.config.OLLAMA_BASE_URLS[idx] for idx in url_idxs]
+    return url_idxs[urls.index(SCHEDULER.select(urls))]
+
+
 ##########################################
 #
 # API routes
@@ -339,35 +369,43 @@ def merge_ollama_models_lists(model_lists):
     return list(merged_models.values())
 
 
-@cached(ttl=MODELS_CACHE_TTL)
-async def get_all_models(request: Request, user: UserModel = None):
+async def get_all_models(
+    request: Request, user: UserModel = None, refresh: bool = False
+):
     log.info("get_all_models()")
     if request.app.state.config.ENABLE_OLLAMA_API:
         request_tasks = []
+        loaded_tasks = []
         for idx, url in enumerate(request.app.state.config.OLLAMA_BASE_URLS):
-            if (str(idx) not in request.app.state.config.OLLAMA_API_CONFIGS) and (
-                url not in request.app.state.config.OLLAMA_API_CONFIGS  # Legacy support
-            ):
-                request_tasks.append(send_get_request(f"{url}/api/tags", user=user))
-            else:
-                api_config = request.app.state.config.OLLAMA_API_CONFIGS.get(
-                    str(idx),
-                    request.app.state.config.OLLAMA_API_CONFIGS.get(
-                        url, {}
-                    ),  # Legacy support
-                )
+            api_config = request.app.state.config.OLLAMA_API_CONFIGS.get(
+                str(idx),
+                request.app.state.config.OLLAMA_API_CONFIGS.get(
+                    url, {}
+                ),  # Legacy support
+            )
 
-                enable = api_config.get("enable", True)
-                key = api_config.get("key", None)
+            enable = api_config.get("enable", True)
+            key = api_config.get("key", None)
+            ttl = api_config.get("models_cache_ttl", MODELS_CACHE_TTL)
 
-                if enable:
-                    request_tasks.append(
-                        send_get_request(f"{url}/api/tags", key, user=user)
+            if enable:
+                request_tasks.append(
+                    send_cached_get_request(
+                        f"{url}/api/tags", key, user=user, ttl=ttl, refresh=refresh
                     )
-                else:
-                    request_tasks.append(asyncio.ensure_future(asyncio.sleep(0, None)))
+                )
+                loaded_tasks.append(
+                    send_cached_get_request(
+                        f"{url}/api/ps", key, user=user, ttl=ttl, refresh=refresh
+                    )
+                )
+            else:
+                request_tasks.append(asyncio.ensure_future(asyncio.sleep(0, None)))
+                loaded_tasks.append(asyncio.ensure_future(asyncio.sleep(0, None)))
 
-        responses = await asyncio.gather(*request_tasks)
+        responses, loaded_responses = await asyncio.gather(
+            asyncio.gather(*request_tasks), asyncio.gather(*loaded_tasks)
+        )
 
         for idx, response in enumerate(responses):
             if response:
@@ -413,12 +451,23 @@ async def get_all_models(request: Request, user: UserModel = None):
         }
 
         try:
-            loaded_models = await get_ollama_loaded_models(request, user=user)
-            expires_map = {
-                m["model"]: m["expires_at"]
-                for m in loaded_models["models"]
-                if "expires_at" in m
-            }
+            expires_map = {}
+            for idx, response in enumerate(loaded_responses):
+                if response:
+                    url = request.app.state.config.OLLAMA_BASE_URLS[idx]
+                    prefix_id = request.app.state.config.OLLAMA_API_CONFIGS.get(
+                        str(idx),
+                        request.app.state.config.OLLAMA_API_CONFIGS.get(
+                            url, {}
+                        ),  # Legacy support
+                    ).get("prefix_id", None)
+
+                    for m in response.get("models", []):
+                        if "expires_at" in m:
+                            model_id = (
+                                f"{prefix_id}.{m['model']}" if prefix_id else m["model"]
+                            )
+                            expires_map[model_id] = m["expires_at"]
 
             for m in models["models"]:
                 if m["model"] in expires_map:
@@ -439,9 +488,11 @@ async def get_all_models(request: Request, user: UserModel = None):
 
 async def get_filtered_models(models, user):
     # Filter models based on user access control
+    model_snapshot = Models.get_model_snapshot()
+
     filtered_models = []
     for model in models.get("models", []):
-        model_info = Models.get_model_by_id(model["model"])
+        model_info = model_snapshot.get(model["model"])
         if model_info:
             if user.id == model_info.user_id or has_access(
                 user.id, type="read", access_control=model_info.access_control
@@ -963,7 +1014,7 @@ async def show_model_info(
             detail=ERROR_MESSAGES.MODEL_NOT_FOUND(model),
         )
 
-    url_idx = random.choice(models[model]["urls"])
+    url_idx = get_least_loaded_url_idx(request, models[model]["urls"])
 
     url = request.app.state.config.OLLAMA_BASE_URLS[url_idx]
     key = get_api_key(url_idx, url, request.app.state.config.OLLAMA_API_CONFIGS)
@@ -1037,7 +1088,7 @@ async def embed(
             model = f"{model}:latest"
 
         if model in models:
-            url_idx = random.choice(models[model]["urls"])
+            url_idx = get_least_loaded_url_idx(request, models[model]["urls"])
         else:
             raise HTTPException(
                 status_code=400,
@@ -1124,7 +1175,7 @@ async def embeddings(
             model = f"{model}:latest"
 
         if model in models:
-            url_idx = random.choice(models[model]["urls"])
+            url_idx = get_least_loaded_url_idx(request, models[model]["urls"])
         else:
             raise HTTPException(
                 status_code=400,
@@ -1217,7 +1268,7 @@ async def generate_completion(
             model = f"{model}:latest"
 
         if model in models:
-            url_idx = random.choice(models[model]["urls"])
+            url_idx = get_least_loaded_url_idx(request, models[model]["urls"])
         else:
             raise HTTPException(
                 status_code=400,
@@ -1234,11 +1285,15 @@ async def generate_completion(
     if prefix_id:
         form_data.model = form_data.model.replace(f"{prefix_id}.", "")
 
+    release = await SCHEDULER.acquire(
+        url, user.id, limit=api_config.get("max_concurrent_requests")
+    )
     return await send_post_request(
         url=f"{url}/api/generate",
         payload=form_data.model_dump_json(exclude_none=True).encode(),
         key=get_api_key(url_idx, url, request.app.state.config.OLLAMA_API_CONFIGS),
         user=user,
+        release=release,
     )
 
 
@@ -1284,7 +1339,7 @@ async def get_ollama_url(request: Request, model: str, url_idx: Optional[int] =
                 status_code=400,
                 detail=ERROR_MESSAGES.MODEL_NOT_FOUND(model),
             )
-        url_idx = random.choice(models[model].get("urls", []))
+        url_idx = get_least_loaded_url_idx(request, models[model].get("urls", []))
     url = request.app.state.config.OLLAMA_BASE_URLS[url_idx]
     return url, url_idx
 
@@ -1364,6 +1419,9 @@ async def generate_chat_completion(
     if prefix_id:
         payload["model"] = payload["model"].replace(f"{prefix_id}.", "")
 
+    release = await SCHEDULER.acquire(
+        url, user.id, limit=api_config.get("max_concurrent_requests")
+    )
     return await send_post_request(
         url=f"{url}/api/chat",
         payload=json.dumps(payload),
@@ -1372,6 +1430,7 @@ async def generate_chat_completion(
         content_type="application/x-ndjson",
         user=user,
         metadata=metadata,
+        release=release,
     )
 
 
@@ -1471,6 +1530,9 @@ async def generate_openai_completion(
     if prefix_id:
         payload["model"] = payload["model"].replace(f"{prefix_id}.", "")
 
+    release = await SCHEDULER.acquire(
+        url, user.id, limit=api_config.get("max_concurrent_requests")
+    )
     return await send_post_request(
         url=f"{url}/v1/completions",
         payload=json.dumps(payload),
@@ -1478,6 +1540,7 @@ async def generate_openai_completion(
         key=get_api_key(url_idx, url, request.app.state.config.OLLAMA_API_CONFIGS),
         user=user,
         metadata=metadata,
+        release=release,
     )
 
 
@@ -1553,6 +1616,9 @@ async def generate_openai_chat_completion(
     if prefix_id:
         payload["model"] = payload["model"].replace(f"{prefix_id}.", "")
 
+    release = await SCHEDULER.acquire(
+        url, user.id, limit=api_config.get("max_concurrent_requests")
+    )
     return await send_post_request(
         url=f"{url}/v1/chat/completions",
         payload=json.dumps(payload),
@@ -1560,6 +1626,7 @@ async def generate_openai_chat_completion(
         key=get_api_key(url_idx, url, request.app.state.config.OLLAMA_API_CONFIGS),
         user=user,
         metadata=metadata,
+        release=release,
     )
 
 
@@ -6,9 +6,11 @@ import shutil
 import asyncio
 
 import uuid
+from collections import deque
+from concurrent.futures import wait
 from datetime import datetime
 from pathlib import Path
-from typing import Iterator, List, Optional, Sequence, Union
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence, Union
 
 from fastapi import (
     Depends,
@@ -37,6 +39,8 @@ from open_webui.storage.provider import Storage
 
 
 from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
+from open_webui.retrieval.vector.main import submit_to_vector_db_executor
+from open_webui.socket.main import get_file_event_emitter
 
 # Document loaders
 from open_webui.retrieval.loaders.main import Loader
@@ -68,11 +72,12 @@ from open_webui.retrieval.web.firecrawl import search_firecrawl
 from open_webui.retrieval.web.external import search_external
 
 from open_webui.retrieval.utils import (
+    get_bm25_collection_result,
     get_embedding_function,
     get_reranking_function,
     get_model_path,
-    query_collection,
-    query_collection_with_hybrid_search,
+    query_collection_async,
+    query_collection_with_hybrid_search_async,
     query_doc,
     query_doc_with_hybrid_search,
 )
@@ -91,6 +96,9 @@ from open_webui.config import (
     DEFAULT_LOCALE,
     RAG_EMBEDDING_CONTENT_PREFIX,
     RAG_EMBEDDING_QUERY_PREFIX,
+    RAG_EMBEDDING_DIMENSIONS,
+    RAG_INGESTION_BATCH_SIZE,
+    RAG_INGESTION_MAX_PENDING_BATCHES,
 )
 from open_webui.env import (
     SRC_LOG_LEVELS,
@@ -1153,6 +1161,88 @@ async def update_rag_config(
 ####################################
 
 
+def split_docs(request: Request, docs: Iterable[Document]) -> Iterator[Document]:
+    """
+    Lazily split `docs` with the configured text splitter. Documents are split
+    one at a time so a long document never has all of its chunks in memory.
+    """
+    if request.app.state.config.TEXT_SPLITTER in ["", "character"]:
+        text_splitter = RecursiveCharacterTextSplitter(
+            chunk_size=request.app.state.config.CHUNK_SIZE,
+            chunk_overlap=request.app.state.config.CHUNK_OVERLAP,
+            add_start_index=True,
+        )
+        for doc in docs:
+            yield from text_splitter.split_documents([doc])
+    elif request.app.state.config.TEXT_SPLITTER == "token":
+        log.info(
+            f"Using token text splitter: {request.app.state.config.TIKTOKEN_ENCODING_NAME}"
+        )
+
+        tiktoken.get_encoding(str(request.app.state.config.TIKTOKEN_ENCODING_NAME))
+        text_splitter = TokenTextSplitter(
+            encoding_name=str(request.app.state.config.TIKTOKEN_ENCODING_NAME),
+            chunk_size=request.app.state.config.CHUNK_SIZE,
+            chunk_overlap=request.app.state.config.CHUNK_OVERLAP,
+            add_start_index=True,
+        )
+        for doc in docs:
+            yield from text_splitter.split_documents([doc])
+    elif request.app.state.config.TEXT_SPLITTER == "markdown_header":
+        log.info("Using markdown header text splitter")
+
+        # Define headers to split on - covering most common markdown header levels
+        headers_to_split_on = [
+            ("#", "Header 1"),
+            ("##", "Header 2"),
+            ("###", "Header 3"),
+            ("####", "Header 4"),
+            ("#####", "Header 5"),
+            ("######", "Header 6"),
+        ]
+
+        markdown_splitter = MarkdownHeaderTextSplitter(
+            headers_to_split_on=headers_to_split_on,
+            strip_headers=False,  # Keep headers in content for context
+        )
+        text_splitter = RecursiveCharacterTextSplitter(
+            chunk_size=request.app.state.config.CHUNK_SIZE,
+            chunk_overlap=request.app.state.config.CHUNK_OVERLAP,
+            add_start_index=True,
+        )
+
+        for doc in docs:
+            md_header_splits = markdown_splitter.split_text(doc.page_content)
+            md_header_splits = text_splitter.split_documents(md_header_splits)
+
+            # Convert back to Document objects, preserving original metadata
+            for split_chunk in md_header_splits:
+                headings_list = []
+                # Extract header values in order based on headers_to_split_on
+                for _, header_meta_key_name in headers_to_split_on:
+                    if header_meta_key_name in split_chunk.metadata:
+                        headings_list.append(split_chunk.metadata[header_meta_key_name])
+
+                yield Document(
+                    page_content=split_chunk.page_content,
+                    metadata={**doc.metadata, "headings": headings_list},
+                )
+    else:
+        raise ValueError(ERROR_MESSAGES.DEFAULT("Invalid text splitter"))
+
+
+def batch_docs(docs: Iterable[Document], size: int) -> Iterator[list[Document]]:
+    batch = []
+    for doc in docs:
+        batch.append(doc)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+
+    if batch:
+        yield batch
+
+
 def save_docs_to_vector_db(
     request: Request,
     docs,
@@ -1162,6 +1252,7 @@ def save_docs_to_vector_db(
     split: bool = True,
     add: bool = False,
     user=None,
+    progress: Optional[Callable] = None,
 ) -> bool:
     def _get_docs_info(docs: list[Document]) -> str:
         docs_info = set()
@@ -1196,94 +1287,29 @@ def save_docs_to_vector_db(
                 log.info(f"Document with hash {metadata['hash']} already exists")
                 raise ValueError(ERROR_MESSAGES.DUPLICATE_CONTENT)
 
-    if split:
-        if request.app.state.config.TEXT_SPLITTER in ["", "character"]:
-            text_splitter = RecursiveCharacterTextSplitter(
-                chunk_size=request.app.state.config.CHUNK_SIZE,
-                chunk_overlap=request.app.state.config.CHUNK_OVERLAP,
-                add_start_index=True,
-            )
-            docs = text_splitter.split_documents(docs)
-        elif request.app.state.config.TEXT_SPLITTER == "token":
-            log.info(
-                f"Using token text splitter: {request.app.state.config.TIKTOKEN_ENCODING_NAME}"
-            )
-
-            tiktoken.get_encoding(str(request.app.state.config.TIKTOKEN_ENCODING_NAME))
-            text_splitter = TokenTextSplitter(
-                encoding_name=str(request.app.state.config.TIKTOKEN_ENCODING_NAME),
-                chunk_size=request.app.state.config.CHUNK_SIZE,
-                chunk_overlap=request.app.state.config.CHUNK_OVERLAP,
-                add_start_index=True,
-            )
-            docs = text_splitter.split_documents(docs)
-        elif request.app.state.config.TEXT_SPLITTER == "markdown_header":
-            log.info("Using markdown header text splitter")
-
-            # Define headers to split on - covering most common markdown header levels
-            headers_to_split_on = [
-                ("#", "Header 1"),
-                ("##", "Header 2"),
-                ("###", "Header 3"),
-                ("####", "Header 4"),
-                ("#####", "Header 5"),
-                ("######", "Header 6"),
-            ]
-
-            markdown_splitter = MarkdownHeaderTextSplitter(
-                headers_to_split_on=headers_to_split_on,
-                strip_headers=False,  # Keep headers in content for context
-            )
-
-            md_split_docs = []
-            for doc in docs:
-                md_header_splits = markdown_splitter.split_text(doc.page_content)
-                text_splitter = RecursiveCharacterTextSplitter(
-                    chunk_size=request.app.state.config.CHUNK_SIZE,
-                    chunk_overlap=request.app.state.config.CHUNK_OVERLAP,
-                    add_start_index=True,
-                )
-                md_header_splits = text_splitter.split_documents(md_header_splits)
-
-                # Convert back to Document objects, preserving original metadata
-                for split_chunk in md_header_splits:
-                    headings_list = []
-                    # Extract header values in order based on headers_to_split_on
-                    for _, header_meta_key_name in headers_to_split_on:
-                        if header_meta_key_name in split_chunk.metadata:
-                            headings_list.append(
-                                split_chunk.metadata[header_meta_key_name]
-                            )
-
-                    md_split_docs.append(
-                        Document(
-                            page_content=split_chunk.page_content,
-                            metadata={**doc.metadata, "headings": headings_list},
-                        )
-                    )
-
-            docs = md_split_docs
-        else:
-            raise ValueError(ERROR_MESSAGES.DEFAULT("Invalid text splitter"))
+    # Chunks flow through split -> embed -> insert one batch at a time; the
+    # embedder keeps working while up to RAG_INGESTION_MAX_PENDING_BATCHES
+    # batches are being inserted on the vector DB executor
+    batches = batch_docs(
+        split_docs(request, docs) if split else docs,
+        max(RAG_INGESTION_BATCH_SIZE, 1),
+    )
 
-    if len(docs) == 0:
+    # Fail on empty content before touching the collection
+    first_batch = next(batches, None)
+    if not first_batch:
         raise ValueError(ERROR_MESSAGES.EMPTY_CONTENT)
 
-    texts = [doc.page_content for doc in docs]
-    metadatas = [
-        {
-            **doc.metadata,
-            **(metadata if metadata else {}),
-            "embedding_config": {
-                "engine": request.app.state.config.RAG_EMBEDDING_ENGINE,
-                "model": request.app.state.config.RAG_EMBEDDING_MODEL,
-            },
-        }
-        for doc in docs
-    ]
+    pending = deque()
+
+    # Ids of every chunk handed to the vector DB, and whether this call owns
+    # the collection, so a failed ingestion can be rolled back
+    written_ids = []
+    created = False
 
     try:
-        if VECTOR_DB_CLIENT.has_collection(collection_name=collection_name):
+        exists = VECTOR_DB_CLIENT.has_collection(collection_name=collection_name)
+        if exists:
             log.info(f"collection {collection_name} already exists")
 
             if overwrite:
@@ -1295,6 +1321,8 @@ def save_docs_to_vector_db(
                 )
                 return True
 
+        created = not exists or overwrite
+
         log.info(f"adding to collection {collection_name}")
         embedding_function = get_embedding_function(
             request.app.state.config.RAG_EMBEDDING_ENGINE,
@@ -1326,31 +1354,105 @@ def save_docs_to_vector_db(
             ),
         )
 
-        embeddings = embedding_function(
-            list(map(lambda x: x.replace("\n", " "), texts)),
-            prefix=RAG_EMBEDDING_CONTENT_PREFIX,
-            user=user,
-        )
+        def embed_batch(batch: list[Document]) -> list[dict]:
+            texts = [doc.page_content for doc in batch]
+            embeddings = embedding_function(
+                list(map(lambda x: x.replace("\n", " "), texts)),
+                prefix=RAG_EMBEDDING_CONTENT_PREFIX,
+                user=user,
+            )
 
-        items = [
-            {
-                "id": str(uuid.uuid4()),
-                "text": text,
-                "vector": embeddings[idx],
-                "metadata": metadatas[idx],
-            }
-            for idx, text in enumerate(texts)
-        ]
+            return [
+                {
+                    "id": str(uuid.uuid4()),
+                    "text": doc.page_content,
+                    "vector": embeddings[idx],
+                    "metadata": {
+                        **doc.metadata,
+                        **(metadata if metadata else {}),
+                        # Lets query results be deduplicated without rehashing the text
+                        "chunk_hash": calculate_sha256_string(doc.page_content),
+                        "embedding_config": {
+                            "engine": request.app.state.config.RAG_EMBEDDING_ENGINE,
+                            "model": request.app.state.config.RAG_EMBEDDING_MODEL,
+                            **(
+                                {"dimensions": RAG_EMBEDDING_DIMENSIONS}
+                                if RAG_EMBEDDING_DIMENSIONS > 0
+                                else {}
+                            ),
+                        },
+                    },
+                }
+                for idx, doc in enumerate(batch)
+            ]
 
-        VECTOR_DB_CLIENT.insert(
-            collection_name=collection_name,
-            items=items,
-        )
+        def insert_batch(items: list[dict]) -> int:
+            written_ids.extend(item["id"] for item in items)
+            VECTOR_DB_CLIENT.insert(
+                collection_name=collection_name,
+                items=items,
+            )
+            return len(items)
+
+        embedded = 0
+        inserted = 0
+
+        def report_progress(force: bool = False):
+            if progress:
+                progress(
+                    {"stage": "embedding", "embedded": embedded, "inserted": inserted},
+                    force=force,
+                )
+
+        # The first batch is inserted inline so that backends creating the
+        # collection on first insert never race against themselves
+        items = embed_batch(first_batch)
+        embedded += len(items)
+        inserted += insert_batch(items)
+        report_progress()
 
+        for batch in batches:
+            items = embed_batch(batch)
+            embedded += len(items)
+
+            while len(pending) >= max(RAG_INGESTION_MAX_PENDING_BATCHES, 1):
+                inserted += pending.popleft().result()
+
+            pending.append(submit_to_vector_db_executor(insert_batch, items))
+            report_progress()
+
+        while pending:
+            inserted += pending.popleft().result()
+
+        report_progress(force=True)
         return True
     except Exception as e:
         log.exception(e)
+
+        # Batches already running cannot be cancelled, wait for them so
+        # nothing is written after the rollback
+        for future in pending:
+            future.cancel()
+        wait(pending)
+
+        # A partially indexed document would pass for a complete one on retry
+        # (or be rejected as duplicate content), so remove what was written
+        if written_ids:
+            try:
+                if created:
+                    VECTOR_DB_CLIENT.delete_collection(collection_name=collection_name)
+                else:
+                    VECTOR_DB_CLIENT.delete(
+                        collection_name=collection_name, ids=written_ids
+                    )
+            except Exception as cleanup_error:
+                log.error(
+                    f"Error removing partially inserted chunks from {collection_name}: {cleanup_error}"
+                )
         raise e
+    finally:
+        for future in pending:
+            future.cancel()
 
 
 class ProcessFileForm(BaseModel):
@@ -1365,6 +1467,8 @@ def process_file(
     form_data: ProcessFileForm,
     user=Depends(get_verified_user),
 ):
+    emit_progress = get_file_event_emitter(user.id, form_data.file_id) if user else None
+
     try:
         file = Files.get_file_by_id(form_data.file_id)
 
@@ -1465,23 +1569,28 @@ def process_file(
                     DOCUMENT_INTELLIGENCE_KEY=request.app.state.config.DOCUMENT_INTELLIGENCE_KEY,
                     MISTRAL_OCR_API_KEY=request.app.state.config.MISTRAL_OCR_API_KEY,
                 )
-                docs = loader.load(
-                    file.filename, file.meta.get("content_type"), file_path
-                )
 
-                docs = [
-                    Document(
-                        page_content=doc.page_content,
-                        metadata={
-                            **doc.metadata,
-                            "name": file.filename,
-                            "created_by": file.user_id,
-                            "file_id": file.id,
-                            "source": file.filename,
-                        },
+                # Pages are pulled one by one so progress is visible while a
+                # large document is still being extracted
+                docs = []
+                for doc in loader.lazy_load(
+                    file.filename, file.meta.get("content_type"), file_path
+                ):
+                    docs.append(
+                        Document(
+                            page_content=doc.page_content,
+                            metadata={
+                                **doc.metadata,
+                                "name": file.filename,
+                                "created_by": file.user_id,
+                                "file_id": file.id,
+                                "source": file.filename,
+                            },
+                        )
                     )
-                    for doc in docs
-                ]
+
+                    if emit_progress:
+                        emit_progress({"stage": "loading", "pages": len(docs)})
             else:
                 docs = [
                     Document(
@@ -1519,6 +1628,7 @@ def process_file(
                     },
                     add=(True if form_data.collection_name else False),
                     user=user,
+                    progress=emit_progress,
                 )
 
                 if result:
@@ -1529,6 +1639,9 @@ def process_file(
                         },
                     )
 
+                    if emit_progress:
+                        emit_progress({"stage": "completed"}, force=True)
+
                     return {
                         "status": True,
                         "collection_name": collection_name,
@@ -1538,6 +1651,9 @@ def process_file(
             except Exception as e:
                 raise e
         else:
+            if emit_progress:
+                emit_progress({"stage": "completed"}, force=True)
+
             return {
                 "status": True,
                 "collection_name": None,
@@ -1547,6 +1663,9 @@ def process_file(
 
     except Exception as e:
         log.exception(e)
+        if emit_progress:
+            emit_progress({"stage": "failed", "error": str(e)}, force=True)
+
         if "No pandoc was found" in str(e):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -2077,7 +2196,7 @@ def query_doc_handler(
     try:
         if request.app.state.config.ENABLE_RAG_HYBRID_SEARCH:
             collection_results = {}
-            collection_results[form_data.collection_name] = VECTOR_DB_CLIENT.get(
+            collection_results[form_data.collection_name] = get_bm25_collection_result(
                 collection_name=form_data.collection_name
             )
             return query_doc_with_hybrid_search(
@@ -2139,14 +2258,14 @@ class QueryCollectionsForm(BaseModel):
 
 
 @router.post("/query/collection")
-def query_collection_handler(
+async def query_collection_handler(
     request: Request,
     form_data: QueryCollectionsForm,
     user=Depends(get_verified_user),
 ):
     try:
         if request.app.state.config.ENABLE_RAG_HYBRID_SEARCH:
-            return query_collection_with_hybrid_search(
+            return await query_collection_with_hybrid_search_async(
                 collection_names=form_data.collection_names,
                 queries=[form_data.query],
                 embedding_function=lambda query, prefix: request.app.state.EMBEDDING_FUNCTION(
@@ -2176,7 +2295,7 @@ def query_collection_handler(
                 ),
             )
         else:
-            return query_collection(
+            return await query_collection_async(
                 collection_names=form_data.collection_names,
                 queries=[form_data.query],
                 embedding_function=lambda query, prefix: request.app.state.EMBEDDING_FUNCTION(
@@ -2214,7 +2333,7 @@ def delete_entries_from_collection(form_data: DeleteForm, user=Depends(get_admin
 
             VECTOR_DB_CLIENT.delete(
                 collection_name=form_data.collection_name,
-                metadata={"hash": hash},
+                filter={"hash": hash},
             )
             return {"status": True}
         else:
@@ -2230,6 +2349,27 @@ def reset_vector_db(user=Depends(get_admin_user)):
     Knowledges.delete_all_knowledge()
 
 
+class ReindexForm(BaseModel):
+    collection_name: Optional[str] = None
+
+
+@router.post("/reindex/db")
+def reindex_vector_db(
+    form_data: Optional[ReindexForm] = None, user=Depends(get_admin_user)
+):
+    try:
+        VECTOR_DB_CLIENT.rebuild_index(
+            collection_name=form_data.collection_name if form_data else None
+        )
+        return {"status": True}
+    except Exception as e:
+        log.exception(e)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=ERROR_MESSAGES.DEFAULT(e),
+        )
+
+
 @router.post("/reset/uploads")
 def reset_upload_dir(user=Depends(get_admin_user)) -> bool:
     folder = f"{UPLOAD_DIR}"
@@ -1,10 +1,12 @@
 import asyncio
+import anyio
 import random
 
 import socketio
 import logging
 import sys
 import time
+from contextlib import asynccontextmanager
 from typing import Dict, Set
 from redis import asyncio as aioredis
 import pycrdt as Y
@@ -24,12 +26,22 @@ from open_webui.env import (
     WEBSOCKET_REDIS_URL,
     WEBSOCKET_REDIS_CLUSTER,
     WEBSOCKET_REDIS_LOCK_TIMEOUT,
+    WEBSOCKET_REDIS_POOL_CACHE_TTL,
     WEBSOCKET_SENTINEL_PORT,
     WEBSOCKET_SENTINEL_HOSTS,
     REDIS_KEY_PREFIX,
+    CHAT_EVENT_FLUSH_INTERVAL,
+    DATABASE_USER_ACTIVE_STATUS_FLUSH_INTERVAL,
 )
 from open_webui.utils.auth import decode_token
-from open_webui.socket.utils import RedisDict, RedisLock, YdocManager
+from open_webui.socket.utils import (
+    CachedRedisDict,
+    LocalSetDict,
+    RedisDict,
+    RedisLock,
+    RedisSetDict,
+    YdocManager,
+)
 from open_webui.tasks import create_task, stop_item_tasks
 from open_webui.utils.redis import get_redis_connection
 from open_webui.utils.access_control import has_access, get_users_with_access
@@ -94,17 +106,34 @@ if WEBSOCKET_MANAGER == "redis":
     redis_sentinels = get_sentinels_from_env(
         WEBSOCKET_SENTINEL_HOSTS, WEBSOCKET_SENTINEL_PORT
     )
-    SESSION_POOL = RedisDict(
+    SESSION_POOL = CachedRedisDict(
         f"{REDIS_KEY_PREFIX}:session_pool",
         redis_url=WEBSOCKET_REDIS_URL,
         redis_sentinels=redis_sentinels,
         redis_cluster=WEBSOCKET_REDIS_CLUSTER,
+        cache_ttl=WEBSOCKET_REDIS_POOL_CACHE_TTL,
+    )
+    # user id -> session ids, room -> session ids and session id -> rooms
+    USER_POOL = RedisSetDict(
+        f"{REDIS_KEY_PREFIX}:user_sessions",
+        redis_url=WEBSOCKET_REDIS_URL,
+        redis_sentinels=redis_sentinels,
+        redis_cluster=WEBSOCKET_REDIS_CLUSTER,
+        cache_ttl=WEBSOCKET_REDIS_POOL_CACHE_TTL,
     )
-    USER_POOL = RedisDict(
-        f"{REDIS_KEY_PREFIX}:user_pool",
+    ROOM_POOL = RedisSetDict(
+        f"{REDIS_KEY_PREFIX}:room_sessions",
         redis_url=WEBSOCKET_REDIS_URL,
         redis_sentinels=redis_sentinels,
         redis_cluster=WEBSOCKET_REDIS_CLUSTER,
+        cache_ttl=WEBSOCKET_REDIS_POOL_CACHE_TTL,
+    )
+    SESSION_ROOM_POOL = RedisSetDict(
+        f"{REDIS_KEY_PREFIX}:session_rooms",
+        redis_url=WEBSOCKET_REDIS_URL,
+        redis_sentinels=redis_sentinels,
+        redis_cluster=WEBSOCKET_REDIS_CLUSTER,
+        cache_ttl=WEBSOCKET_REDIS_POOL_CACHE_TTL,
     )
     USAGE_POOL = RedisDict(
         f"{REDIS_KEY_PREFIX}:usage_pool",
@@ -125,7 +154,9 @@ if WEBSOCKET_MANAGER == "redis":
     release_func = clean_up_lock.release_lock
 else:
     SESSION_POOL = {}
-    USER_POOL = {}
+    USER_POOL = LocalSetDict()
+    ROOM_POOL = LocalSetDict()
+    SESSION_ROOM_POOL = LocalSetDict()
     USAGE_POOL = {}
 
     aquire_func = release_func = renew_func = lambda: True
@@ -137,6 +168,76 @@ YDOC_MANAGER = YdocManager(
 )
 
 
+# Model usage reported by sessions since the last flush, model id -> sid -> timestamp
+PENDING_USAGE: dict[str, dict[str, int]] = {}
+
+# Seconds between flushes of pending model usage, well below TIMEOUT_DURATION
+USAGE_FLUSH_INTERVAL = 1
+
+
+def flush_model_usage(pending: dict[str, dict[str, int]]):
+    """Merge pending usage into the usage pool in one write."""
+    if not pending:
+        return
+
+    connections_by_model_id = {
+        model_id: {sid: {"updated_at": updated_at} for sid, updated_at in sids.items()}
+        for model_id, sids in pending.items()
+    }
+
+    if isinstance(USAGE_POOL, RedisDict):
+        # Merged inside Redis, so flushes of other workers are not overwritten
+        USAGE_POOL.merge(connections_by_model_id)
+    else:
+        for model_id, connections in connections_by_model_id.items():
+            USAGE_POOL[model_id] = {**USAGE_POOL.get(model_id, {}), **connections}
+
+
+def expire_model_usage(model_ids, cutoff: int):
+    """Drop the sids of `model_ids` last seen before `cutoff`, and unused models."""
+    if isinstance(USAGE_POOL, RedisDict):
+        # Re-checked inside Redis, so sids refreshed meanwhile are kept
+        USAGE_POOL.expire(model_ids, "updated_at", cutoff)
+        return
+
+    for model_id in model_ids:
+        connections = {
+            sid: details
+            for sid, details in USAGE_POOL.get(model_id, {}).items()
+            if details["updated_at"] >= cutoff
+        }
+        if connections:
+            USAGE_POOL[model_id] = connections
+        else:
+            USAGE_POOL.pop(model_id, None)
+
+
+async def periodic_activity_flush():
+    """
+    Write the activity collected in memory, model usage every
+    USAGE_FLUSH_INTERVAL seconds and last-active timestamps every
+    DATABASE_USER_ACTIVE_STATUS_FLUSH_INTERVAL seconds, off the event loop.
+    """
+    global PENDING_USAGE
+
+    last_active_flushed_at = time.monotonic()
+    while True:
+        await asyncio.sleep(USAGE_FLUSH_INTERVAL)
+
+        try:
+            pending, PENDING_USAGE = PENDING_USAGE, {}
+            await asyncio.to_thread(flush_model_usage, pending)
+
+            if (
+                time.monotonic() - last_active_flushed_at
+                >= DATABASE_USER_ACTIVE_STATUS_FLUSH_INTERVAL
+            ):
+                last_active_flushed_at = time.monotonic()
+                await asyncio.to_thread(Users.flush_user_last_active)
+        except Exception as e:
+            log.warning(f"Failed to flush activity: {e}")
+
+
 async def periodic_usage_pool_cleanup():
     max_retries = 2
     retry_delay = random.uniform(
@@ -164,26 +265,20 @@ async def periodic_usage_pool_cleanup():
                 log.error(f"Unable to renew cleanup lock. Exiting usage pool cleanup.")
                 raise Exception("Unable to renew usage pool cleanup lock.")
 
-            now = int(time.time())
-            send_usage = False
-            for model_id, connections in list(USAGE_POOL.items()):
-                # Creating a list of sids to remove if they have timed out
-                expired_sids = [
-                    sid
-                    for sid, details in connections.items()
-                    if now - details["updated_at"] > TIMEOUT_DURATION
-                ]
-
-                for sid in expired_sids:
-                    del connections[sid]
-
-                if not connections:
-                    log.debug(f"Cleaning up model {model_id} from usage pool")
-                    del USAGE_POOL[model_id]
-                else:
-                    USAGE_POOL[model_id] = connections
-
-                send_usage = True
+            cutoff = int(time.time()) - TIMEOUT_DURATION
+
+            # Read the whole pool once and only touch models with expired sids
+            expired_model_ids = [
+                model_id
+                for model_id, connections in list(USAGE_POOL.items())
+                if any(
+                    details["updated_at"] < cutoff for details in connections.values()
+                )
+            ]
+            if expired_model_ids:
+                log.debug(f"Cleaning up models {expired_model_ids} from usage pool")
+                expire_model_usage(expired_model_ids, cutoff)
+
             await asyncio.sleep(TIMEOUT_DURATION)
     finally:
         release_func()
@@ -219,23 +314,37 @@ def get_user_id_from_session_pool(sid):
 
 
 def get_session_ids_from_room(room):
-    """Get all session IDs from a specific room."""
-    active_session_ids = sio.manager.get_participants(
-        namespace="/",
-        room=room,
-    )
-    return [session_id[0] for session_id in active_session_ids]
+    """Get all session IDs from a specific room, across all workers."""
+    return ROOM_POOL.get(room, [])
 
 
 def get_user_ids_from_room(room):
     active_session_ids = get_session_ids_from_room(room)
 
     active_user_ids = list(
-        set([SESSION_POOL.get(session_id)["id"] for session_id in active_session_ids])
+        set(
+            [
+                session["id"]
+                for session in map(SESSION_POOL.get, active_session_ids)
+                if session
+            ]
+        )
     )
     return active_user_ids
 
 
+async def enter_room(sid, room):
+    await sio.enter_room(sid, room)
+    ROOM_POOL.add(room, sid)
+    SESSION_ROOM_POOL.add(sid, room)
+
+
+async def leave_room(sid, room):
+    await sio.leave_room(sid, room)
+    ROOM_POOL.remove(room, sid)
+    SESSION_ROOM_POOL.remove(sid, room)
+
+
 def get_active_status_by_user_id(user_id):
     if user_id in USER_POOL:
         return True
@@ -246,14 +355,10 @@ def get_active_status_by_user_id(user_id):
 async def usage(sid, data):
     if sid in SESSION_POOL:
         model_id = data["model"]
-        # Record the timestamp for the last update
-        current_time = int(time.time())
 
-        # Store the new usage data and task
-        USAGE_POOL[model_id] = {
-            **(USAGE_POOL[model_id] if model_id in USAGE_POOL else {}),
-            sid: {"updated_at": current_time},
-        }
+        # Record the timestamp for the last update, merged into the usage
+        # pool by the periodic activity flush
+        PENDING_USAGE.setdefault(model_id, {})[sid] = int(time.time())
 
 
 @sio.event
@@ -263,14 +368,11 @@ async def connect(sid, environ, auth):
         data = decode_token(auth["token"])
 
         if data is not None and "id" in data:
-            user = Users.get_user_by_id(data["id"])
+            user = await Users.get_user_by_id_async(data["id"])
 
         if user:
             SESSION_POOL[sid] = user.model_dump()
-            if user.id in USER_POOL:
-                USER_POOL[user.id] = USER_POOL[user.id] + [sid]
-            else:
-                USER_POOL[user.id] = [sid]
+            USER_POOL.add(user.id, sid)
 
 
 @sio.on("user-join")
@@ -284,21 +386,18 @@ async def user_join(sid, data):
     if data is None or "id" not in data:
         return
 
-    user = Users.get_user_by_id(data["id"])
+    user = await Users.get_user_by_id_async(data["id"])
     if not user:
         return
 
     SESSION_POOL[sid] = user.model_dump()
-    if user.id in USER_POOL:
-        USER_POOL[user.id] = USER_POOL[user.id] + [sid]
-    else:
-        USER_POOL[user.id] = [sid]
+    USER_POOL.add(user.id, sid)
 
     # Join all the channels
     channels = Channels.get_channels_by_user_id(user.id)
     log.debug(f"{channels=}")
     for channel in channels:
-        await sio.enter_room(sid, f"channel:{channel.id}")
+        await enter_room(sid, f"channel:{channel.id}")
     return {"id": user.id, "name": user.name}
 
 
@@ -312,7 +411,7 @@ async def join_channel(sid, data):
     if data is None or "id" not in data:
         return
 
-    user = Users.get_user_by_id(data["id"])
+    user = await Users.get_user_by_id_async(data["id"])
     if not user:
         return
 
@@ -320,7 +419,7 @@ async def join_channel(sid, data):
     channels = Channels.get_channels_by_user_id(user.id)
     log.debug(f"{channels=}")
     for channel in channels:
-        await sio.enter_room(sid, f"channel:{channel.id}")
+        await enter_room(sid, f"channel:{channel.id}")
 
 
 @sio.on("join-note")
@@ -333,7 +432,7 @@ async def join_note(sid, data):
     if token_data is None or "id" not in token_data:
         return
 
-    user = Users.get_user_by_id(token_data["id"])
+    user = await Users.get_user_by_id_async(token_data["id"])
     if not user:
         return
 
@@ -351,7 +450,7 @@ async def join_note(sid, data):
         return
 
     log.debug(f"Joining note {note.id} for user {user.id}")
-    await sio.enter_room(sid, f"note:{note.id}")
+    await enter_room(sid, f"note:{note.id}")
 
 
 @sio.on("channel-events")
@@ -417,7 +516,7 @@ async def ydoc_document_join(sid, data):
         await YDOC_MANAGER.add_user(document_id=document_id, user_id=sid)
 
         # Join Socket.IO room
-        await sio.enter_room(sid, f"doc_{document_id}")
+        await enter_room(sid, f"doc_{document_id}")
 
         active_session_ids = get_session_ids_from_room(f"doc_{document_id}")
 
@@ -578,7 +677,7 @@ async def yjs_document_leave(sid, data):
         await YDOC_MANAGER.remove_user(document_id=document_id, user_id=sid)
 
         # Leave Socket.IO room
-        await sio.leave_room(sid, f"doc_{document_id}")
+        await leave_room(sid, f"doc_{document_id}")
 
         # Notify other users
         await sio.emit(
@@ -624,11 +723,11 @@ async def disconnect(sid):
         user = SESSION_POOL[sid]
         del SESSION_POOL[sid]
 
-        user_id = user["id"]
-        USER_POOL[user_id] = [_sid for _sid in USER_POOL[user_id] if _sid != sid]
+        USER_POOL.remove(user["id"], sid)
 
-        if len(USER_POOL[user_id]) == 0:
-            del USER_POOL[user_id]
+        for room in SESSION_ROOM_POOL.get(sid, []):
+            ROOM_POOL.remove(room, sid)
+        SESSION_ROOM_POOL.delete(sid)
 
         await YDOC_MANAGER.remove_user_from_all_documents(sid)
     else:
@@ -636,6 +735,118 @@ async def disconnect(sid):
         # print(f"Unknown session ID {sid} disconnected")
 
 
+class ChatEventWriteBuffer:
+    """
+    Write-behind buffer for the chat events persisted by the event emitter.
+
+    Events are coalesced per (chat_id, message_id): status updates are
+    collected, "message" contents concatenated and "replace" resets the
+    content. A buffer is written in a single read-modify-write of the chat,
+    `interval` seconds after its first event or when the response completes,
+    in a worker thread so the event loop is not blocked by the database.
+
+    Writes of a message are serialized by a per-message lock. The final save
+    of a response runs under `hold()`, so a flush can neither overwrite it
+    with older content nor be dropped by it.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.pending: Dict[tuple, dict] = {}
+        self.timers: Dict[tuple, asyncio.Task] = {}
+        self.locks: Dict[tuple, asyncio.Lock] = {}
+
+    async def add(self, chat_id: str, message_id: str, event_data: dict):
+        key = (chat_id, message_id)
+        entry = self.pending.setdefault(
+            key, {"statuses": [], "content": None, "appended": ""}
+        )
+
+        event_type = event_data.get("type")
+        data = event_data.get("data", {})
+
+        if event_type == "status":
+            entry["statuses"].append(data)
+        elif event_type == "message":
+            entry["appended"] += data.get("content", "")
+        elif event_type == "replace":
+            entry["content"] = data.get("content", "")
+            entry["appended"] = ""
+
+        if self.interval <= 0:
+            await self.flush(chat_id, message_id)
+        elif key not in self.timers:
+            self.timers[key] = asyncio.create_task(self._flush_later(key))
+
+    async def _flush_later(self, key: tuple):
+        await asyncio.sleep(self.interval)
+        self.timers.pop(key, None)
+        await self.flush(*key)
+
+    async def _write_pending(self, key: tuple):
+        entry = self.pending.pop(key, None)
+        if entry is not None:
+            try:
+                await asyncio.to_thread(self._write, *key, entry)
+            except Exception as e:
+                log.exception(f"Error writing chat events of {key}: {e}")
+
+    def _release(self, key: tuple, lock: asyncio.Lock):
+        if key not in self.pending and key not in self.timers and not lock.locked():
+            self.locks.pop(key, None)
+
+    async def flush(self, chat_id: str, message_id: str):
+        key = (chat_id, message_id)
+        lock = self.locks.setdefault(key, asyncio.Lock())
+
+        async with lock:
+            await self._write_pending(key)
+
+        self._release(key, lock)
+
+    @asynccontextmanager
+    async def hold(self, chat_id: str, message_id: str):
+        """
+        Writes the buffered events of a message, waiting for a flush that is
+        already running, and keeps further flushes waiting until the block
+        exits. Events buffered meanwhile are written after the block.
+        """
+        key = (chat_id, message_id)
+        lock = self.locks.setdefault(key, asyncio.Lock())
+
+        async with lock:
+            await self._write_pending(key)
+            yield
+
+        self._release(key, lock)
+
+    @staticmethod
+    def _write(chat_id: str, message_id: str, entry: dict):
+        message = Chats.get_message_by_id_and_message_id(chat_id, message_id)
+        if message is None:
+            return
+
+        update = {}
+        if entry["statuses"] and message:
+            update["statusHistory"] = [
+                *message.get("statusHistory", []),
+                *entry["statuses"],
+            ]
+
+        if entry["content"] is not None:
+            update["content"] = entry["content"] + entry["appended"]
+        elif entry["appended"] and message:
+            update["content"] = message.get("content", "") + entry["appended"]
+
+        if update:
+            Chats.upsert_message_to_chat_by_id_and_message_id(
+                chat_id, message_id, update
+            )
+
+
+CHAT_EVENT_BUFFER = ChatEventWriteBuffer(CHAT_EVENT_FLUSH_INTERVAL)
+
+
 def get_event_emitter(request_info, update_db=True):
     async def __event_emitter__(event_data):
         user_id = request_info["user_id"]
@@ -666,41 +877,26 @@ def get_event_emitter(request_info, update_db=True):
 
         await asyncio.gather(*emit_tasks)
 
-        if update_db:
-            if "type" in event_data and event_data["type"] == "status":
-                Chats.add_message_status_to_chat_by_id_and_message_id(
+        if update_db and request_info.get("chat_id"):
+            event_type = event_data.get("type")
+
+            if event_type in ["status", "message", "replace"]:
+                await CHAT_EVENT_BUFFER.add(
                     request_info["chat_id"],
                     request_info["message_id"],
-                    event_data.get("data", {}),
+                    event_data,
                 )
-
-            if "type" in event_data and event_data["type"] == "message":
-                message = Chats.get_message_by_id_and_message_id(
+            elif event_type == "task-cancelled":
+                await CHAT_EVENT_BUFFER.flush(
                     request_info["chat_id"],
                     request_info["message_id"],
                 )
-
-                if message:
-                    content = message.get("content", "")
-                    content += event_data.get("data", {}).get("content", "")
-
-                    Chats.upsert_message_to_chat_by_id_and_message_id(
-                        request_info["chat_id"],
-                        request_info["message_id"],
-                        {
-                            "content": content,
-                        },
-                    )
-
-            if "type" in event_data and event_data["type"] == "replace":
-                content = event_data.get("data", {}).get("content", "")
-
-                Chats.upsert_message_to_chat_by_id_and_message_id(
+            elif event_type == "chat:completion" and event_data.get("data", {}).get(
+                "done"
+            ):
+                await CHAT_EVENT_BUFFER.flush(
                     request_info["chat_id"],
                     request_info["message_id"],
-                    {
-                        "content": content,
-                    },
                 )
 
     return __event_emitter__
@@ -723,3 +919,49 @@ def get_event_call(request_info):
 
 
 get_event_caller = get_event_call
+
+
+def get_file_event_emitter(user_id, file_id, interval: float = 0.5):
+    """
+    Returns a synchronous emitter for `file-events`, meant to be called from
+    the worker threads that process uploaded files. Events are scheduled on
+    the server's event loop without waiting for delivery, and intermediate
+    progress is throttled to one event per `interval` seconds.
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        try:
+            loop = anyio.from_thread.run_sync(asyncio.get_running_loop)
+        except Exception:
+            # Not called from the server (e.g. a script), nobody to notify
+            loop = None
+
+    last_emitted_at = 0.0
+
+    async def __emit__(event_data):
+        await asyncio.gather(
+            *[
+                sio.emit(
+                    "file-events",
+                    {"file_id": file_id, "data": event_data},
+                    to=session_id,
+                )
+                for session_id in USER_POOL.get(user_id, [])
+            ]
+        )
+
+    def __event_emitter__(event_data, force: bool = False):
+        nonlocal last_emitted_at
+
+        if loop is None or loop.is_closed():
+            return
+
+        now = time.monotonic()
+        if not force and now - last_emitted_at < interval:
+            return
+        last_emitted_at = now
+
+        asyncio.run_coroutine_threadsafe(__emit__(event_data), loop)
+
+    return __event_emitter__
@@ -1,5 +1,8 @@
+import copy
+import functools
 import json
 import uuid
+from open_webui.utils.cache import LocalCache
 from open_webui.utils.redis import get_redis_connection
 from open_webui.env import REDIS_KEY_PREFIX
 from typing import Optional, List, Tuple
@@ -47,6 +50,40 @@ class RedisLock:
 
 
 class RedisDict:
+    # Shallow-merges JSON objects into the values of a hash, field by field
+    MERGE_SCRIPT = """
+    for i = 1, #ARGV, 2 do
+        local current = redis.call('HGET', KEYS[1], ARGV[i])
+        local value = current and cjson.decode(current) or {}
+        for k, v in pairs(cjson.decode(ARGV[i + 1])) do
+            value[k] = v
+        end
+        redis.call('HSET', KEYS[1], ARGV[i], cjson.encode(value))
+    end
+    """
+
+    # Drops the entries of JSON object values whose ARGV[2] is below ARGV[1]
+    # and the values left empty
+    EXPIRE_SCRIPT = """
+    local cutoff = tonumber(ARGV[1])
+    for i = 3, #ARGV do
+        local current = redis.call('HGET', KEYS[1], ARGV[i])
+        if current then
+            local value = cjson.decode(current)
+            for k, v in pairs(value) do
+                if v[ARGV[2]] < cutoff then
+                    value[k] = nil
+                end
+            end
+            if next(value) == nil then
+                redis.call('HDEL', KEYS[1], ARGV[i])
+            else
+                redis.call('HSET', KEYS[1], ARGV[i], cjson.encode(value))
+            end
+        end
+    end
+    """
+
     def __init__(self, name, redis_url, redis_sentinels=[], redis_cluster=False):
         self.name = name
         self.redis = get_redis_connection(
@@ -92,15 +129,46 @@ class RedisDict:
         except KeyError:
             return default
 
+    def get_many(self, keys) -> dict:
+        """Values of the given keys that exist, in a single HMGET."""
+        keys = list(keys)
+        if not keys:
+            return {}
+        values = self.redis.hmget(self.name, keys)
+        return {k: json.loads(v) for k, v in zip(keys, values) if v is not None}
+
+    def delete_many(self, keys):
+        keys = list(keys)
+        if keys:
+            self.redis.hdel(self.name, *keys)
+
     def clear(self):
         self.redis.delete(self.name)
 
     def update(self, other=None, **kwargs):
-        if other is not None:
-            for k, v in other.items() if hasattr(other, "items") else other:
-                self[k] = v
-        for k, v in kwargs.items():
-            self[k] = v
+        # One HSET for all items instead of a round trip per key
+        items = dict(other or {}, **kwargs)
+        if items:
+            self.redis.hset(
+                self.name, mapping={k: json.dumps(v) for k, v in items.items()}
+            )
+
+    def merge(self, items: dict):
+        """Atomically merge the dicts in `items` into the dict values of their keys."""
+        if items:
+            args = []
+            for key, value in items.items():
+                args += [key, json.dumps(value)]
+            self.redis.eval(self.MERGE_SCRIPT, 1, self.name, *args)
+
+    def expire(self, keys, field: str, cutoff):
+        """
+        Atomically drop the entries of the dict values of `keys` whose `field`
+        is below `cutoff`, and the keys left without entries.
+        """
+        keys = list(keys)
+        if keys:
+            self.redis.eval(self.EXPIRE_SCRIPT, 1, self.name, cutoff, field, *keys)
 
     def setdefault(self, key, default=None):
         if key not in self:
@@ -108,6 +176,176 @@ class RedisDict:
         return self[key]
 
 
+class CachedRedisDict(RedisDict):
+    """
+    RedisDict with a near-cache: reads of single keys are served from the
+    worker's memory and every write invalidates the key on all workers over
+    pub/sub. Whole-hash reads (keys, values, items) still go to Redis.
+    """
+
+    def __init__(
+        self, name, redis_url, redis_sentinels=[], redis_cluster=False, cache_ttl=30
+    ):
+        super().__init__(name, redis_url, redis_sentinels, redis_cluster)
+        self.cache = LocalCache(name, ttl=cache_ttl, redis=self.redis)
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.cache.delete(key)
+
+    def __getitem__(self, key):
+        value = self.cache.get_or_set(key, functools.partial(super().__getitem__, key))
+        return copy.deepcopy(value)
+
+    def __delitem__(self, key):
+        try:
+            super().__delitem__(key)
+        finally:
+            self.cache.delete(key)
+
+    def __contains__(self, key):
+        return self.cache.get(key) is not None or super().__contains__(key)
+
+    def get_many(self, keys) -> dict:
+        keys = list(keys)
+
+        values = {}
+        for key in keys:
+            value = self.cache.get(key)
+            if value is not None:
+                values[key] = copy.deepcopy(value)
+
+        missing = [key for key in keys if key not in values]
+        if missing:
+            # Invalidations that arrive during the HMGET must win
+            generation = self.cache.generation
+            for key, value in super().get_many(missing).items():
+                self.cache.set(key, value, generation)
+                values[key] = copy.deepcopy(value)
+        return values
+
+    def delete_many(self, keys):
+        keys = list(keys)
+        super().delete_many(keys)
+        for key in keys:
+            self.cache.delete(key)
+
+    def clear(self):
+        super().clear()
+        self.cache.clear()
+
+    def update(self, other=None, **kwargs):
+        items = dict(other or {}, **kwargs)
+        super().update(items)
+        for key in items:
+            self.cache.delete(key)
+
+
+class RedisSetDict:
+    """
+    Reverse index of key -> members (e.g. user id -> session ids) kept as one
+    Redis set per key, so adding or removing a member is a single SADD/SREM
+    instead of a read-modify-write of a JSON list. The set `{name}` holds the
+    keys in use. Reads go through a near-cache like CachedRedisDict.
+
+    Removing the last member and dropping the key from the key set happen in
+    one Lua script, so a concurrent add cannot be dropped from the key set.
+    All sets share the `{name}` hash tag so the script also runs on a cluster.
+    """
+
+    REMOVE_SCRIPT = """
+    redis.call('SREM', KEYS[1], ARGV[1])
+    if redis.call('SCARD', KEYS[1]) == 0 then
+        redis.call('SREM', KEYS[2], ARGV[2])
+    end
+    """
+
+    DELETE_SCRIPT = """
+    redis.call('DEL', KEYS[1])
+    redis.call('SREM', KEYS[2], ARGV[1])
+    """
+
+    def __init__(
+        self, name, redis_url, redis_sentinels=[], redis_cluster=False, cache_ttl=30
+    ):
+        self.name = name
+        self.redis = get_redis_connection(
+            redis_url,
+            redis_sentinels,
+            redis_cluster=redis_cluster,
+            decode_responses=True,
+        )
+        self.cache = LocalCache(name, ttl=cache_ttl, redis=self.redis)
+        self.keys_name = f"{{{name}}}"
+
+    def _get_set_name(self, key):
+        return f"{self.keys_name}:{key}"
+
+    def add(self, key, member):
+        # The member goes in first, so a concurrent remove never sees an
+        # empty set for a key that is about to be indexed
+        pipe = self.redis.pipeline()
+        pipe.sadd(self._get_set_name(key), member)
+        pipe.sadd(self.keys_name, key)
+        pipe.execute()
+        self.cache.delete(key)
+
+    def remove(self, key, member):
+        # EVAL rather than a registered script so sentinel fail-over retries apply
+        self.redis.eval(
+            self.REMOVE_SCRIPT, 2, self._get_set_name(key), self.keys_name, member, key
+        )
+        self.cache.delete(key)
+
+    def delete(self, key):
+        self.redis.eval(
+            self.DELETE_SCRIPT, 2, self._get_set_name(key), self.keys_name, key
+        )
+        self.cache.delete(key)
+
+    def get(self, key, default=None) -> Optional[list]:
+        members = self.cache.get_or_set(
+            key, lambda: list(self.redis.smembers(self._get_set_name(key)))
+        )
+        return list(members) if members else default
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def keys(self):
+        return list(self.redis.smembers(self.keys_name))
+
+
+class LocalSetDict:
+    """In-process counterpart of RedisSetDict for a single worker."""
+
+    def __init__(self):
+        self._data: dict[str, set] = {}
+
+    def add(self, key, member):
+        self._data.setdefault(key, set()).add(member)
+
+    def remove(self, key, member):
+        members = self._data.get(key)
+        if members is not None:
+            members.discard(member)
+            if not members:
+                del self._data[key]
+
+    def delete(self, key):
+        self._data.pop(key, None)
+
+    def get(self, key, default=None) -> Optional[list]:
+        members = self._data.get(key)
+        return list(members) if members else default
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def keys(self):
+        return list(self._data.keys())
+
+
 class YdocManager:
     def __init__(
         self,
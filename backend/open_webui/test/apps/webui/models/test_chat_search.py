@@ -0,0 +1,79 @@
+import sqlite3
+
+import pytest
+
+from open_webui.models.chats import get_chat_search_content, get_chat_search_query
+
+
+@pytest.mark.parametrize(
+    "search_text, sqlite_query, postgres_query",
+    [
+        ("hello world", '"hello"* "world"*', "hello:* & world:*"),
+        ("  spaced\tout\n", '"spaced"* "out"*', "spaced:* & out:*"),
+        ("c++ vs. rust?", '"c"* "vs"* "rust"*', "c:* & vs:* & rust:*"),
+        ("don't", '"don"* "t"*', "don:* & t:*"),
+        ("snake_case", '"snake_case"*', "snake_case:*"),
+        ("größe über 42", '"größe"* "über"* "42"*', "größe:* & über:* & 42:*"),
+    ],
+)
+def test_search_query_tokenizes_words(search_text, sqlite_query, postgres_query):
+    assert get_chat_search_query("sqlite", search_text) == sqlite_query
+    assert get_chat_search_query("postgresql", search_text) == postgres_query
+
+
+# Operators of FTS5 and to_tsquery that must not reach the query
+OPERATORS = [
+    "a & b | !c",
+    "(a) <-> b",
+    "a:* 'b'",
+    'a" OR "b',
+    "NEAR(a b) NOT c",
+    "title: a AND b*",
+    "a\\ b^",
+]
+
+
+@pytest.mark.parametrize("search_text", OPERATORS)
+def test_search_query_escapes_operators(search_text):
+    for dialect_name in ("sqlite", "postgresql"):
+        query = get_chat_search_query(dialect_name, search_text)
+        stripped = query.replace('"', "").replace("*", "")
+        stripped = stripped.replace(":", "").replace("&", "")
+        assert all(c.isalnum() or c in " _" for c in stripped)
+
+
+@pytest.mark.parametrize("search_text", ["", "   ", "!?&|()", "'\"*:"])
+def test_search_query_without_words(search_text):
+    assert get_chat_search_query("sqlite", search_text) is None
+    assert get_chat_search_query("postgresql", search_text) is None
+
+
+@pytest.mark.parametrize("search_text", OPERATORS + ["hello wor", "don't"])
+def test_search_query_is_valid_fts5(search_text):
+    db = sqlite3.connect(":memory:")
+    db.execute("CREATE VIRTUAL TABLE chat_search_fts USING fts5(title, content)")
+    db.execute(
+        "INSERT INTO chat_search_fts VALUES (?, ?)",
+        ("hello world", "a b c don't title and near or not"),
+    )
+
+    query = get_chat_search_query("sqlite", search_text)
+    db.execute(
+        "SELECT rowid FROM chat_search_fts WHERE chat_search_fts MATCH ?", (query,)
+    ).fetchall()
+
+
+def test_search_content_includes_all_message_texts():
+    chat = {
+        "history": {
+            "messages": {
+                "1": {"content": "plain"},
+                "2": {"content": [{"type": "text", "text": "multi"}]},
+                "3": {"content": None},
+                "4": "invalid",
+                "5": {"content": "nul\x00byte"},
+            }
+        }
+    }
+    assert get_chat_search_content(chat) == "plain\nmulti\nnulbyte"
+    assert get_chat_search_content({"messages": [{"content": "legacy"}]}) == "legacy"
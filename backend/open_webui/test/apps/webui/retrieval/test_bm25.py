@@ -0,0 +1,168 @@
+import asyncio
+import sqlite3
+
+import numpy as np
+import pytest
+
+from open_webui.retrieval.bm25 import BM25Index, BM25IndexedVectorClient
+from open_webui.retrieval.vector.dbs import local
+
+
+def make_items(texts, file_id="a", dim=4):
+    rng = np.random.default_rng(len(texts))
+    return [
+        {
+            "id": f"{file_id}-{i}",
+            "text": text,
+            "vector": rng.normal(size=dim).tolist(),
+            "metadata": {"file_id": file_id, "page": i},
+        }
+        for i, text in enumerate(texts)
+    ]
+
+
+@pytest.fixture
+def index(tmp_path):
+    return BM25Index(str(tmp_path / "bm25"))
+
+
+@pytest.fixture
+def client(monkeypatch, tmp_path, index):
+    monkeypatch.setattr(local, "LOCAL_VECTOR_DB_PATH", str(tmp_path / "local"))
+    return BM25IndexedVectorClient(local.LocalVectorClient(), index)
+
+
+def search_ids(index, collection_name, query, limit=10):
+    return index.search(collection_name, query, limit).ids[0]
+
+
+def test_search_ranks_by_term_frequency(index):
+    index.upsert(
+        "c",
+        [
+            {"id": "1", "text": "apple banana", "metadata": {}},
+            {"id": "2", "text": "apple apple apple", "metadata": {}},
+            {"id": "3", "text": "cherry", "metadata": {}},
+        ],
+    )
+
+    assert search_ids(index, "c", "apple") == ["2", "1"]
+    assert search_ids(index, "c", "cherry") == ["3"]
+    assert search_ids(index, "missing", "apple") == []
+
+
+def test_delete_by_filter_uses_metadata_index(index):
+    index.upsert("c", make_items(["apple one", "apple two"], file_id="a"))
+    index.upsert("c", make_items(["apple three"], file_id="b"))
+
+    statements = []
+    connect = index._connect
+
+    def traced_connect(collection_name):
+        conn = connect(collection_name)
+        conn.set_trace_callback(statements.append)
+        return conn
+
+    index._connect = traced_connect
+    index.delete("c", filter={"file_id": "a"})
+
+    assert search_ids(index, "c", "apple") == ["b-0"]
+    assert not any("SELECT id, metadata" in statement for statement in statements)
+
+    index.delete("c", filter={"file_id": "b", "page": 1})
+    assert search_ids(index, "c", "apple") == ["b-0"]
+    index.delete("c", filter={"file_id": "b", "page": 0})
+    assert search_ids(index, "c", "apple") == []
+
+
+def test_delete_by_filter_with_ids(index):
+    index.upsert("c", make_items(["apple one", "apple two"]))
+
+    index.delete("c", ids=["a-1"], filter={"file_id": "a"})
+
+    assert search_ids(index, "c", "apple") == ["a-0"]
+
+
+def test_metadata_index_is_backfilled(index):
+    index.upsert("c", make_items(["apple one", "apple two"]))
+
+    # Simulate an index written before metadata values were indexed
+    conn = sqlite3.connect(index._get_db_path("c"))
+    with conn:
+        conn.execute("DELETE FROM metadata")
+        conn.execute("DELETE FROM stat WHERE key = 'metadata_indexed'")
+    conn.close()
+
+    index.delete("c", filter={"page": 1})
+
+    assert search_ids(index, "c", "apple") == ["a-0"]
+
+
+def test_client_keeps_index_in_sync(client, index):
+    client.insert("c", make_items(["apple one", "apple two"], file_id="a"))
+    client.upsert("c", make_items(["banana three"], file_id="b"))
+    assert sorted(search_ids(index, "c", "apple")) == ["a-0", "a-1"]
+    assert search_ids(index, "c", "banana") == ["b-0"]
+
+    client.upsert("c", make_items(["cherry three"], file_id="b"))
+    assert search_ids(index, "c", "banana") == []
+    assert search_ids(index, "c", "cherry") == ["b-0"]
+
+    client.delete("c", filter={"file_id": "a"})
+    assert search_ids(index, "c", "apple") == []
+    assert client.get("c").ids == [["b-0"]]
+
+    client.delete_collection("c")
+    assert not index.has_collection("c")
+    assert not client.has_collection("c")
+
+    client.insert("d", make_items(["apple"]))
+    client.reset()
+    assert not index.has_collection("d")
+
+
+def test_client_async_writes_update_index(client, index):
+    async def run():
+        await client.insert_async("c", make_items(["apple one"], file_id="a"))
+        await client.upsert_async("c", make_items(["banana two"], file_id="b"))
+        await client.delete_async("c", ids=["a-0"])
+
+    asyncio.run(run())
+
+    assert search_ids(index, "c", "apple") == []
+    assert search_ids(index, "c", "banana") == ["b-0"]
+
+
+def test_client_leaves_unindexed_collections_to_lazy_build(client, index):
+    client.client.insert("c", make_items(["apple one"]))
+
+    client.insert("c", make_items(["apple two"], file_id="b"))
+
+    # A partial index would hide the chunks written before it existed
+    assert not index.has_collection("c")
+    index.build("c", client.get("c"))
+    assert sorted(search_ids(index, "c", "apple")) == ["a-0", "b-0"]
+
+
+def test_client_drops_index_on_update_error(client, index):
+    client.insert("c", make_items(["apple one"]))
+
+    def fail(*args, **kwargs):
+        raise sqlite3.OperationalError("disk I/O error")
+
+    index.upsert = fail
+    client.upsert("c", make_items(["apple two"], file_id="b"))
+
+    assert not index.has_collection("c")
+    assert sorted(client.get("c").ids[0]) == ["a-0", "b-0"]
+
+
+def test_client_delegates_rebuild_index(client, index):
+    client.insert("c", make_items(["apple one", "apple two"]))
+
+    # The base class raises NotImplementedError, the local backend does not
+    client.rebuild_index("c")
+    client.rebuild_index()
+
+    assert sorted(client.get("c").ids[0]) == ["a-0", "a-1"]
+    assert sorted(search_ids(index, "c", "apple")) == ["a-0", "a-1"]
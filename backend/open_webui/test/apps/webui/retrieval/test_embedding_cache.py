@@ -0,0 +1,77 @@
+import sqlite3
+
+import pytest
+
+from open_webui.retrieval import embedding_cache
+from open_webui.retrieval.embedding_cache import EmbeddingCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return EmbeddingCache(str(tmp_path), max_entries=100, memory_entries=0)
+
+
+@pytest.fixture
+def statements(cache, monkeypatch):
+    statements = []
+    connect = cache._connect
+
+    def traced_connect():
+        conn = connect()
+        conn.set_trace_callback(statements.append)
+        return conn
+
+    monkeypatch.setattr(cache, "_connect", traced_connect)
+    return statements
+
+
+def count_rows(cache):
+    conn = sqlite3.connect(cache._db_path)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM embedding").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_set_many_only_counts_rows_near_the_limit(cache, statements):
+    for i in range(30):
+        cache.set_many({f"h{i}": [float(i)]}, "engine", "model")
+
+    counts = [statement for statement in statements if "COUNT(*)" in statement]
+    assert 1 <= len(counts) <= 4
+
+
+def test_set_many_trims_least_recently_used(cache):
+    for i in range(250):
+        cache.set_many({f"h{i}": [float(i)]}, "engine", "model")
+
+    assert count_rows(cache) <= cache.max_entries
+    assert cache.get_many(["h0", "h249"], "engine", "model") == {"h249": [249.0]}
+
+
+def test_set_many_counts_rows_of_other_workers(cache, tmp_path):
+    other = EmbeddingCache(str(tmp_path), max_entries=100, memory_entries=0)
+
+    cache.set_many({"h": [0.0]}, "engine", "model")
+    other.set_many({f"o{i}": [0.0] for i in range(150)}, "engine", "model")
+    for i in range(20):
+        cache.set_many({f"h{i}": [float(i)]}, "engine", "model")
+
+    assert count_rows(cache) <= cache.max_entries
+
+
+def test_get_many_refreshes_access_time_once_per_interval(
+    cache, statements, monkeypatch
+):
+    cache.set_many({"a": [1.0], "b": [2.0]}, "engine", "model")
+
+    for _ in range(3):
+        assert cache.get_many(["a", "b"], "engine", "model") == {
+            "a": [1.0],
+            "b": [2.0],
+        }
+    assert not any(statement.startswith("UPDATE") for statement in statements)
+
+    monkeypatch.setattr(embedding_cache, "ACCESS_UPDATE_INTERVAL", 0)
+    cache.get_many(["a", "b"], "engine", "model")
+    assert len([s for s in statements if s.startswith("UPDATE")]) == 2
@@ -0,0 +1,190 @@
+import os
+
+import numpy as np
+import pytest
+
+from open_webui.retrieval.vector.dbs import local
+
+
+def make_items(start, end, dim=8, seed=0, metadata=None):
+    rng = np.random.default_rng(seed)
+    vectors = rng.normal(size=(end, dim)).astype(np.float32)
+    return [
+        {
+            "id": str(i),
+            "text": f"text {i}",
+            "vector": vectors[i].tolist(),
+            "metadata": {"file_id": str(i % 3), **(metadata or {})},
+        }
+        for i in range(start, end)
+    ]
+
+
+@pytest.fixture
+def root(tmp_path):
+    return tmp_path / "local"
+
+
+@pytest.fixture
+def client(monkeypatch, root):
+    monkeypatch.setattr(local, "LOCAL_VECTOR_DB_PATH", str(root))
+    return local.LocalVectorClient()
+
+
+@pytest.mark.parametrize(
+    "collection_name", [".", "..", "../outside", "a/../../b", "/etc", "x\\..\\y"]
+)
+def test_collection_names_stay_inside_the_store(client, root, collection_name):
+    path = client.get_collection_path(collection_name)
+    assert os.path.dirname(os.path.realpath(path)) == os.path.realpath(root)
+    assert os.path.basename(path).startswith(local.COLLECTION_PREFIX)
+
+
+def test_dot_collection_names_do_not_delete_other_collections(client, root):
+    client.insert("knowledge", make_items(0, 5))
+
+    for collection_name in [".", ".."]:
+        # /process/web and /process/youtube overwrite user-named collections
+        client.insert(collection_name, make_items(0, 5))
+        assert not (root / local.MANIFEST).exists()
+        client.delete_collection(collection_name)
+        client.delete_collection(collection_name)
+
+    assert root.exists()
+    assert client.has_collection("knowledge")
+    assert len(client.get("knowledge").ids[0]) == 5
+
+
+def test_distinct_names_do_not_share_a_directory(client):
+    assert client.get_collection_path("a/b") != client.get_collection_path("a_b")
+
+
+def test_insert_upsert_and_search(client):
+    items = make_items(0, 20)
+    client.insert("c", items[:10])
+    client.insert("c", items[5:20])
+    # Existing ids are kept by insert
+    client.insert("c", [{**items[0], "text": "ignored"}])
+
+    result = client.search("c", [items[3]["vector"], items[15]["vector"]], 3)
+    assert [ids[0] for ids in result.ids] == ["3", "15"]
+    assert result.distances[0][0] == pytest.approx(1.0, abs=1e-5)
+    assert len(client.get("c").ids[0]) == 20
+    assert client.query("c", {"file_id": "0"}).documents[0][0] == "text 0"
+
+    client.upsert("c", [{**items[3], "text": "updated"}])
+    assert client.query("c", {"file_id": "0"}).ids[0].count("3") == 1
+    assert client.search("c", [items[3]["vector"]], 1).documents[0] == ["updated"]
+
+
+def test_delete_by_ids_and_filter(client):
+    client.insert("c", make_items(0, 30))
+
+    client.delete("c", ids=["1", "2"])
+    client.delete("c", filter={"file_id": "0"})
+
+    ids = set(client.get("c").ids[0])
+    assert ids == {str(i) for i in range(30) if i % 3 != 0 and i not in (1, 2)}
+    assert (
+        not set(client.search("c", [make_items(0, 30)[0]["vector"]], 30).ids[0]) - ids
+    )
+
+
+def test_compaction_merges_segments(monkeypatch, client, root):
+    monkeypatch.setattr(local, "LOCAL_VECTOR_DB_MAX_SEGMENTS", 3)
+    items = make_items(0, 50)
+    for start in range(0, 50, 10):
+        client.insert("c", items[start : start + 10])
+
+    collection = client.get_collection("c")
+    assert len(collection.segments) <= 3
+    assert collection.count() == 50
+
+    monkeypatch.setattr(local, "LOCAL_VECTOR_DB_COMPACT_RATIO", 0.1)
+    client.delete("c", ids=[str(i) for i in range(10)])
+    assert len(collection.segments) == 1
+    files = os.listdir(collection.path)
+    assert sorted(files) == sorted(
+        [local.MANIFEST]
+        + [f"{name}{ext}" for name in collection.segments for ext in (".npy", ".jsonl")]
+    )
+
+    # A fresh client reads the same state back from disk
+    reopened = local.LocalVectorClient()
+    assert set(reopened.get("c").ids[0]) == {str(i) for i in range(10, 50)}
+
+
+def test_ivf_search_finds_nearest_rows(monkeypatch, client):
+    monkeypatch.setattr(local, "LOCAL_VECTOR_DB_IVF_MIN_ROWS", 100)
+    monkeypatch.setattr(local, "LOCAL_VECTOR_DB_IVF_PROBES", 4)
+    items = make_items(0, 1000, dim=16)
+    client.insert("c", items[:600])
+
+    result = client.search("c", [items[7]["vector"]], 5)
+    assert client.get_collection("c").centroids is not None
+    assert result.ids[0][0] == "7"
+
+    # Rows added after the index was built are assigned to its lists
+    client.insert("c", items[600:])
+    assert client.search("c", [items[900]["vector"]], 5).ids[0][0] == "900"
+
+
+@pytest.mark.parametrize("quantization", ["int8", "binary"])
+def test_quantized_search_rescores_candidates(monkeypatch, client, quantization):
+    monkeypatch.setattr(local, "VECTOR_DB_QUANTIZATION", quantization)
+    items = make_items(0, 200, dim=64)
+    client.insert(quantization, items)
+
+    result = client.search(quantization, [items[42]["vector"]], 3)
+    assert result.ids[0][0] == "42"
+    assert result.distances[0][0] == pytest.approx(1.0, abs=1e-5)
+
+
+def test_clients_see_each_others_writes(root, client):
+    # Two clients stand for two uvicorn workers sharing LOCAL_VECTOR_DB_PATH
+    other = local.LocalVectorClient()
+    items = make_items(0, 40)
+
+    client.insert("c", items[:10])
+    other.insert("c", items[10:20])
+    client.insert("c", items[20:30])
+    other.delete("c", ids=["0"])
+    client.upsert("c", [{**items[1], "text": "updated"}])
+
+    for reader in (client, other, local.LocalVectorClient()):
+        result = reader.get("c")
+        assert set(result.ids[0]) == {str(i) for i in range(1, 30)}
+        assert "updated" in result.documents[0]
+
+    other.delete_collection("c")
+    assert client.search("c", [items[1]["vector"]], 1) is None
+    client.insert("c", items[30:40])
+    assert set(other.get("c").ids[0]) == {str(i) for i in range(30, 40)}
+
+
+def insert_batches(collection_name, batches):
+    client = local.LocalVectorClient()
+    for batch in batches:
+        client.insert(collection_name, batch)
+
+
+@pytest.mark.skipif(local.fcntl is None, reason="requires fcntl")
+def test_concurrent_processes_do_not_drop_segments(client):
+    import multiprocessing
+
+    items = make_items(0, 200)
+    context = multiprocessing.get_context("fork")
+    processes = [
+        context.Process(
+            target=insert_batches,
+            args=("c", [items[i : i + 5] for i in range(start, start + 100, 5)]),
+        )
+        for start in (0, 100)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+        assert process.exitcode == 0
+
+    assert set(client.get("c").ids[0]) == {str(i) for i in range(200)}
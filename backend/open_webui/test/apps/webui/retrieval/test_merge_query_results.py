@@ -0,0 +1,94 @@
+import hashlib
+import random
+
+from open_webui.retrieval.utils import merge_and_sort_query_results
+
+
+def merge_and_sort_query_results_reference(query_results: list[dict], k: int) -> dict:
+    # The implementation before vectorization, over every row of the results
+    combined = dict()
+
+    for data in query_results:
+        for distances, documents, metadatas in zip(
+            data["distances"], data["documents"], data["metadatas"]
+        ):
+            for distance, document, metadata in zip(distances, documents, metadatas):
+                if isinstance(document, str):
+                    doc_hash = hashlib.sha256(document.encode()).hexdigest()
+
+                    if doc_hash not in combined.keys():
+                        combined[doc_hash] = (distance, document, metadata)
+                        continue
+
+                    if distance > combined[doc_hash][0]:
+                        combined[doc_hash] = (distance, document, metadata)
+
+    combined = list(combined.values())
+    combined.sort(key=lambda x: x[0], reverse=True)
+
+    sorted_distances, sorted_documents, sorted_metadatas = (
+        zip(*combined[:k]) if combined else ([], [], [])
+    )
+
+    return {
+        "distances": [list(sorted_distances)],
+        "documents": [list(sorted_documents)],
+        "metadatas": [list(sorted_metadatas)],
+    }
+
+
+def random_query_results(rng: random.Random) -> list[dict]:
+    # Few distinct scores and documents, so ties and duplicates are common
+    query_results = []
+    for _ in range(rng.randint(0, 4)):
+        rows = []
+        for _ in range(rng.randint(1, 2)):
+            rows.append(
+                [
+                    (rng.choice([0.1, 0.5, 0.5, 0.9]), f"doc {rng.randint(0, 12)}")
+                    for _ in range(rng.randint(0, 8))
+                ]
+            )
+        query_results.append(
+            {
+                "distances": [[score for score, _ in row] for row in rows],
+                "documents": [[document for _, document in row] for row in rows],
+                "metadatas": [
+                    [{"row": i, "position": j} for j in range(len(row))]
+                    for i, row in enumerate(rows)
+                ],
+            }
+        )
+    return query_results
+
+
+def test_matches_the_reference_implementation():
+    for seed in range(3000):
+        rng = random.Random(seed)
+        query_results = random_query_results(rng)
+        k = rng.randint(1, 10)
+
+        assert merge_and_sort_query_results(
+            query_results, k
+        ) == merge_and_sort_query_results_reference(query_results, k), seed
+
+
+def test_chunk_hash_deduplicates_across_collections():
+    query_results = [
+        {
+            "distances": [[0.4, 0.8]],
+            "documents": [["a", "b"]],
+            "metadatas": [[{"chunk_hash": "x"}, {"chunk_hash": "y"}]],
+        },
+        {
+            "distances": [[0.9]],
+            "documents": [["a (copy)"]],
+            "metadatas": [[{"chunk_hash": "x"}]],
+        },
+    ]
+
+    assert merge_and_sort_query_results(query_results, 5) == {
+        "distances": [[0.9, 0.8]],
+        "documents": [["a (copy)", "b"]],
+        "metadatas": [[{"chunk_hash": "x"}, {"chunk_hash": "y"}]],
+    }
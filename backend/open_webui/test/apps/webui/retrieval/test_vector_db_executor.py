@@ -0,0 +1,35 @@
+import threading
+
+import pytest
+
+from open_webui.retrieval.vector.main import (
+    VECTOR_DB_EXECUTOR,
+    submit_to_vector_db_executor,
+)
+
+
+def test_nested_submits_do_not_deadlock_a_busy_pool():
+    workers = VECTOR_DB_EXECUTOR._max_workers
+    barrier = threading.Barrier(workers, timeout=5)
+
+    def query_collection(i):
+        # Every worker of the pool is busy when the nested work is submitted
+        barrier.wait()
+        futures = [submit_to_vector_db_executor(lambda j=j: (i, j)) for j in range(3)]
+        return [future.result(timeout=5) for future in futures]
+
+    futures = [
+        submit_to_vector_db_executor(query_collection, i) for i in range(workers)
+    ]
+    assert [future.result(timeout=10) for future in futures] == [
+        [(i, j) for j in range(3)] for i in range(workers)
+    ]
+
+
+def test_inline_runs_keep_exceptions_in_the_future():
+    def fail():
+        raise ValueError("search failed")
+
+    future = VECTOR_DB_EXECUTOR.submit(lambda: submit_to_vector_db_executor(fail))
+    with pytest.raises(ValueError):
+        future.result(timeout=5).result()
@@ -234,3 +234,83 @@ class TestChats(AbstractPostgresTest):
 
         chat = self.chats.get_chat_by_id(chat_id)
         assert chat.share_id is None
+
+    def test_pending_message_deltas_are_returned_by_chat_reads(self):
+        from open_webui.models.chats import ChatForm
+
+        chat = self.chats.insert_new_chat(
+            "4",
+            ChatForm(
+                chat={
+                    "title": "streaming",
+                    "history": {
+                        "currentId": "m1",
+                        "messages": {"m1": {"id": "m1", "content": ""}},
+                    },
+                }
+            ),
+        )
+        self.chats.append_message_delta_to_chat_by_id_and_message_id(
+            chat.id, "m1", {"content": "partial"}
+        )
+
+        def content(chat):
+            return chat.chat["history"]["messages"]["m1"]["content"]
+
+        assert content(self.chats.get_chat_by_id(chat.id)) == "partial"
+        assert [content(c) for c in self.chats.get_chats_by_user_id("4")] == ["partial"]
+
+        shared_chat = self.chats.insert_shared_chat_by_chat_id(chat.id)
+        self.chats.update_chat_share_id_by_id(chat.id, shared_chat.id)
+        assert content(self.chats.get_chat_by_share_id(shared_chat.id)) == "partial"
+
+        self.chats.update_chat_folder_id_by_id_and_user_id(chat.id, "4", "folder")
+        assert [
+            content(c)
+            for c in self.chats.get_chats_by_folder_ids_and_user_id(["folder"], "4")
+        ] == ["partial"]
+
+        self.chats.toggle_chat_archive_by_id(chat.id)
+        assert [content(c) for c in self.chats.get_archived_chats_by_user_id("4")] == [
+            "partial"
+        ]
+
+    def test_chat_search_is_only_rewritten_when_the_text_changes(self):
+        from open_webui.internal.db import get_db
+        from open_webui.models.chats import ChatForm, ChatSearch
+
+        chat = self.chats.insert_new_chat(
+            "5",
+            ChatForm(
+                chat={
+                    "title": "search",
+                    "history": {
+                        "currentId": "m1",
+                        "messages": {"m1": {"id": "m1", "content": "hello"}},
+                    },
+                }
+            ),
+        )
+
+        def get_search():
+            with get_db() as db:
+                search = db.query(ChatSearch).filter_by(chat_id=chat.id).one()
+                return search.id, search.content
+
+        search_id, _ = get_search()
+        # A rewritten row gets a new id, even where ids of deleted rows are reused
+        self.chats.insert_new_chat("5", ChatForm(chat={"title": "later"}))
+
+        self.chats.add_message_status_to_chat_by_id_and_message_id(
+            chat.id, "m1", {"description": "searching"}
+        )
+        self.chats.upsert_message_to_chat_by_id_and_message_id(
+            chat.id, "m1", {"statusHistory": []}
+        )
+        self.chats.update_chat_by_id(chat.id, self.chats.get_chat_by_id(chat.id).chat)
+        assert get_search() == (search_id, "hello")
+
+        self.chats.upsert_message_to_chat_by_id_and_message_id(
+            chat.id, "m1", {"content": "hello world"}
+        )
+        assert get_search()[1] == "hello world"
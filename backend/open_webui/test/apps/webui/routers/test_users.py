@@ -165,3 +165,11 @@ class TestUsers(AbstractPostgresTest):
         assert len(response.json()) == 1
         data = response.json()
         _assert_user(data, "1")
+
+    def test_cached_users_are_not_shared(self):
+        self.users.update_user_by_id("1", {"info": {"location": "home"}})
+
+        user = self.users.get_user_by_id("1")
+        user.info["location"] = "changed"
+
+        assert self.users.get_user_by_id("1").info == {"location": "home"}
@@ -0,0 +1,87 @@
+import asyncio
+import threading
+
+import pytest
+
+from open_webui.socket import main as socket_main
+
+
+class FakeChats:
+    def __init__(self):
+        self.message = {"content": "start", "statusHistory": []}
+        self.writes = []
+        self.reading = threading.Event()
+        self.release = threading.Event()
+        self.release.set()
+
+    def get_message_by_id_and_message_id(self, chat_id, message_id):
+        message = {**self.message}
+        self.reading.set()
+        self.release.wait(5)
+        return message
+
+    def upsert_message_to_chat_by_id_and_message_id(self, chat_id, message_id, update):
+        self.message = {**self.message, **update}
+        self.writes.append(update)
+
+
+@pytest.fixture
+def chats(monkeypatch):
+    chats = FakeChats()
+    monkeypatch.setattr(socket_main, "Chats", chats)
+    return chats
+
+
+def test_timer_flush_does_not_land_after_the_final_write(chats):
+    async def scenario():
+        buffer = socket_main.ChatEventWriteBuffer(0.01)
+        chats.release.clear()
+        await buffer.add("c", "m", {"type": "message", "data": {"content": "+"}})
+
+        # The timer flush has read the message and is about to write it
+        await asyncio.to_thread(chats.reading.wait, 5)
+
+        async def complete():
+            async with buffer.hold("c", "m"):
+                chats.upsert_message_to_chat_by_id_and_message_id(
+                    "c", "m", {"content": "final"}
+                )
+
+        completion = asyncio.create_task(complete())
+        await asyncio.sleep(0.05)
+        assert chats.writes == []
+
+        chats.release.set()
+        await completion
+        await buffer.add("c", "m", {"type": "status", "data": {"done": True}})
+        await buffer.flush("c", "m")
+        await asyncio.sleep(0.05)
+        return buffer
+
+    buffer = asyncio.run(scenario())
+
+    assert chats.writes[0] == {"content": "start+"}
+    assert chats.writes[1] == {"content": "final"}
+    assert chats.message == {"content": "final", "statusHistory": [{"done": True}]}
+    assert buffer.pending == {} and buffer.timers == {} and buffer.locks == {}
+
+
+def test_buffered_events_are_written_before_the_final_write(chats):
+    async def scenario():
+        buffer = socket_main.ChatEventWriteBuffer(60)
+        await buffer.add("c", "m", {"type": "status", "data": {"step": 1}})
+        await buffer.add("c", "m", {"type": "replace", "data": {"content": "a"}})
+        await buffer.add("c", "m", {"type": "message", "data": {"content": "b"}})
+
+        async with buffer.hold("c", "m"):
+            assert chats.message["content"] == "ab"
+            chats.upsert_message_to_chat_by_id_and_message_id(
+                "c", "m", {"content": "final"}
+            )
+
+        for timer in buffer.timers.values():
+            timer.cancel()
+
+    asyncio.run(scenario())
+
+    assert chats.message == {"content": "final", "statusHistory": [{"step": 1}]}
@@ -0,0 +1,64 @@
+import threading
+
+from open_webui.utils.cache import LocalCache
+
+
+def test_get_or_set_caches_loaded_values():
+    cache = LocalCache("test", ttl=60, redis=None)
+    calls = []
+
+    def load():
+        calls.append(1)
+        return ["group"]
+
+    assert cache.get_or_set("user", load) == ["group"]
+    assert cache.get_or_set("user", load) == ["group"]
+    assert len(calls) == 1
+
+
+def test_get_or_set_drops_values_loaded_across_an_invalidation():
+    cache = LocalCache("test", ttl=60, redis=None)
+
+    for invalidate in (cache.clear, lambda: cache.delete("user")):
+
+        def load():
+            # A group membership changes while the old one is being read
+            invalidate()
+            return ["old group"]
+
+        assert cache.get_or_set("user", load) == ["old group"]
+        assert cache.get("user") is None
+        assert cache.get_or_set("user", lambda: ["new group"]) == ["new group"]
+        cache.clear()
+
+
+def test_get_or_set_with_a_concurrent_invalidation():
+    cache = LocalCache("test", ttl=60, redis=None)
+    loading = threading.Event()
+    invalidated = threading.Event()
+
+    def load():
+        loading.set()
+        invalidated.wait(5)
+        return ["old group"]
+
+    thread = threading.Thread(target=cache.get_or_set, args=("user", load))
+    thread.start()
+    loading.wait(5)
+    cache.clear()
+    invalidated.set()
+    thread.join()
+
+    assert cache.get("user") is None
+
+
+def test_set_skips_values_loaded_before_an_invalidation():
+    cache = LocalCache("test", ttl=60, redis=None)
+
+    generation = cache.generation
+    cache.delete("user")
+    cache.set("user", ["old group"], generation)
+    assert cache.get("user") is None
+
+    cache.set("user", ["new group"], cache.generation)
+    assert cache.get("user") == ["new group"]
@@ -0,0 +1,36 @@
+import asyncio
+
+from open_webui.utils.model_registry import ModelRegistry
+
+
+def test_key_hides_credentials_and_scopes_users():
+    key = ModelRegistry.get_key("http://backend", "sk-secret")
+    assert "sk-secret" not in key
+    assert key != ModelRegistry.get_key("http://backend", "sk-other")
+
+    assert ModelRegistry.get_key("http://backend", "sk-secret", "u1") != key
+    assert ModelRegistry.get_key("http://backend", "sk-secret", "u1") != (
+        ModelRegistry.get_key("http://backend", "sk-secret", "u2")
+    )
+    assert ModelRegistry.get_key("http://backend") == "http://backend"
+
+
+def test_user_scoped_lists_are_not_shared():
+    registry = ModelRegistry(redis=None)
+
+    async def fetch_for(user_id):
+        return {"data": [{"id": f"model-of-{user_id}"}]}
+
+    async def get(user_id):
+        return await registry.get(
+            ModelRegistry.get_key("http://backend", "sk", user_id),
+            lambda: fetch_for(user_id),
+            ttl=60,
+        )
+
+    async def scenario():
+        return [await get("u1"), await get("u2"), await get("u1")]
+
+    u1, u2, u1_again = asyncio.run(scenario())
+    assert u1 == u1_again == {"data": [{"id": "model-of-u1"}]}
+    assert u2 == {"data": [{"id": "model-of-u2"}]}
@@ -0,0 +1,76 @@
+import asyncio
+import gc
+from unittest.mock import Mock
+
+import pytest
+
+from open_webui.utils.scheduler import BackendScheduler, ReleasingStream
+
+
+async def chunks(n, fail=False):
+    for i in range(n):
+        await asyncio.sleep(0)
+        yield i
+    if fail:
+        raise ConnectionError("upstream closed")
+
+
+class TestReleasingStream:
+    def test_releases_when_the_stream_ends(self):
+        release = Mock()
+
+        async def consume():
+            return [chunk async for chunk in ReleasingStream(chunks(3), release)]
+
+        assert asyncio.run(consume()) == [0, 1, 2]
+        release.assert_called_once()
+
+    def test_releases_when_the_stream_fails(self):
+        release = Mock()
+
+        async def consume():
+            async for _ in ReleasingStream(chunks(1, fail=True), release):
+                pass
+
+        with pytest.raises(ConnectionError):
+            asyncio.run(consume())
+        release.assert_called_once()
+
+    def test_releases_when_the_consumer_is_cancelled(self):
+        release = Mock()
+        scheduler = BackendScheduler(limit=1)
+
+        async def scenario():
+            slot = await scheduler.acquire("http://backend", "user")
+
+            def release_slot():
+                release()
+                slot()
+
+            async def consume():
+                async for _ in ReleasingStream(chunks(1000), release_slot):
+                    await asyncio.sleep(0.01)
+
+            # What Starlette does when the client disconnects mid-stream; the
+            # stream is released once the response is dropped
+            task = asyncio.create_task(consume())
+            await asyncio.sleep(0.05)
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            del task
+            gc.collect()
+
+            # The slot is free for the next request
+            await asyncio.wait_for(scheduler.acquire("http://backend", "user"), 1)
+
+        asyncio.run(scenario())
+        release.assert_called_once()
+
+    def test_releases_an_unconsumed_stream(self):
+        release = Mock()
+
+        stream = ReleasingStream(chunks(3), release)
+        del stream
+        gc.collect()
+
+        release.assert_called_once()
@@ -4,6 +4,7 @@ from open_webui.models.groups import Groups
 
 
 from open_webui.config import DEFAULT_USER_PERMISSIONS
+import hashlib
 import json
 
 
@@ -33,6 +34,9 @@ def get_permissions(
     Get all permissions for a user by combining the permissions of all groups the user is a member of.
     If a permission is defined in multiple groups, the most permissive value is used (True > False).
     Permissions are nested in a dict with the permission key as the key and a boolean as the value.
+
+    The result is cached per user and set of default permissions until any group
+    changes, it is shared between callers and must not be modified.
     """
 
     def combine_permissions(
@@ -53,19 +57,27 @@ def get_permissions(
                     )  # Use the most permissive value (True > False)
         return permissions
 
-    user_groups = Groups.get_groups_by_member_id(user_id)
+    def get_user_permissions() -> Dict[str, Any]:
+        # Deep copy default permissions to avoid modifying the original dict
+        permissions = json.loads(default_permissions_json)
 
-    # Deep copy default permissions to avoid modifying the original dict
-    permissions = json.loads(json.dumps(default_permissions))
+        # Combine permissions from all user groups
+        for group_permissions in Groups.get_group_permissions_by_member_id(user_id):
+            permissions = combine_permissions(permissions, group_permissions)
 
-    # Combine permissions from all user groups
-    for group in user_groups:
-        permissions = combine_permissions(permissions, group.permissions or {})
+        # Ensure all fields from default_permissions are present and filled in
+        permissions = fill_missing_permissions(permissions, default_permissions)
 
-    # Ensure all fields from default_permissions are present and filled in
-    permissions = fill_missing_permissions(permissions, default_permissions)
+        return permissions
 
-    return permissions
+    default_permissions_json = json.dumps(default_permissions, sort_keys=True)
+    default_permissions_hash = hashlib.sha256(
+        default_permissions_json.encode()
+    ).hexdigest()
+
+    return Groups.permission_cache.get_or_set(
+        f"{user_id}:{default_permissions_hash}", get_user_permissions
+    )
 
 
 def has_permission(
@@ -92,10 +104,8 @@ def has_permission(
     permission_hierarchy = permission_key.split(".")
 
     # Retrieve user group permissions
-    user_groups = Groups.get_groups_by_member_id(user_id)
-
-    for group in user_groups:
-        if get_permission(group.permissions or {}, permission_hierarchy):
+    for group_permissions in Groups.get_group_permissions_by_member_id(user_id):
+        if get_permission(group_permissions, permission_hierarchy):
             return True
 
     # Check default permissions afterward if the group permissions don't allow it
@@ -113,8 +123,7 @@ def has_access(
     if access_control is None:
         return type == "read"
 
-    user_groups = Groups.get_groups_by_member_id(user_id)
-    user_group_ids = [group.id for group in user_groups]
+    user_group_ids = Groups.get_group_ids_by_member_id(user_id)
     permission_access = access_control.get(type, {})
     permitted_group_ids = permission_access.get("group_ids", [])
     permitted_user_ids = permission_access.get("user_ids", [])
@@ -26,6 +26,7 @@ from open_webui.models.users import Users
 from open_webui.constants import ERROR_MESSAGES
 
 from open_webui.env import (
+    DATABASE_USER_ACTIVE_STATUS_FLUSH_INTERVAL,
     OFFLINE_MODE,
     LICENSE_BLOB,
     pk,
@@ -38,6 +39,7 @@ from open_webui.env import (
 
 from fastapi import BackgroundTasks, Depends, HTTPException, Request, Response, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from starlette.concurrency import run_in_threadpool
 from passlib.context import CryptContext
 
 
@@ -206,7 +208,7 @@ def get_http_authorization_cred(auth_header: Optional[str]):
         return None
 
 
-def get_current_user(
+async def get_current_user(
     request: Request,
     response: Response,
     background_tasks: BackgroundTasks,
@@ -248,7 +250,7 @@ def get_current_user(
                     status.HTTP_403_FORBIDDEN, detail=ERROR_MESSAGES.API_KEY_NOT_ALLOWED
                 )
 
-        user = get_current_user_by_api_key(token)
+        user = await get_current_user_by_api_key(token)
 
         # Add user info to current span
         current_span = trace.get_current_span()
@@ -270,7 +272,7 @@ def get_current_user(
         )
 
     if data is not None and "id" in data:
-        user = Users.get_user_by_id(data["id"])
+        user = await Users.get_user_by_id_async(data["id"])
         if user is None:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -300,9 +302,12 @@ def get_current_user(
                 current_span.set_attribute("client.user.role", user.role)
                 current_span.set_attribute("client.auth.type", "jwt")
 
-            # Refresh the user's last active timestamp asynchronously
-            # to prevent blocking the request
-            if background_tasks:
+            # Refresh the user's last active timestamp, only recorded in memory
+            # unless it is written through, then asynchronously to prevent
+            # blocking the request
+            if DATABASE_USER_ACTIVE_STATUS_FLUSH_INTERVAL > 0:
+                Users.update_user_last_active_by_id(user.id)
+            elif background_tasks:
                 background_tasks.add_task(Users.update_user_last_active_by_id, user.id)
         return user
     else:
@@ -312,8 +317,8 @@ def get_current_user(
         )
 
 
-def get_current_user_by_api_key(api_key: str):
-    user = Users.get_user_by_api_key(api_key)
+async def get_current_user_by_api_key(api_key: str):
+    user = await Users.get_user_by_api_key_async(api_key)
 
     if user is None:
         raise HTTPException(
@@ -329,7 +334,10 @@ def get_current_user_by_api_key(api_key: str):
             current_span.set_attribute("client.user.role", user.role)
             current_span.set_attribute("client.auth.type", "api_key")
 
-        Users.update_user_last_active_by_id(user.id)
+        if DATABASE_USER_ACTIVE_STATUS_FLUSH_INTERVAL > 0:
+            Users.update_user_last_active_by_id(user.id)
+        else:
+            await run_in_threadpool(Users.update_user_last_active_by_id, user.id)
 
     return user
 
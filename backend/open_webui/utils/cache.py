@@ -0,0 +1,171 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+from open_webui.utils.redis import get_redis_connection, get_sentinels_from_env
+from open_webui.env import (
+    REDIS_URL,
+    REDIS_CLUSTER,
+    REDIS_KEY_PREFIX,
+    REDIS_SENTINEL_HOSTS,
+    REDIS_SENTINEL_PORT,
+    SRC_LOG_LEVELS,
+)
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["MAIN"])
+
+
+_MISSING = object()
+
+# Sentinel published to clear a whole cache instead of a single key
+_CLEAR = "*"
+
+
+def get_cache_redis_connection():
+    if not REDIS_URL:
+        return None
+
+    try:
+        return get_redis_connection(
+            redis_url=REDIS_URL,
+            redis_sentinels=get_sentinels_from_env(
+                REDIS_SENTINEL_HOSTS, REDIS_SENTINEL_PORT
+            ),
+            redis_cluster=REDIS_CLUSTER,
+            decode_responses=True,
+        )
+    except Exception as e:
+        log.warning(f"Unable to connect to Redis for cache invalidation: {e}")
+        return None
+
+
+class LocalCache:
+    """
+    Thread-safe in-process cache with per-entry TTL and LRU eviction.
+
+    When Redis is configured, invalidations (`delete`, `clear`) are published
+    on a per-cache channel so every worker drops its local copy; the cached
+    values themselves never leave the process.
+
+    Every invalidation bumps a generation counter, so `get_or_set` does not
+    store a value whose load started before an invalidation.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        ttl: float,
+        maxsize: int = 10000,
+        redis=_MISSING,
+    ):
+        self.name = name
+        self.ttl = ttl
+        self.maxsize = maxsize
+
+        self.hits = 0
+        self.misses = 0
+
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+
+        self._redis = get_cache_redis_connection() if redis is _MISSING else redis
+        self._channel = f"{REDIS_KEY_PREFIX}:cache:{name}"
+        self._pubsub_thread = None
+
+        if self._redis is not None:
+            self._subscribe()
+
+    def _subscribe(self):
+        try:
+            pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(**{self._channel: self._on_invalidate})
+            self._pubsub_thread = pubsub.run_in_thread(sleep_time=1.0, daemon=True)
+        except Exception as e:
+            log.warning(f"Unable to subscribe to cache channel {self._channel}: {e}")
+            self._redis = None
+
+    def _on_invalidate(self, message):
+        key = message.get("data")
+        if key == _CLEAR:
+            self.clear(publish=False)
+        else:
+            self.delete(key, publish=False)
+
+    def _publish(self, key: str):
+        if self._redis is None:
+            return
+
+        try:
+            self._redis.publish(self._channel, key)
+        except Exception as e:
+            log.warning(f"Unable to publish cache invalidation of {key}: {e}")
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    @property
+    def generation(self) -> int:
+        """Pass to `set` to skip values loaded before a later invalidation."""
+        return self._generation
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+
+            self.misses += 1
+            return default
+
+    def set(self, key: Hashable, value: Any, generation: Optional[int] = None) -> None:
+        if not self.enabled:
+            return
+
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                # Invalidated since `generation`, the value may be stale
+                return
+
+            self._data[key] = (value, time.monotonic() + self.ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def get_or_set(self, key: Hashable, func: Callable[[], Any]) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            generation = self.generation
+            value = func()
+            if value is not None:
+                self.set(key, value, generation)
+        return value
+
+    def delete(self, key: Hashable, publish: bool = True) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+            self._generation += 1
+
+        # Only string keys can be shared with other workers
+        if publish and isinstance(key, str):
+            self._publish(key)
+
+    def clear(self, publish: bool = True) -> None:
+        with self._lock:
+            self._data.clear()
+            self._generation += 1
+
+        if publish:
+            self._publish(_CLEAR)
+
+    def __len__(self) -> int:
+        return len(self._data)
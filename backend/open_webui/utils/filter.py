@@ -1,11 +1,12 @@
 import inspect
+import json
 import logging
 
 from open_webui.utils.plugin import (
     load_function_module_by_id,
     get_function_module_from_cache,
 )
-from open_webui.models.functions import Functions
+from open_webui.models.functions import FunctionModel, Functions
 from open_webui.env import SRC_LOG_LEVELS
 
 log = logging.getLogger(__name__)
@@ -22,39 +23,81 @@ def get_function_module(request, function_id, load_from_db=True):
     return function_module
 
 
-def get_sorted_filter_ids(request, model: dict, enabled_filter_ids: list = None):
-    def get_priority(function_id):
-        function = Functions.get_function_by_id(function_id)
-        if function is not None:
-            valves = Functions.get_function_valves_by_id(function_id)
-            return valves.get("priority", 0) if valves else 0
-        return 0
-
-    filter_ids = [function.id for function in Functions.get_global_filter_functions()]
-    if "info" in model and "meta" in model["info"]:
-        filter_ids.extend(model["info"]["meta"].get("filterIds", []))
-        filter_ids = list(set(filter_ids))
-    active_filter_ids = [
-        function.id
-        for function in Functions.get_functions_by_type("filter", active_only=True)
-    ]
+def get_compiled_filter(request, filter_id: str) -> dict:
+    """
+    Module, stored valves and priority of a filter, kept until a function
+    changes so the completion path does not go back to the database.
+    """
 
-    def get_active_status(filter_id):
+    def compile_filter():
         function_module = get_function_module(request, filter_id)
+        valves = Functions.get_function_valves_by_id(filter_id) or {}
 
-        if getattr(function_module, "toggle", None):
-            return filter_id in (enabled_filter_ids or [])
-
-        return True
+        return {
+            "id": filter_id,
+            "module": function_module,
+            "valves": valves,
+            "priority": valves.get("priority", 0),
+            "toggle": bool(getattr(function_module, "toggle", None)),
+            # filter type -> handler parameter names, filled on first use
+            "parameters": {},
+        }
 
-    active_filter_ids = [
-        filter_id for filter_id in active_filter_ids if get_active_status(filter_id)
-    ]
+    return Functions.cache.get_or_set(f"filter:{filter_id}", compile_filter)
 
-    filter_ids = [fid for fid in filter_ids if fid in active_filter_ids]
-    filter_ids.sort(key=get_priority)
 
-    return filter_ids
+def get_sorted_filter_ids(request, model: dict, enabled_filter_ids: list = None):
+    model_filter_ids = []
+    if "info" in model and "meta" in model["info"]:
+        model_filter_ids = model["info"]["meta"].get("filterIds", []) or []
+
+    def compile_filter_ids():
+        active_filters = {
+            function.id: function
+            for function in Functions.get_active_functions()
+            if function.type == "filter"
+        }
+
+        filter_ids = {
+            function.id for function in active_filters.values() if function.is_global
+        }
+        filter_ids.update(model_filter_ids)
+
+        compiled_filters = []
+        for filter_id in filter_ids:
+            if filter_id not in active_filters:
+                continue
+
+            compiled_filter = get_compiled_filter(request, filter_id)
+            if compiled_filter["toggle"] and filter_id not in (
+                enabled_filter_ids or []
+            ):
+                continue
+
+            compiled_filters.append(compiled_filter)
+
+        compiled_filters.sort(key=lambda compiled_filter: compiled_filter["priority"])
+        return [compiled_filter["id"] for compiled_filter in compiled_filters]
+
+    # One chain per set of model filters and enabled toggles
+    key = "chain:" + json.dumps(
+        [sorted(set(model_filter_ids)), sorted(set(enabled_filter_ids or []))]
+    )
+    return list(Functions.cache.get_or_set(key, compile_filter_ids))
+
+
+def get_sorted_filter_functions(
+    request, model: dict, enabled_filter_ids: list = None
+) -> list[FunctionModel]:
+    """Functions of `get_sorted_filter_ids`, shared with the cache: read-only."""
+    active_functions = {
+        function.id: function for function in Functions.get_active_functions()
+    }
+    return [
+        active_functions[filter_id]
+        for filter_id in get_sorted_filter_ids(request, model, enabled_filter_ids)
+        if filter_id in active_functions
+    ]
 
 
 async def process_filter_functions(
@@ -68,9 +111,9 @@ async def process_filter_functions(
         if not filter:
             continue
 
-        function_module = get_function_module(
-            request, filter_id, load_from_db=(filter_type != "stream")
-        )
+        compiled_filter = get_compiled_filter(request, filter_id)
+        function_module = compiled_filter["module"]
+
         # Prepare handler function
         handler = getattr(function_module, filter_type, None)
         if not handler:
@@ -82,14 +125,14 @@ async def process_filter_functions(
 
         # Apply valves to the function
         if hasattr(function_module, "valves") and hasattr(function_module, "Valves"):
-            valves = Functions.get_function_valves_by_id(filter_id)
-            function_module.valves = function_module.Valves(
-                **(valves if valves else {})
-            )
+            function_module.valves = function_module.Valves(**compiled_filter["valves"])
 
         try:
             # Prepare parameters
-            sig = inspect.signature(handler)
+            parameters = compiled_filter["parameters"].get(filter_type)
+            if parameters is None:
+                parameters = set(inspect.signature(handler).parameters)
+                compiled_filter["parameters"][filter_type] = parameters
 
             params = {"body": form_data}
             if filter_type == "stream":
@@ -101,11 +144,11 @@ async def process_filter_functions(
                     **extra_params,
                     "__id__": filter_id,
                 }.items()
-                if k in sig.parameters
+                if k in parameters
             }
 
             # Handle user parameters
-            if "__user__" in sig.parameters:
+            if "__user__" in parameters:
                 if hasattr(function_module, "UserValves"):
                     try:
                         params["__user__"]["valves"] = function_module.UserValves(
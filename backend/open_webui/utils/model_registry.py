@@ -0,0 +1,186 @@
+import asyncio
+import copy
+import hashlib
+import json
+import logging
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+from open_webui.utils.cache import get_cache_redis_connection
+from open_webui.env import (
+    MODELS_CACHE_STALE_TTL,
+    REDIS_KEY_PREFIX,
+    SRC_LOG_LEVELS,
+)
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["MAIN"])
+
+
+_MISSING = object()
+
+
+class ModelRegistry:
+    """
+    Stale-while-revalidate cache of the raw model list of every backend connection.
+
+    A fresh entry (younger than the connection's TTL) is served as is. A stale
+    one keeps being served for up to `stale_ttl` while a single background task
+    refreshes it, so a slow or unreachable backend never holds up the model
+    list, and a failed refresh keeps the last good list. Only a connection
+    without any known list is fetched inline.
+
+    When Redis is configured, fetched lists are shared between workers and
+    background refreshes of the same connection are only run by one of them.
+    """
+
+    def __init__(self, stale_ttl: float = 3600, redis=_MISSING):
+        self.stale_ttl = stale_ttl
+
+        # key -> (value, fetched_at)
+        self._entries: dict[str, tuple[Any, float]] = {}
+        self._attempted_at: dict[str, float] = {}
+        self._tasks: dict[str, asyncio.Task] = {}
+
+        self._redis = get_cache_redis_connection() if redis is _MISSING else redis
+        self._prefix = f"{REDIS_KEY_PREFIX}:models"
+
+    @staticmethod
+    def get_key(
+        url: str, key: Optional[str] = None, user_id: Optional[str] = None
+    ) -> str:
+        # Connections sharing a URL may differ by credentials, which must not
+        # end up in Redis as is
+        if key:
+            url = f"{url}#{hashlib.sha256(key.encode()).hexdigest()[:16]}"
+        # A backend that receives the user info headers may list different
+        # models per user, so those lists are never shared between users
+        if user_id:
+            url = f"{url}@{user_id}"
+        return url
+
+    def _get_shared(self, key: str) -> Optional[tuple[Any, float]]:
+        if self._redis is None:
+            return None
+
+        try:
+            data = self._redis.get(f"{self._prefix}:{key}")
+            if data:
+                entry = json.loads(data)
+                return entry["value"], entry["fetched_at"]
+        except Exception as e:
+            log.debug(f"Unable to read shared models of {key}: {e}")
+        return None
+
+    def _set_shared(self, key: str, value: Any, fetched_at: float):
+        if self._redis is None:
+            return
+
+        try:
+            self._redis.set(
+                f"{self._prefix}:{key}",
+                json.dumps({"value": value, "fetched_at": fetched_at}),
+                ex=max(int(self.stale_ttl), 1),
+            )
+        except Exception as e:
+            log.debug(f"Unable to share models of {key}: {e}")
+
+    def _acquire_refresh(self, key: str, ttl: Optional[float]) -> bool:
+        if self._redis is None:
+            return True
+
+        try:
+            return bool(
+                self._redis.set(
+                    f"{self._prefix}:{key}:refresh",
+                    "1",
+                    nx=True,
+                    ex=max(int(ttl or 0), 1),
+                )
+            )
+        except Exception:
+            return True
+
+    def _is_stale(self, entry: tuple[Any, float], ttl: Optional[float]) -> bool:
+        return ttl is not None and time.time() - entry[1] >= ttl
+
+    async def _update(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        self._attempted_at[key] = time.time()
+
+        try:
+            value = await fetch()
+        except Exception as e:
+            log.debug(f"Unable to fetch models of {key}: {e}")
+            value = None
+
+        if value is not None:
+            fetched_at = time.time()
+            self._entries[key] = (value, fetched_at)
+            self._set_shared(key, value, fetched_at)
+            return value
+
+        # Keep serving the last good list of a failing backend
+        entry = self._entries.get(key)
+        if entry is not None and time.time() - entry[1] < self.stale_ttl:
+            log.warning(f"Unable to refresh models of {key}, serving last known list")
+            return entry[0]
+        return None
+
+    def _start_update(
+        self, key: str, fetch: Callable[[], Awaitable[Any]]
+    ) -> asyncio.Task:
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.create_task(self._update(key, fetch))
+            task.add_done_callback(lambda _: self._tasks.pop(key, None))
+            self._tasks[key] = task
+        return task
+
+    def _revalidate(
+        self, key: str, fetch: Callable[[], Awaitable[Any]], ttl: Optional[float]
+    ):
+        if key in self._tasks:
+            return
+
+        # Back off a failing backend instead of retrying it on every request
+        if time.time() - self._attempted_at.get(key, 0) < (ttl or 0):
+            return
+
+        if self._acquire_refresh(key, ttl):
+            self._start_update(key, fetch)
+
+    async def get(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[Any]],
+        ttl: Optional[float] = None,
+        refresh: bool = False,
+    ) -> Any:
+        """
+        Returns a copy of the model list of `key`, calling `fetch` when it is
+        missing or stale. `fetch` signals a failure by returning None. A `ttl`
+        of None never goes stale, `refresh` always waits for a new fetch.
+        """
+        entry = self._entries.get(key)
+        if entry is None or self._is_stale(entry, ttl):
+            shared = self._get_shared(key)
+            if shared is not None and (entry is None or shared[1] > entry[1]):
+                entry = self._entries[key] = shared
+
+        if entry is not None and not refresh:
+            value, fetched_at = entry
+            age = time.time() - fetched_at
+
+            if ttl is None or age < ttl:
+                return copy.deepcopy(value)
+
+            if age < self.stale_ttl:
+                self._revalidate(key, fetch, ttl)
+                return copy.deepcopy(value)
+
+        # Concurrent callers of the same connection share a single fetch
+        value = await asyncio.shield(self._start_update(key, fetch))
+        return copy.deepcopy(value)
+
+
+MODEL_REGISTRY = ModelRegistry(stale_ttl=MODELS_CACHE_STALE_TTL)
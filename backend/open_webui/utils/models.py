@@ -11,6 +11,7 @@ from open_webui.functions import get_function_models
 
 
 from open_webui.models.functions import Functions
+from open_webui.models.groups import Groups
 from open_webui.models.models import Models
 
 
@@ -22,6 +23,7 @@ from open_webui.utils.access_control import has_access
 
 
 from open_webui.config import (
+    BYPASS_ADMIN_ACCESS_CONTROL,
     DEFAULT_ARENA_MODEL,
 )
 
@@ -34,8 +36,10 @@ log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["MAIN"])
 
 
-async def fetch_ollama_models(request: Request, user: UserModel = None):
-    raw_ollama_models = await ollama.get_all_models(request, user=user)
+async def fetch_ollama_models(
+    request: Request, user: UserModel = None, refresh: bool = False
+):
+    raw_ollama_models = await ollama.get_all_models(request, user=user, refresh=refresh)
     return [
         {
             "id": model["model"],
@@ -51,19 +55,23 @@ async def fetch_ollama_models(request: Request, user: UserModel = None):
     ]
 
 
-async def fetch_openai_models(request: Request, user: UserModel = None):
-    openai_response = await openai.get_all_models(request, user=user)
+async def fetch_openai_models(
+    request: Request, user: UserModel = None, refresh: bool = False
+):
+    openai_response = await openai.get_all_models(request, user=user, refresh=refresh)
     return openai_response["data"]
 
 
-async def get_all_base_models(request: Request, user: UserModel = None):
+async def get_all_base_models(
+    request: Request, user: UserModel = None, refresh: bool = False
+):
     openai_task = (
-        fetch_openai_models(request, user)
+        fetch_openai_models(request, user, refresh)
         if request.app.state.config.ENABLE_OPENAI_API
         else asyncio.sleep(0, result=[])
     )
     ollama_task = (
-        fetch_ollama_models(request, user)
+        fetch_ollama_models(request, user, refresh)
         if request.app.state.config.ENABLE_OLLAMA_API
         else asyncio.sleep(0, result=[])
     )
@@ -84,7 +92,7 @@ async def get_all_models(request, refresh: bool = False, user: UserModel = None)
     ):
         base_models = request.app.state.BASE_MODELS
     else:
-        base_models = await get_all_base_models(request, user=user)
+        base_models = await get_all_base_models(request, user=user, refresh=refresh)
         request.app.state.BASE_MODELS = base_models
 
     # deep copy the base models to avoid modifying the original list
@@ -129,23 +137,33 @@ async def get_all_models(request, refresh: bool = False, user: UserModel = None)
             ]
         models = models + arena_models
 
+    active_functions = {
+        function.id: function for function in Functions.get_active_functions()
+    }
+
     global_action_ids = [
-        function.id for function in Functions.get_global_action_functions()
+        function.id
+        for function in active_functions.values()
+        if function.type == "action" and function.is_global
     ]
     enabled_action_ids = [
         function.id
-        for function in Functions.get_functions_by_type("action", active_only=True)
+        for function in active_functions.values()
+        if function.type == "action"
     ]
 
     global_filter_ids = [
-        function.id for function in Functions.get_global_filter_functions()
+        function.id
+        for function in active_functions.values()
+        if function.type == "filter" and function.is_global
     ]
     enabled_filter_ids = [
         function.id
-        for function in Functions.get_functions_by_type("filter", active_only=True)
+        for function in active_functions.values()
+        if function.type == "filter"
     ]
 
-    custom_models = Models.get_all_models()
+    custom_models = Models.get_model_snapshot().values()
     for custom_model in custom_models:
         if custom_model.base_model_id is None:
             # Applied directly to a base model
@@ -265,10 +283,39 @@ async def get_all_models(request, refresh: bool = False, user: UserModel = None)
             }
         ]
 
+    # Items only depend on the function, build them once for all models
+    function_items = {}
+
     def get_function_module_by_id(function_id):
         function_module, _, _ = get_function_module_from_cache(request, function_id)
         return function_module
 
+    def get_action_items(action_id):
+        if action_id not in function_items:
+            action_function = active_functions.get(action_id)
+            if action_function is None:
+                raise Exception(f"Action not found: {action_id}")
+
+            function_module = get_function_module_by_id(action_id)
+            function_items[action_id] = get_action_items_from_module(
+                action_function, function_module
+            )
+        return function_items[action_id]
+
+    def get_filter_items(filter_id):
+        if filter_id not in function_items:
+            filter_function = active_functions.get(filter_id)
+            if filter_function is None:
+                raise Exception(f"Filter not found: {filter_id}")
+
+            function_module = get_function_module_by_id(filter_id)
+            function_items[filter_id] = (
+                get_filter_items_from_module(filter_function, function_module)
+                if getattr(function_module, "toggle", None)
+                else []
+            )
+        return function_items[filter_id]
+
     for model in models:
         action_ids = [
             action_id
@@ -283,27 +330,11 @@ async def get_all_models(request, refresh: bool = False, user: UserModel = None)
 
         model["actions"] = []
         for action_id in action_ids:
-            action_function = Functions.get_function_by_id(action_id)
-            if action_function is None:
-                raise Exception(f"Action not found: {action_id}")
-
-            function_module = get_function_module_by_id(action_id)
-            model["actions"].extend(
-                get_action_items_from_module(action_function, function_module)
-            )
+            model["actions"].extend(get_action_items(action_id))
 
         model["filters"] = []
         for filter_id in filter_ids:
-            filter_function = Functions.get_function_by_id(filter_id)
-            if filter_function is None:
-                raise Exception(f"Filter not found: {filter_id}")
-
-            function_module = get_function_module_by_id(filter_id)
-
-            if getattr(function_module, "toggle", None):
-                model["filters"].extend(
-                    get_filter_items_from_module(filter_function, function_module)
-                )
+            model["filters"].extend(get_filter_items(filter_id))
 
     log.debug(f"get_all_models() returned {len(models)} models")
 
@@ -311,6 +342,56 @@ async def get_all_models(request, refresh: bool = False, user: UserModel = None)
     return models
 
 
+def get_filtered_models(models, user):
+    """
+    Models the user may read. Decisions are memoized per user and group set
+    until a model changes, so polling the model list skips the access checks.
+    """
+    group_ids = sorted(Groups.get_group_ids_by_member_id(user.id))
+    key = f"{user.id}:{user.role}:{','.join(group_ids)}"
+
+    access = Models.access_cache.get(key)
+    if access is None:
+        access = {}
+        Models.access_cache.set(key, access)
+
+    model_snapshot = Models.get_model_snapshot()
+
+    filtered_models = []
+    for model in models:
+        if model.get("arena"):
+            # Arena access lives in the config, it is not memoized
+            if has_access(
+                user.id,
+                type="read",
+                access_control=model.get("info", {})
+                .get("meta", {})
+                .get("access_control", {}),
+            ):
+                filtered_models.append(model)
+            continue
+
+        allowed = access.get(model["id"])
+        if allowed is None:
+            model_info = model_snapshot.get(model["id"])
+            allowed = bool(
+                model_info
+                and (
+                    (user.role == "admin" and BYPASS_ADMIN_ACCESS_CONTROL)
+                    or user.id == model_info.user_id
+                    or has_access(
+                        user.id, type="read", access_control=model_info.access_control
+                    )
+                )
+            )
+            access[model["id"]] = allowed
+
+        if allowed:
+            filtered_models.append(model)
+
+    return filtered_models
+
+
 def check_model_access(user, model):
     if model.get("arena"):
         if not has_access(
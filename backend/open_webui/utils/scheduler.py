@@ -0,0 +1,179 @@
+import asyncio
+import logging
+import random
+import time
+import weakref
+from collections import OrderedDict, deque
+from typing import AsyncIterator, Callable, Optional
+
+from fastapi import HTTPException, status
+
+from open_webui.constants import ERROR_MESSAGES
+from open_webui.env import (
+    BACKEND_MAX_CONCURRENT_REQUESTS,
+    BACKEND_QUEUE_TIMEOUT,
+    SRC_LOG_LEVELS,
+)
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["MAIN"])
+
+
+class _Backend:
+    def __init__(self):
+        self.active = 0
+        # user id -> futures of the user's waiting requests, in arrival order;
+        # users are served round-robin in the order of this dict
+        self.waiters: OrderedDict[str, deque[asyncio.Future]] = OrderedDict()
+
+        self.waiting = 0
+        self.queued = 0
+        self.queued_seconds = 0.0
+        self.rejected = 0
+
+
+class BackendScheduler:
+    """
+    Admission control in front of the upstream model backends of this worker.
+
+    Every backend connection (keyed by its base URL) runs at most `limit`
+    requests at a time. Requests beyond that wait in per-user queues that are
+    served round-robin, so a burst of one user cannot starve the others, and
+    are rejected with a 503 after `queue_timeout` seconds.
+
+    `acquire` returns a release callable that must be called exactly once the
+    upstream response has been consumed; calling it again is a no-op.
+    """
+
+    def __init__(self, limit: int = 0, queue_timeout: Optional[float] = 300):
+        self.limit = limit
+        self.queue_timeout = queue_timeout
+
+        self._backends: dict[str, _Backend] = {}
+
+    def _get_backend(self, url: str) -> _Backend:
+        backend = self._backends.get(url)
+        if backend is None:
+            backend = self._backends[url] = _Backend()
+        return backend
+
+    def _release(self, backend: _Backend):
+        backend.active -= 1
+
+        # Hand the slot straight to the next user in turn
+        while backend.waiters:
+            user_id, queue = next(iter(backend.waiters.items()))
+            future = queue.popleft()
+            if queue:
+                backend.waiters.move_to_end(user_id)
+            else:
+                del backend.waiters[user_id]
+
+            if not future.done():
+                backend.active += 1
+                future.set_result(True)
+                return
+
+    def _remove_waiter(self, backend: _Backend, user_id: str, future: asyncio.Future):
+        queue = backend.waiters.get(user_id)
+        if queue is not None and future in queue:
+            queue.remove(future)
+            if not queue:
+                del backend.waiters[user_id]
+
+    async def acquire(
+        self, url: str, user_id: str, limit: Optional[int] = None
+    ) -> Callable[[], None]:
+        limit = self.limit if limit is None else limit
+        backend = self._get_backend(url)
+
+        if limit <= 0 or (backend.active < limit and not backend.waiters):
+            backend.active += 1
+        else:
+            future = asyncio.get_running_loop().create_future()
+            backend.waiters.setdefault(user_id, deque()).append(future)
+            backend.waiting += 1
+            backend.queued += 1
+            queued_at = time.perf_counter()
+
+            try:
+                await asyncio.wait_for(future, timeout=self.queue_timeout or None)
+            except BaseException as e:
+                if future.done() and not future.cancelled():
+                    # The slot was handed over while we were being cancelled
+                    self._release(backend)
+                else:
+                    self._remove_waiter(backend, user_id, future)
+
+                if isinstance(e, asyncio.TimeoutError):
+                    backend.rejected += 1
+                    log.warning(f"Request of user {user_id} timed out queued for {url}")
+                    raise HTTPException(
+                        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                        detail=ERROR_MESSAGES.BACKEND_BUSY,
+                    )
+                raise
+            finally:
+                backend.waiting -= 1
+                backend.queued_seconds += time.perf_counter() - queued_at
+
+        released = False
+
+        def release():
+            nonlocal released
+            if not released:
+                released = True
+                self._release(backend)
+
+        return release
+
+    def get_load(self, url: str) -> int:
+        backend = self._backends.get(url)
+        return backend.active + backend.waiting if backend else 0
+
+    def select(self, urls: list[str]) -> str:
+        """Returns the least loaded of `urls`, picking randomly between ties."""
+        loads = [self.get_load(url) for url in urls]
+        least = min(loads)
+        return random.choice([url for url, load in zip(urls, loads) if load == least])
+
+    def get_metrics(self) -> dict[str, dict]:
+        return {
+            url: {
+                "active": backend.active,
+                "waiting": backend.waiting,
+                "queued": backend.queued,
+                "queued_seconds": backend.queued_seconds,
+                "rejected": backend.rejected,
+            }
+            for url, backend in self._backends.items()
+        }
+
+
+class ReleasingStream:
+    """
+    Async iterator over a streamed upstream response that calls `release`
+    once the stream ends, fails or is cancelled (e.g. by a client disconnect,
+    which skips the background task of the response), and at the latest when
+    it is garbage collected without having been consumed.
+    """
+
+    def __init__(self, iterator: AsyncIterator, release: Callable[[], None]):
+        self._iterator = iterator.__aiter__()
+        self._finalizer = weakref.finalize(self, release)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return await self._iterator.__anext__()
+        except BaseException:
+            self._finalizer()
+            raise
+
+
+SCHEDULER = BackendScheduler(
+    limit=BACKEND_MAX_CONCURRENT_REQUESTS,
+    queue_timeout=BACKEND_QUEUE_TIMEOUT,
+)
@@ -0,0 +1,146 @@
+import logging
+import time
+from typing import Optional
+from urllib.parse import urlparse
+
+import aiohttp
+
+from open_webui.env import (
+    AIOHTTP_CLIENT_DNS_CACHE_TTL,
+    AIOHTTP_CLIENT_KEEPALIVE_TIMEOUT,
+    AIOHTTP_CLIENT_POOL_LIMIT,
+    AIOHTTP_CLIENT_POOL_LIMIT_PER_HOST,
+    SRC_LOG_LEVELS,
+)
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["MAIN"])
+
+
+class ClientSessionPool:
+    """
+    App-lifetime aiohttp sessions, one per upstream origin (scheme://host:port).
+
+    Requests to the same backend reuse kept-alive connections and cached DNS
+    lookups instead of opening a new session, and with it a new TCP/TLS
+    connection, every time. Every origin has its own connector, so the pool
+    limits and the metrics below apply per backend.
+
+    Responses must be released, never the session closed, once consumed.
+    """
+
+    def __init__(
+        self,
+        limit: int = 0,
+        limit_per_host: int = 0,
+        keepalive_timeout: float = 30.0,
+        dns_cache_ttl: Optional[int] = 300,
+    ):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
+
+        self._sessions: dict[str, aiohttp.ClientSession] = {}
+        self._metrics: dict[str, dict] = {}
+
+    @staticmethod
+    def get_origin(url: str) -> str:
+        parsed_url = urlparse(url)
+        return f"{parsed_url.scheme}://{parsed_url.netloc}"
+
+    def _get_trace_config(self, origin: str) -> aiohttp.TraceConfig:
+        metrics = self._metrics.setdefault(
+            origin,
+            {
+                "requests": 0,
+                "errors": 0,
+                "connections_created": 0,
+                "connections_reused": 0,
+                # Requests that had to wait for a free connection, i.e. the
+                # pool was saturated, and how long they waited in total
+                "queued": 0,
+                "queued_seconds": 0.0,
+                "waiting": 0,
+            },
+        )
+
+        async def on_request_start(session, context, params):
+            metrics["requests"] += 1
+
+        async def on_request_exception(session, context, params):
+            metrics["errors"] += 1
+
+        async def on_connection_queued_start(session, context, params):
+            context.queued_at = time.perf_counter()
+            metrics["queued"] += 1
+            metrics["waiting"] += 1
+
+        async def on_connection_queued_end(session, context, params):
+            metrics["waiting"] -= 1
+            metrics["queued_seconds"] += time.perf_counter() - context.queued_at
+
+        async def on_connection_create_end(session, context, params):
+            metrics["connections_created"] += 1
+
+        async def on_connection_reuseconn(session, context, params):
+            metrics["connections_reused"] += 1
+
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_request_exception.append(on_request_exception)
+        trace_config.on_connection_queued_start.append(on_connection_queued_start)
+        trace_config.on_connection_queued_end.append(on_connection_queued_end)
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+        return trace_config
+
+    def get_session(self, url: str) -> aiohttp.ClientSession:
+        """Returns the shared session for the origin of `url`, must be called from the event loop."""
+        origin = self.get_origin(url)
+
+        session = self._sessions.get(origin)
+        if session is None or session.closed:
+            log.debug(f"Creating client session for {origin}")
+
+            session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.limit,
+                    limit_per_host=self.limit_per_host,
+                    keepalive_timeout=self.keepalive_timeout,
+                    ttl_dns_cache=self.dns_cache_ttl,
+                ),
+                trust_env=True,
+                trace_configs=[self._get_trace_config(origin)],
+            )
+            self._sessions[origin] = session
+
+        return session
+
+    def get_metrics(self) -> dict[str, dict]:
+        return {
+            origin: {
+                "limit": self.limit,
+                "limit_per_host": self.limit_per_host,
+                **metrics,
+            }
+            for origin, metrics in self._metrics.items()
+        }
+
+    async def close(self):
+        sessions = list(self._sessions.values())
+        self._sessions.clear()
+
+        for session in sessions:
+            try:
+                await session.close()
+            except Exception as e:
+                log.warning(f"Error closing client session: {e}")
+
+
+CLIENT_SESSION_POOL = ClientSessionPool(
+    limit=AIOHTTP_CLIENT_POOL_LIMIT,
+    limit_per_host=AIOHTTP_CLIENT_POOL_LIMIT_PER_HOST,
+    keepalive_timeout=AIOHTTP_CLIENT_KEEPALIVE_TIMEOUT,
+    dns_cache_ttl=AIOHTTP_CLIENT_DNS_CACHE_TTL,
+)
@@ -8,6 +8,9 @@ Metrics collected:
 
 * http.server.requests (counter)
 * http.server.duration (histogram, milliseconds)
+* webui.rag.embedding_cache.hits / misses (counters)
+* webui.http_client.pool.queued / waiting (upstream connection pool saturation)
+* webui.scheduler.active / waiting / rejected (per-backend admission control)
 
 Attributes used: http.method, http.route, http.status_code
 
@@ -47,6 +50,9 @@ from open_webui.env import (
 )
 from open_webui.socket.main import get_active_user_ids
 from open_webui.models.users import Users
+from open_webui.retrieval.embedding_cache import EMBEDDING_CACHE
+from open_webui.utils.scheduler import SCHEDULER
+from open_webui.utils.session_pool import CLIENT_SESSION_POOL
 
 _EXPORT_INTERVAL_MILLIS = 10_000  # 10 seconds
 
@@ -99,6 +105,32 @@ def _build_meter_provider(resource: Resource) -> MeterProvider:
         View(
             instrument_name="webui.users.active",
         ),
+        View(
+            instrument_name="webui.rag.embedding_cache.hits",
+        ),
+        View(
+            instrument_name="webui.rag.embedding_cache.misses",
+        ),
+        View(
+            instrument_name="webui.http_client.pool.queued",
+            attribute_keys=["server.address"],
+        ),
+        View(
+            instrument_name="webui.http_client.pool.waiting",
+            attribute_keys=["server.address"],
+        ),
+        View(
+            instrument_name="webui.scheduler.active",
+            attribute_keys=["server.address"],
+        ),
+        View(
+            instrument_name="webui.scheduler.waiting",
+            attribute_keys=["server.address"],
+        ),
+        View(
+            instrument_name="webui.scheduler.rejected",
+            attribute_keys=["server.address"],
+        ),
     ]
 
     provider = MeterProvider(
@@ -159,6 +191,103 @@ def setup_metrics(app: FastAPI, resource: Resource) -> None:
         callbacks=[observe_active_users],
     )
 
+    if EMBEDDING_CACHE:
+
+        def observe_embedding_cache_hits(
+            options: metrics.CallbackOptions,
+        ) -> Sequence[metrics.Observation]:
+            return [metrics.Observation(value=EMBEDDING_CACHE.hits)]
+
+        def observe_embedding_cache_misses(
+            options: metrics.CallbackOptions,
+        ) -> Sequence[metrics.Observation]:
+            return [metrics.Observation(value=EMBEDDING_CACHE.misses)]
+
+        meter.create_observable_counter(
+            name="webui.rag.embedding_cache.hits",
+            description="Embeddings served from the embedding cache",
+            unit="1",
+            callbacks=[observe_embedding_cache_hits],
+        )
+
+        meter.create_observable_counter(
+            name="webui.rag.embedding_cache.misses",
+            description="Embeddings that had to be computed",
+            unit="1",
+            callbacks=[observe_embedding_cache_misses],
+        )
+
+    def observe_http_client_pool_queued(
+        options: metrics.CallbackOptions,
+    ) -> Sequence[metrics.Observation]:
+        return [
+            metrics.Observation(
+                value=pool_metrics["queued"],
+                attributes={"server.address": origin},
+            )
+            for origin, pool_metrics in CLIENT_SESSION_POOL.get_metrics().items()
+        ]
+
+    def observe_http_client_pool_waiting(
+        options: metrics.CallbackOptions,
+    ) -> Sequence[metrics.Observation]:
+        return [
+            metrics.Observation(
+                value=pool_metrics["waiting"],
+                attributes={"server.address": origin},
+            )
+            for origin, pool_metrics in CLIENT_SESSION_POOL.get_metrics().items()
+        ]
+
+    meter.create_observable_counter(
+        name="webui.http_client.pool.queued",
+        description="Upstream requests that waited for a free pooled connection",
+        unit="1",
+        callbacks=[observe_http_client_pool_queued],
+    )
+
+    meter.create_observable_gauge(
+        name="webui.http_client.pool.waiting",
+        description="Upstream requests currently waiting for a pooled connection",
+        unit="1",
+        callbacks=[observe_http_client_pool_waiting],
+    )
+
+    def observe_scheduler(key: str):
+        def observe(
+            options: metrics.CallbackOptions,
+        ) -> Sequence[metrics.Observation]:
+            return [
+                metrics.Observation(
+                    value=backend_metrics[key],
+                    attributes={"server.address": url},
+                )
+                for url, backend_metrics in SCHEDULER.get_metrics().items()
+            ]
+
+        return observe
+
+    meter.create_observable_gauge(
+        name="webui.scheduler.active",
+        description="Chat completion requests currently running per backend",
+        unit="1",
+        callbacks=[observe_scheduler("active")],
+    )
+
+    meter.create_observable_gauge(
+        name="webui.scheduler.waiting",
+        description="Chat completion requests currently queued per backend",
+        unit="1",
+        callbacks=[observe_scheduler("waiting")],
+    )
+
+    meter.create_observable_counter(
+        name="webui.scheduler.rejected",
+        description="Chat completion requests that timed out in the queue",
+        unit="1",
+        callbacks=[observe_scheduler("rejected")],
+    )
+
     # FastAPI middleware
     @app.middleware("http")
     async def _metrics_middleware(request: Request, call_next):